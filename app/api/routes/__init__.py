@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.api.routes import beaches, weather, users, auth
 from app.db.session import get_db
-from app.db.redis import get_redis_connection
-from app.services.stormglass import StormGlassService
+from app.db.redis import get_redis_connection, get_cache_tier_stats
+from app.services.stormglass import StormGlassService, get_cache_stats
+from app.services.rate_limiter import stormglass_limiter
+from app.services.single_flight import marine_flight
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import traceback
@@ -42,7 +44,11 @@ async def health_check(db: Session = Depends(get_db)):
                 "detail": detail
             },
             "redis": redis_status,
-            "storm_glass_api": storm_glass_status
+            "memory_cache": get_cache_tier_stats(),
+            "storm_glass_api": storm_glass_status,
+            "storm_glass_limiter": stormglass_limiter.get_stats(),
+            "storm_glass_single_flight": marine_flight.get_stats(),
+            "storm_glass_cache": get_cache_stats()
         }
     except Exception as e:
         tb = traceback.format_exc()
@@ -1,18 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Path
 from sqlalchemy.orm import Session
 from typing import Any, List, Optional, Dict
 from datetime import datetime
 
 from app.api.deps import get_db, get_current_user, get_current_active_admin
 from app.models.user import User
-from app.schemas.beach import Beach, BeachCreate, BeachUpdate
+from app.schemas.beach import Beach, BeachCreate, BeachUpdate, BeachTile
 from app.schemas.weather_data import BeachConditions
 from app.crud.beach import (
     get_beach, get_beaches, create_beach, update_beach, delete_beach,
-    increment_view_count
+    increment_view_count, get_nearby_beaches
 )
-from app.crud.weather import get_current_beach_conditions
+from app.crud.weather import get_beach_conditions_at
 from app.crud.user_favorite import add_favorite_beach, remove_favorite_beach, get_user_favorite_beaches
+from app.services.map_tiles import MapTileService
 
 router = APIRouter()
 
@@ -120,6 +121,52 @@ async def import_beaches(
     }
 
 
+@router.get("/nearby", response_model=List[Beach])
+async def read_nearby_beaches(
+    lat: float = Query(..., description="Latitude"),
+    lng: float = Query(..., description="Longitude"),
+    radius: float = Query(50.0, description="Search radius in kilometers"),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user)
+) -> Any:
+    """
+    Get beaches near a location
+    """
+    beaches = get_nearby_beaches(
+        db, latitude=lat, longitude=lng, radius_km=radius
+    )
+    
+    # Set is_favorite flag if user is authenticated
+    if current_user:
+        user_favorites = get_user_favorite_beaches(db, user_id=current_user.id)
+        favorite_ids = {b.id for b in user_favorites}
+        
+        for beach in beaches:
+            beach.is_favorite = beach.id in favorite_ids
+    
+    return beaches
+
+
+@router.get("/tiles/{z}/{x}/{y}", response_model=BeachTile)
+async def read_beach_tile(
+    z: int = Path(..., ge=0, le=22, description="Zoom level"),
+    x: int = Path(..., ge=0, description="Tile column"),
+    y: int = Path(..., ge=0, description="Tile row"),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get clustered beach markers for a map tile, with the worst current
+    suitability level of each cluster
+    """
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tile coordinates out of range for zoom level"
+        )
+    
+    return MapTileService().get_tile(db, z=z, x=x, y=y)
+
+
 @router.get("/{beach_id}", response_model=Beach)
 async def read_beach(
     beach_id: int,
@@ -197,12 +244,14 @@ async def delete_beach_record(
 @router.get("/{beach_id}/conditions", response_model=BeachConditions)
 async def read_beach_conditions(
     beach_id: int,
+    at: Optional[datetime] = Query(None, description="Time of the conditions (UTC when no offset is given), defaults to now"),
+    interpolate: bool = Query(False, description="Interpolate between the neighbouring forecast hours"),
     db: Session = Depends(get_db)
 ) -> Any:
     """
-    Get current beach conditions with safety assessment
+    Get beach conditions with safety assessment, now or at a given time
     """
-    conditions = get_current_beach_conditions(db, beach_id=beach_id)
+    conditions = get_beach_conditions_at(db, beach_id, at or datetime.utcnow(), interpolate=interpolate)
     if not conditions:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -253,32 +302,6 @@ async def remove_from_favorites(
     return {"status": "success", "message": "Beach removed from favorites"}
 
 
-@router.get("/nearby", response_model=List[Beach])
-async def get_nearby_beaches(
-    lat: float = Query(..., description="Latitude"),
-    lng: float = Query(..., description="Longitude"),
-    radius: float = Query(50.0, description="Search radius in kilometers"),
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
-) -> Any:
-    """
-    Get beaches near a location
-    """
-    beaches = app.crud.beach.get_nearby_beaches(
-        db, latitude=lat, longitude=lng, radius_km=radius
-    )
-    
-    # Set is_favorite flag if user is authenticated
-    if current_user:
-        user_favorites = get_user_favorite_beaches(db, user_id=current_user.id)
-        favorite_ids = {b.id for b in user_favorites}
-        
-        for beach in beaches:
-            beach.is_favorite = beach.id in favorite_ids
-    
-    return beaches
-
-
 @router.get("/user/favorites", response_model=List[Beach])
 async def read_favorite_beaches(
     db: Session = Depends(get_db),
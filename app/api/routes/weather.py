@@ -6,10 +6,11 @@ from datetime import datetime, timedelta
 from app.api.deps import get_db, get_current_active_admin
 from app.models.user import User
 from app.schemas.weather_data import WeatherData, WeatherDataCreate, BeachConditions
-from app.crud.weather import get_beach_weather_data, get_current_beach_conditions
+from app.crud.weather import get_beach_weather_data, get_current_beach_conditions, get_weather_data_raw
 from app.services.stormglass import StormGlassService
 from app.services.suitability import SuitabilityService
-from app.tasks.weather import fetch_and_store_weather_data
+from app.tasks.weather import fetch_and_store_weather_data_task
+from app.tasks.rescore import get_rescore_status, rescore_weather_data
 
 router = APIRouter()
 
@@ -41,15 +42,14 @@ async def read_beach_weather(
 async def fetch_weather_data(
     beach_id: int,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_admin)
 ) -> Any:
     """
     Fetch weather data for a beach from StormGlass API (admin only)
     """
-    # Add task to background to fetch and store weather data
+    # Add task to background to fetch and store weather data, with its own session
     background_tasks.add_task(
-        fetch_and_store_weather_data, db, beach_id
+        fetch_and_store_weather_data_task, beach_id
     )
     
     return {
@@ -58,6 +58,59 @@ async def fetch_weather_data(
     }
 
 
+@router.post("/rescore", response_model=dict)
+async def rescore_weather(
+    background_tasks: BackgroundTasks,
+    restart: bool = False,
+    current_user: User = Depends(get_current_active_admin)
+) -> Any:
+    """
+    Recompute stored safety scores with the current thresholds (admin only)
+    
+    An interrupted run resumes from its checkpoint unless restart is set.
+    """
+    if get_rescore_status()["running"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Re-scoring is already running"
+        )
+    
+    background_tasks.add_task(rescore_weather_data, restart=restart)
+    
+    return {
+        "status": "success",
+        "message": "Weather data re-scoring started in the background"
+    }
+
+
+@router.get("/rescore", response_model=dict)
+async def read_rescore_status(
+    current_user: User = Depends(get_current_active_admin)
+) -> Any:
+    """
+    Get the progress of the current re-scoring run and the last finished one (admin only)
+    """
+    return get_rescore_status()
+
+
+@router.get("/data/{weather_data_id}/raw", response_model=dict)
+async def read_weather_data_raw(
+    weather_data_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+) -> Any:
+    """
+    Get the raw StormGlass data a weather data row was parsed from (admin only)
+    """
+    raw = get_weather_data_raw(db, id=weather_data_id)
+    if not raw:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Weather data not found"
+        )
+    return raw
+
+
 @router.get("/beaches/{beach_id}/conditions", response_model=BeachConditions)
 async def read_beach_weather_conditions(
     beach_id: int,
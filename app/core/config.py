@@ -57,11 +57,46 @@ class Settings(BaseSettings):
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", 6379))
     REDIS_DB: int = int(os.getenv("REDIS_DB", 0))
     REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
+    # In-memory cache used when Redis is unavailable
+    MEMORY_CACHE_MAX_ENTRIES: int = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", 10000))
+    MEMORY_CACHE_MAX_BYTES: int = int(os.getenv("MEMORY_CACHE_MAX_BYTES", 64 * 1024 * 1024))  # 64 MB of serialized values
+    MEMORY_CACHE_SWEEP_INTERVAL: float = float(os.getenv("MEMORY_CACHE_SWEEP_INTERVAL", 60.0))  # seconds
+    # In-process L1 cache in front of Redis, invalidated over pub/sub
+    L1_CACHE_TTL: float = float(os.getenv("L1_CACHE_TTL", 5.0))  # seconds, 0 disables L1
+    L1_CACHE_MAX_ENTRIES: int = int(os.getenv("L1_CACHE_MAX_ENTRIES", 1000))
+    L1_CACHE_MAX_BYTES: int = int(os.getenv("L1_CACHE_MAX_BYTES", 8 * 1024 * 1024))  # 8 MB
+    L1_CACHE_MAX_VALUE_BYTES: int = int(os.getenv("L1_CACHE_MAX_VALUE_BYTES", 16 * 1024))  # larger values stay in Redis only
+    CACHE_INVALIDATION_CHANNEL: str = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache_invalidation")
 
     # StormGlass API configuration
     STORMGLASS_API_KEY: str = os.getenv("STORMGLASS_API_KEY", "")
     STORMGLASS_BASE_URL: str = "https://api.stormglass.io/v2"
     STORMGLASS_CACHE_TTL: int = int(os.getenv("STORMGLASS_CACHE_TTL", 3600))  # 1 hour
+    STORMGLASS_CACHE_COORD_PRECISION: int = int(os.getenv("STORMGLASS_CACHE_COORD_PRECISION", 2))  # decimals, ~1 km
+    STORMGLASS_HTTP2: bool = os.getenv("STORMGLASS_HTTP2", "False").lower() == "true"  # needs httpx[http2]
+    STORMGLASS_HTTP_MAX_CONNECTIONS: int = int(os.getenv("STORMGLASS_HTTP_MAX_CONNECTIONS", 20))
+    STORMGLASS_HTTP_MAX_KEEPALIVE: int = int(os.getenv("STORMGLASS_HTTP_MAX_KEEPALIVE", 10))
+    STORMGLASS_HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("STORMGLASS_HTTP_KEEPALIVE_EXPIRY", 30.0))  # seconds
+    STORMGLASS_CONNECT_TIMEOUT: float = float(os.getenv("STORMGLASS_CONNECT_TIMEOUT", 5.0))  # seconds
+    STORMGLASS_READ_TIMEOUT: float = float(os.getenv("STORMGLASS_READ_TIMEOUT", 30.0))  # seconds
+    STORMGLASS_LEASE_TTL: int = int(os.getenv("STORMGLASS_LEASE_TTL", 120))  # cross-worker fetch lease, seconds
+    STORMGLASS_LEASE_WAIT: float = float(os.getenv("STORMGLASS_LEASE_WAIT", 60.0))  # wait for another worker's fetch
+    STORMGLASS_GRID_RESOLUTION_DEG: float = float(os.getenv("STORMGLASS_GRID_RESOLUTION_DEG", 0.1))  # 0 = per beach
+    STORMGLASS_MAX_CONCURRENCY: int = int(os.getenv("STORMGLASS_MAX_CONCURRENCY", 10))  # requests in flight
+    STORMGLASS_RATE_PER_SECOND: float = float(os.getenv("STORMGLASS_RATE_PER_SECOND", 5.0))  # token bucket refill
+    STORMGLASS_RATE_BURST: int = int(os.getenv("STORMGLASS_RATE_BURST", 10))  # token bucket size
+    STORMGLASS_DAILY_QUOTA: int = int(os.getenv("STORMGLASS_DAILY_QUOTA", 500))  # requests per UTC day, 0 = unlimited
+    STORMGLASS_MAX_RETRIES: int = int(os.getenv("STORMGLASS_MAX_RETRIES", 2))  # retries after a 429
+    STORMGLASS_MAX_RETRY_WAIT: int = int(os.getenv("STORMGLASS_MAX_RETRY_WAIT", 60))  # longer Retry-After gives up
+
+    # Weather ingestion settings
+    WEATHER_FORECAST_HOURS: int = int(os.getenv("WEATHER_FORECAST_HOURS", 48))  # forecast horizon kept stored
+    WEATHER_REVISION_HOURS: int = int(os.getenv("WEATHER_REVISION_HOURS", 6))  # next hours re-requested, 0 = never
+    WEATHER_MIN_FETCH_HOURS: int = int(os.getenv("WEATHER_MIN_FETCH_HOURS", 3))  # shorter ranges wait for later
+    WEATHER_PARSE_PROCESSES: int = int(os.getenv("WEATHER_PARSE_PROCESSES", 0))  # parsing worker processes, 0 = inline
+    WEATHER_RAW_STORAGE: str = os.getenv("WEATHER_RAW_STORAGE", "full")  # full, remainder or blob
+    WEATHER_RAW_RETENTION_DAYS: int = int(os.getenv("WEATHER_RAW_RETENTION_DAYS", 90))  # hourly rows kept, older ones as daily summaries; 0 = forever
+    WEATHER_PERSIST_WORKERS: int = int(os.getenv("WEATHER_PERSIST_WORKERS", 4))  # threads writing forecasts, each with a DB connection
 
     # Notification settings
     EMAIL_ENABLED: bool = os.getenv("EMAIL_ENABLED", "False").lower() == "true"
@@ -78,6 +113,18 @@ class Settings(BaseSettings):
     WIND_SPEED_THRESHOLD_DANGER: float = float(os.getenv("WIND_SPEED_THRESHOLD_DANGER", 15.0))  # m/s
     CURRENT_SPEED_THRESHOLD_WARNING: float = float(os.getenv("CURRENT_SPEED_THRESHOLD_WARNING", 0.5))  # m/s
     CURRENT_SPEED_THRESHOLD_DANGER: float = float(os.getenv("CURRENT_SPEED_THRESHOLD_DANGER", 1.0))  # m/s
+    RESCORE_BATCH_SIZE: int = int(os.getenv("RESCORE_BATCH_SIZE", 10000))  # rows per re-scoring batch
+
+    # Spatial search settings
+    SPATIAL_SEARCH_BACKEND: str = os.getenv("SPATIAL_SEARCH_BACKEND", "index")  # "index" (in-memory) or "database"
+    SPATIAL_INDEX_CELL_DEG: float = float(os.getenv("SPATIAL_INDEX_CELL_DEG", 0.25))  # grid cell size in degrees
+    SPATIAL_INDEX_REFRESH_SECONDS: int = int(os.getenv("SPATIAL_INDEX_REFRESH_SECONDS", 300))  # full reload interval
+    MAX_NOTIFICATION_RADIUS_KM: float = float(os.getenv("MAX_NOTIFICATION_RADIUS_KM", 200.0))  # larger stored radii are clamped
+
+    # Map tile settings
+    MAP_TILE_CACHE_TTL: int = int(os.getenv("MAP_TILE_CACHE_TTL", 600))  # 10 minutes
+    MAP_TILE_CLUSTER_GRID: int = int(os.getenv("MAP_TILE_CLUSTER_GRID", 8))  # clustering cells per tile side
+    MAP_TILE_MAX_CLUSTER_ZOOM: int = int(os.getenv("MAP_TILE_MAX_CLUSTER_ZOOM", 14))  # no clustering from this zoom
 
     class Config:
         env_file = ".env"
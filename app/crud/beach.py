@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Optional, Dict, Any
-from geopy.distance import geodesic
+from typing import List, Optional, Dict, Any, Tuple
 
+from app.core.config import settings
+from app.db.spatial import within_distance_filter
 from app.models.beach import Beach
 from app.schemas.beach import BeachCreate, BeachUpdate
 from app.schemas.weather_data import BeachConditions
+from app.services.distance import PointSet
+from app.services.map_tiles import invalidate_tile_cache
+from app.services.spatial_index import beach_index
 
 
 def get_beach(db: Session, id: int) -> Optional[Beach]:
@@ -20,7 +24,7 @@ def get_beach(db: Session, id: int) -> Optional[Beach]:
 def get_beaches(
     db: Session, 
     skip: int = 0, 
-    limit: int = 100,
+    limit: Optional[int] = 100,
     state: Optional[str] = None,
     name: Optional[str] = None,
     is_active: bool = True
@@ -68,6 +72,7 @@ def create_beach(db: Session, obj_in: BeachCreate) -> Beach:
     db.add(beach)
     db.commit()
     db.refresh(beach)
+    _sync_beach_index(beach)
     return beach
 
 
@@ -106,6 +111,7 @@ def update_beach(db: Session, db_obj: Beach, obj_in: BeachUpdate) -> Beach:
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    _sync_beach_index(db_obj)
     return db_obj
 
 
@@ -127,6 +133,36 @@ def delete_beach(db: Session, id: int) -> None:
         beach.is_active = False
         db.add(beach)
         db.commit()
+        _sync_beach_index(beach)
+
+
+def _sync_beach_index(beach: Beach) -> None:
+    """Keep the in-memory spatial index and map tiles in line with a saved beach"""
+    invalidate_tile_cache()
+    if beach.is_active:
+        beach_index.insert(beach.id, beach.latitude, beach.longitude)
+    else:
+        beach_index.remove(beach.id)
+
+
+def _ensure_beach_index(db: Session) -> None:
+    """Load the spatial index from the beach table if it is missing or stale"""
+    if not beach_index.is_stale():
+        return
+    rows = db.query(Beach.id, Beach.latitude, Beach.longitude).filter(Beach.is_active == True).all()
+    beach_index.rebuild(rows)
+
+
+def _nearby_candidates(db: Session, latitude: float, longitude: float, radius_km: float) -> List[Tuple[int, float, float]]:
+    """Get (id, latitude, longitude) of active beaches that may be within the radius"""
+    if settings.SPATIAL_SEARCH_BACKEND == "database":
+        return db.query(Beach.id, Beach.latitude, Beach.longitude).filter(
+            Beach.is_active == True,
+            within_distance_filter(db, "beach", Beach.latitude, Beach.longitude, latitude, longitude, radius_km)
+        ).all()
+
+    _ensure_beach_index(db)
+    return beach_index.query(latitude, longitude, radius_km)
 
 
 def get_nearby_beaches(
@@ -138,33 +174,38 @@ def get_nearby_beaches(
 ) -> List[Beach]:
     """
     Get beaches near a specific location
-    
-    Note: This is a simple implementation using Python.
-    For production, consider using PostGIS for geospatial queries.
+
+    Candidates come from the in-memory spatial index, or from a bounding box
+    (PostGIS radius) filter in SQL when SPATIAL_SEARCH_BACKEND is "database",
+    so only beaches around the location get a distance check, computed for
+    all of them at once with an exact ellipsoidal refinement.
     """
-    # Get all active beaches
-    beaches = db.query(Beach).filter(Beach.is_active == True).all()
-    
-    # Calculate distances and filter
+    candidates = PointSet.from_rows(_nearby_candidates(db, latitude, longitude, radius_km))
+    beach_ids, beach_distances = candidates.nearest_within(latitude, longitude, radius_km, limit=limit)
+    distances = list(zip(beach_distances.tolist(), beach_ids.tolist()))
+    if not distances:
+        return []
+
+    beaches = db.query(Beach).filter(
+        Beach.id.in_([beach_id for _, beach_id in distances]),
+        Beach.is_active == True
+    ).all()
+    beaches_by_id = {beach.id: beach for beach in beaches}
+
     nearby_beaches = []
-    for beach in beaches:
-        # Calculate distance using geodesic formula
-        distance = geodesic(
-            (latitude, longitude),
-            (beach.latitude, beach.longitude)
-        ).kilometers
-        
-        if distance <= radius_km:
-            # Add distance attribute to beach
-            beach.distance = distance
-            # Generate location if missing
-            if not beach.location:
-                beach.location = f"{beach.city}, {beach.state}"
-            nearby_beaches.append(beach)
-    
-    # Sort by distance and limit results
-    nearby_beaches.sort(key=lambda x: x.distance)
-    return nearby_beaches[:limit]
+    for distance, beach_id in distances:
+        beach = beaches_by_id.get(beach_id)
+        if not beach:
+            # Index entry is older than the table, skip it
+            continue
+        # Add distance attribute to beach
+        beach.distance = distance
+        # Generate location if missing
+        if not beach.location:
+            beach.location = f"{beach.city}, {beach.state}"
+        nearby_beaches.append(beach)
+
+    return nearby_beaches
 
 
 def get_nearby_beaches_with_conditions(
@@ -178,15 +219,17 @@ def get_nearby_beaches_with_conditions(
     Get beaches near a specific location with current conditions
     """
     # Import here to avoid circular dependency
-    from app.crud.weather import get_current_beach_conditions
+    from app.crud.weather import get_beaches_conditions
     
     # Get nearby beaches
     beaches = get_nearby_beaches(db, latitude, longitude, radius_km, limit)
     
-    # Get conditions for each beach
+    # Get conditions for all beaches in one query
+    conditions_by_beach = get_beaches_conditions(db, [beach.id for beach in beaches])
+    
     results = []
     for beach in beaches:
-        conditions = get_current_beach_conditions(db, beach_id=beach.id)
+        conditions = conditions_by_beach.get(beach.id)
         if conditions:
             # Add distance to conditions
             conditions.distance_km = getattr(beach, 'distance', None)
@@ -1,10 +1,27 @@
 from sqlalchemy.orm import Session
-from typing import Optional, List, Dict, Any, Union
+from sqlalchemy import case, func
+from typing import Optional, List, Dict, Any, Union, Tuple
 from datetime import datetime
+import time
 
+from app.core.config import settings
+from app.db.spatial import within_distance_filter
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.auth import get_password_hash, verify_password
+from app.services.distance import PointSet
+from app.services.spatial_index import user_index
+
+# Radius used for users without their own notification radius
+DEFAULT_NOTIFICATION_RADIUS_KM = 10.0
+
+# Largest notification radius, bounds the SQL bounding box for recipients
+_max_radius_cache: Dict[str, Any] = {"value": DEFAULT_NOTIFICATION_RADIUS_KM, "loaded_at": None}
+
+
+def _notification_radius(radius_km: Optional[float]) -> float:
+    """Get the radius alerts are sent within for a stored notification radius, clamped to the maximum"""
+    return min(radius_km or DEFAULT_NOTIFICATION_RADIUS_KM, settings.MAX_NOTIFICATION_RADIUS_KM)
 
 
 def get_user(db: Session, id: int) -> Optional[User]:
@@ -46,6 +63,7 @@ def create_user(db: Session, obj_in: UserCreate) -> User:
     db.add(user)
     db.commit()
     db.refresh(user)
+    _sync_user_index(user)
     
     return user
 
@@ -77,6 +95,7 @@ def update_user(db: Session, db_obj: User, obj_in: UserUpdate) -> User:
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    _sync_user_index(db_obj)
     
     return db_obj
 
@@ -95,10 +114,101 @@ def update_user_location(
     db.add(user)
     db.commit()
     db.refresh(user)
+    _sync_user_index(user)
     
     return user
 
 
+def _sync_user_index(user: User) -> None:
+    """Keep the in-memory user location index in line with a saved user"""
+    if user.is_active and user.current_latitude is not None and user.current_longitude is not None:
+        user_index.insert(
+            user.id,
+            user.current_latitude,
+            user.current_longitude,
+            _notification_radius(user.notification_radius_km)
+        )
+    else:
+        user_index.remove(user.id)
+
+
+def ensure_user_index(db: Session) -> None:
+    """Load the user location index if it is missing or stale"""
+    if not user_index.is_stale():
+        return
+    rows = db.query(
+        User.id, User.current_latitude, User.current_longitude, User.notification_radius_km
+    ).filter(
+        User.is_active == True,
+        User.current_latitude.isnot(None),
+        User.current_longitude.isnot(None)
+    ).all()
+    user_index.rebuild(
+        (user_id, lat, lng, _notification_radius(radius))
+        for user_id, lat, lng, radius in rows
+    )
+
+
+def _max_notification_radius(db: Session) -> float:
+    """Get the largest notification radius, cached for the index refresh interval"""
+    if _max_radius_cache["loaded_at"] is None or time.monotonic() - _max_radius_cache["loaded_at"] > settings.SPATIAL_INDEX_REFRESH_SECONDS:
+        max_radius = db.query(func.max(User.notification_radius_km)).scalar()
+        _max_radius_cache["value"] = _notification_radius(max(max_radius or 0.0, DEFAULT_NOTIFICATION_RADIUS_KM))
+        _max_radius_cache["loaded_at"] = time.monotonic()
+    return _max_radius_cache["value"]
+
+
+def _covering_candidates(db: Session, latitude: float, longitude: float) -> List[Tuple[int, float, float, float]]:
+    """Get (id, latitude, longitude, radius_km) of active users whose radius may cover a location"""
+    if settings.SPATIAL_SEARCH_BACKEND == "database":
+        radius = case(
+            (User.notification_radius_km > settings.MAX_NOTIFICATION_RADIUS_KM, settings.MAX_NOTIFICATION_RADIUS_KM),
+            else_=func.coalesce(User.notification_radius_km, DEFAULT_NOTIFICATION_RADIUS_KM)
+        )
+        return db.query(User.id, User.current_latitude, User.current_longitude, radius).filter(
+            User.is_active == True,
+            User.current_latitude.isnot(None),
+            User.current_longitude.isnot(None),
+            within_distance_filter(
+                db, "user", User.current_latitude, User.current_longitude, latitude, longitude,
+                radius, box_radius_km=_max_notification_radius(db)
+            )
+        ).all()
+
+    ensure_user_index(db)
+    return user_index.covering(latitude, longitude)
+
+
+def get_users_to_notify(db: Session, latitude: float, longitude: float) -> List[Tuple[User, float]]:
+    """
+    Get active users whose notification radius covers a location
+
+    Only users bucketed in the location's index cell (or matched by the SQL
+    radius filter when SPATIAL_SEARCH_BACKEND is "database") are considered
+    and loaded from the database.
+
+    Returns:
+        List of (user, distance in km) tuples
+    """
+    candidates = _covering_candidates(db, latitude, longitude)
+    if not candidates:
+        return []
+
+    points = PointSet.from_rows((user_id, lat, lng) for user_id, lat, lng, _ in candidates)
+    radii = [radius for _, _, _, radius in candidates]
+    user_ids, distances = points.within(latitude, longitude, radii)
+    if not len(user_ids):
+        return []
+
+    users = db.query(User).filter(User.id.in_(user_ids.tolist()), User.is_active == True).all()
+    users_by_id = {user.id: user for user in users}
+    return [
+        (users_by_id[user_id], distance)
+        for user_id, distance in zip(user_ids.tolist(), distances.tolist())
+        if user_id in users_by_id
+    ]
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password"""
     user = get_user_by_email(db, email)
@@ -117,5 +227,6 @@ user = {
     "create": create_user,
     "update": update_user,
     "update_location": update_user_location,
+    "get_to_notify": get_users_to_notify,
     "authenticate": authenticate_user
 } 
\ No newline at end of file
@@ -1,11 +1,20 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from sqlalchemy import insert, literal, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import List, Optional, Dict, Any, Set
+from datetime import datetime, timedelta, timezone
+import json
+import zlib
 
+from app.core.config import settings
 from app.models.weather_data import WeatherData
+from app.models.weather_daily_summary import SUMMARY_METRICS, WeatherDailySummary
+from app.models.weather_payload import WeatherPayload
 from app.models.beach import Beach
+from app.models.beach_current_conditions import BeachCurrentConditions
 from app.schemas.weather_data import WeatherDataCreate, BeachConditions
+from app.services.suitability import ForecastHour, SuitabilityService, forecast_hour_rows
 
 
 def get_weather_data(db: Session, id: int) -> Optional[WeatherData]:
@@ -13,6 +22,58 @@ def get_weather_data(db: Session, id: int) -> Optional[WeatherData]:
     return db.query(WeatherData).filter(WeatherData.id == id).first()
 
 
+def get_raw_retention_cutoff(now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Get the start of the oldest day kept as hourly weather data
+
+    Older days are served from the daily summaries. None when
+    WEATHER_RAW_RETENTION_DAYS is 0 and hourly data is kept forever.
+    """
+    if settings.WEATHER_RAW_RETENTION_DAYS <= 0:
+        return None
+    day = (now or datetime.utcnow()) - timedelta(days=settings.WEATHER_RAW_RETENTION_DAYS)
+    return datetime(day.year, day.month, day.day)
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    """Convert a timestamp to the naive UTC form stored in the database"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def summary_as_weather_data(summary: WeatherDailySummary) -> WeatherData:
+    """
+    Present a daily summary as a (transient) weather data row
+
+    The row has no id, as summary ids do not identify weather data. It is
+    stamped at midnight with the daily means; minimums, maximums and the
+    hour counts are in additional_data.
+    """
+    additional_data = {"summary": "daily", "hours": summary.hours}
+    for metric in SUMMARY_METRICS:
+        additional_data[metric] = {
+            "min": getattr(summary, f"{metric}_min"),
+            "max": getattr(summary, f"{metric}_max"),
+            "mean": getattr(summary, f"{metric}_mean"),
+        }
+    additional_data["safety_score_min"] = summary.safety_score_min
+    additional_data["warning_hours"] = summary.warning_hours
+    additional_data["danger_hours"] = summary.danger_hours
+
+    return WeatherData(
+        beach_id=summary.beach_id,
+        timestamp=datetime(summary.date.year, summary.date.month, summary.date.day),
+        source=summary.source,
+        **{metric: getattr(summary, f"{metric}_mean") for metric in SUMMARY_METRICS},
+        additional_data=additional_data,
+        safety_score=round(summary.safety_score_mean) if summary.safety_score_mean is not None else None,
+        suitability_level=summary.suitability_level,
+        created_at=summary.created_at,
+        updated_at=summary.updated_at
+    )
+
+
 def get_beach_weather_data(
     db: Session,
     beach_id: int,
@@ -23,18 +84,48 @@ def get_beach_weather_data(
 ) -> List[WeatherData]:
     """
     Get weather data for a specific beach within a time range
+
+    Hours within WEATHER_RAW_RETENTION_DAYS come from the hourly table, older
+    days from the daily summaries (one row per day, after the hourly rows).
     """
-    query = db.query(WeatherData).filter(WeatherData.beach_id == beach_id)
-    
+    start_date = _as_naive_utc(start_date) if start_date else None
+    end_date = _as_naive_utc(end_date) if end_date else None
+    cutoff = get_raw_retention_cutoff()
+
+    results: List[WeatherData] = []
+    raw_count = 0
+    if cutoff is None or end_date is None or end_date >= cutoff:
+        query = db.query(WeatherData).filter(WeatherData.beach_id == beach_id)
+        
+        if start_date:
+            query = query.filter(WeatherData.timestamp >= start_date)
+        
+        if end_date:
+            query = query.filter(WeatherData.timestamp <= end_date)
+        
+        # Hourly rows past the cutoff wait for their partition to be dropped
+        if cutoff is not None:
+            query = query.filter(WeatherData.timestamp >= cutoff)
+        
+        query = query.order_by(WeatherData.timestamp.desc())
+        
+        results = query.offset(skip).limit(limit).all()
+        if cutoff is None or (start_date and start_date >= cutoff) or len(results) == limit:
+            return results
+        # Summaries follow the last hourly row, their offset needs the hourly row count
+        raw_count = skip + len(results) if results or not skip else query.count()
+
+    summaries = db.query(WeatherDailySummary).filter(
+        WeatherDailySummary.beach_id == beach_id,
+        WeatherDailySummary.date < cutoff.date()
+    )
     if start_date:
-        query = query.filter(WeatherData.timestamp >= start_date)
-    
+        summaries = summaries.filter(WeatherDailySummary.date >= start_date.date())
     if end_date:
-        query = query.filter(WeatherData.timestamp <= end_date)
-    
-    query = query.order_by(WeatherData.timestamp.desc())
-    
-    return query.offset(skip).limit(limit).all()
+        summaries = summaries.filter(WeatherDailySummary.date <= end_date.date())
+    summaries = summaries.order_by(WeatherDailySummary.date.desc()).offset(max(skip - raw_count, 0))
+
+    return results + [summary_as_weather_data(summary) for summary in summaries.limit(limit - len(results)).all()]
 
 
 def create_weather_data(db: Session, obj_in: WeatherDataCreate) -> WeatherData:
@@ -82,6 +173,262 @@ def create_weather_data(db: Session, obj_in: WeatherDataCreate) -> WeatherData:
     return weather_data
 
 
+# Columns identifying a forecast hour, backed by uq_weatherdata_beach_id_timestamp_source
+WEATHER_DATA_KEY = ("beach_id", "timestamp", "source")
+
+
+def _upsert_rows(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Insert or update weather data rows by WEATHER_DATA_KEY, without committing"""
+    values_by_key = {}
+    for row in rows:
+        # The last forecast for a key wins, ON CONFLICT cannot touch a row twice
+        values_by_key[tuple(row[column] for column in WEATHER_DATA_KEY)] = row
+    values = list(values_by_key.values())
+
+    dialect = db.bind.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(WeatherData).values(values)
+        update_columns = {
+            column.name: stmt.excluded[column.name]
+            for column in WeatherData.__table__.columns
+            if column.name not in WEATHER_DATA_KEY + ("id", "created_at")
+        }
+        db.execute(stmt.on_conflict_do_update(index_elements=list(WEATHER_DATA_KEY), set_=update_columns))
+    else:
+        # No portable ON CONFLICT: replace the overlapping hours in the same transaction
+        keys = list(values_by_key.keys())
+        db.query(WeatherData).filter(
+            tuple_(WeatherData.beach_id, WeatherData.timestamp, WeatherData.source).in_(keys)
+        ).delete(synchronize_session=False)
+        db.execute(insert(WeatherData), values)
+
+    return len(values)
+
+
+def upsert_forecast_hours(
+    db: Session,
+    beach_id: int,
+    hours: List[ForecastHour],
+    source: str = "stormglass"
+) -> int:
+    """
+    Insert or update the parsed forecast hours of a beach in a single transaction
+
+    Rows are keyed on (beach_id, timestamp, source): a forecast hour that is
+    already stored is overwritten by the newer forecast instead of being
+    duplicated. Hours produced by SuitabilityService are trusted internal
+    data, so rows are built from the tuples without a WeatherDataCreate
+    model per hour.
+
+    Returns:
+        int: Number of rows inserted or updated
+    """
+    count = _upsert_rows(db, forecast_hour_rows(beach_id, hours, source)) if hours else 0
+    # Current conditions change in the same transaction as the forecast
+    refresh_current_conditions(db, [beach_id], source=source)
+    db.commit()
+
+    return count
+
+
+def create_weather_data_bulk(db: Session, objs_in: List[WeatherDataCreate]) -> int:
+    """
+    Store many weather data rows in a single transaction
+
+    Same upsert as upsert_forecast_hours, for validated rows of any beach:
+    an hour that is already stored is updated instead of duplicated.
+
+    Returns:
+        int: Number of rows inserted or updated
+    """
+    if not objs_in:
+        return 0
+
+    now = datetime.utcnow()
+    count = _upsert_rows(db, [
+        {**obj_in.model_dump(), "created_at": now, "updated_at": now}
+        for obj_in in objs_in
+    ])
+    beach_ids_by_source: Dict[str, Set[int]] = {}
+    for obj_in in objs_in:
+        beach_ids_by_source.setdefault(obj_in.source, set()).add(obj_in.beach_id)
+    for source, beach_ids in beach_ids_by_source.items():
+        refresh_current_conditions(db, list(beach_ids), source=source)
+    db.commit()
+
+    return count
+
+
+# Columns copied from the forecast hour in effect into the current conditions
+CURRENT_CONDITIONS_COLUMNS = (
+    "timestamp", "source", "wave_height", "wind_speed", "water_temperature",
+    "current_speed", "safety_score", "suitability_level",
+)
+
+# Oldest forecast hour still taken as the current conditions
+CURRENT_CONDITIONS_MAX_AGE = timedelta(hours=24)
+
+
+def _current_hour(now: datetime) -> datetime:
+    """
+    Get the start of the forecast hour containing a time
+
+    Current conditions rows stamped before it may have been superseded by a
+    stored hour that is now in effect, so readers only trust newer rows.
+    """
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+def refresh_current_conditions(
+    db: Session,
+    beach_ids: List[int],
+    source: str = "stormglass",
+    now: Optional[datetime] = None
+) -> None:
+    """
+    Copy the forecast hour in effect now into the current conditions of beaches
+
+    The hour in effect is the latest stored hour that is not in the future.
+    Rows of beaches without one in the last CURRENT_CONDITIONS_MAX_AGE are
+    deleted, so readers fall back instead of showing stale conditions. Runs
+    in the caller's transaction, without committing.
+    """
+    if not beach_ids:
+        return
+
+    now = now or datetime.utcnow()
+    table = WeatherData.__table__
+    ranked = select(
+        *(table.c[column] for column in ("beach_id",) + CURRENT_CONDITIONS_COLUMNS),
+        func.row_number().over(partition_by=table.c.beach_id, order_by=table.c.timestamp.desc()).label("row_number")
+    ).where(
+        table.c.beach_id.in_(beach_ids),
+        table.c.source == source,
+        table.c.timestamp <= now,
+        table.c.timestamp > now - CURRENT_CONDITIONS_MAX_AGE
+    ).subquery()
+    columns = ("beach_id",) + CURRENT_CONDITIONS_COLUMNS
+    current = select(*(ranked.c[column] for column in columns), literal(now)).where(ranked.c.row_number == 1)
+    target = BeachCurrentConditions.__table__
+
+    dialect = db.bind.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(target).from_select(columns + ("updated_at",), current)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["beach_id"],
+            set_={column: stmt.excluded[column] for column in CURRENT_CONDITIONS_COLUMNS + ("updated_at",)}
+        ))
+    else:
+        rows = [dict(zip(columns + ("updated_at",), row)) for row in db.execute(current).all()]
+        if rows:
+            db.query(BeachCurrentConditions).filter(
+                BeachCurrentConditions.beach_id.in_([row["beach_id"] for row in rows])
+            ).delete(synchronize_session=False)
+            db.execute(insert(target), rows)
+
+    # Rows that were not refreshed above have no hour in effect anymore
+    db.query(BeachCurrentConditions).filter(
+        BeachCurrentConditions.beach_id.in_(beach_ids),
+        BeachCurrentConditions.timestamp <= now - CURRENT_CONDITIONS_MAX_AGE
+    ).delete(synchronize_session=False)
+
+
+def create_weather_payload(
+    db: Session,
+    data: Dict[str, Any],
+    latitude: float,
+    longitude: float,
+    start: datetime,
+    end: datetime,
+    source: str = "stormglass"
+) -> int:
+    """
+    Store a raw upstream response once, zlib-compressed
+
+    Used when WEATHER_RAW_STORAGE is "blob": weather data rows reference the
+    payload by payload_id instead of each carrying a copy of its raw hour.
+
+    Returns:
+        int: ID of the stored payload
+    """
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    payload = WeatherPayload(
+        source=source,
+        latitude=latitude,
+        longitude=longitude,
+        start=start,
+        end=end,
+        encoding="zlib",
+        data=zlib.compress(raw),
+        raw_size=len(raw)
+    )
+    db.add(payload)
+    db.commit()
+    return payload.id
+
+
+def _decode_payload(payload: WeatherPayload) -> Dict[str, Any]:
+    if payload.encoding != "zlib":
+        raise ValueError(f"Unsupported payload encoding '{payload.encoding}'")
+    return json.loads(zlib.decompress(payload.data))
+
+
+def _hour_time(value: str) -> datetime:
+    """Parse a raw hour time the way it is stored in the naive timestamp column"""
+    return _as_naive_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+def get_weather_data_raw(db: Session, id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get the raw upstream data a weather data row was parsed from, for debugging
+
+    Returns the additional_data kept on the row and, for rows stored with a
+    payload blob, the decompressed hour of the payload matching the row.
+    """
+    weather_data = get_weather_data(db, id)
+    if not weather_data:
+        return None
+
+    raw = {
+        "id": weather_data.id,
+        "beach_id": weather_data.beach_id,
+        "timestamp": weather_data.timestamp,
+        "source": weather_data.source,
+        "additional_data": weather_data.additional_data,
+        "payload": None,
+        "hour": None,
+    }
+    if weather_data.payload_id is None:
+        return raw
+
+    payload = db.query(WeatherPayload).filter(WeatherPayload.id == weather_data.payload_id).first()
+    if not payload:
+        return raw
+
+    data = _decode_payload(payload)
+    raw["payload"] = {
+        "id": payload.id,
+        "fetched_at": payload.created_at,
+        "latitude": payload.latitude,
+        "longitude": payload.longitude,
+        "start": payload.start,
+        "end": payload.end,
+        "raw_size": payload.raw_size,
+        "compressed_size": len(payload.data),
+        "meta": data.get("meta"),
+    }
+    raw["hour"] = next(
+        (
+            hour for hour in data.get("hours", [])
+            if hour.get("time") and _hour_time(hour["time"]) == weather_data.timestamp
+        ),
+        None
+    )
+    return raw
+
+
 def get_latest_weather_data(db: Session, beach_id: int) -> Optional[WeatherData]:
     """
     Get the latest weather data for a beach
@@ -91,48 +438,335 @@ def get_latest_weather_data(db: Session, beach_id: int) -> Optional[WeatherData]
     ).order_by(WeatherData.timestamp.desc()).first()
 
 
+# Measurements interpolated between forecast hours; directions in degrees go the shortest way round
+INTERPOLATED_COLUMNS = (
+    "wave_height", "wave_period", "swell_height", "swell_period", "wind_speed", "wind_gust",
+    "water_temperature", "air_temperature", "current_speed", "chlorophyll", "salinity", "ph", "oxygen",
+)
+INTERPOLATED_DIRECTIONS = ("wave_direction", "swell_direction", "wind_direction", "current_direction")
+
+# Widest gap between two stored hours that is still interpolated
+INTERPOLATION_MAX_GAP = timedelta(hours=3)
+
+
+def _interpolate_weather_data(before: WeatherData, after: WeatherData, at: datetime) -> WeatherData:
+    """
+    Linearly interpolate two weather rows at a time between them
+
+    Returns a transient row stamped at the requested time and rescored from
+    the interpolated measurements. Values missing from either row are taken
+    from the earlier one.
+    """
+    fraction = (at - before.timestamp) / (after.timestamp - before.timestamp)
+    values = {}
+    for column in INTERPOLATED_COLUMNS:
+        start, end = getattr(before, column), getattr(after, column)
+        values[column] = start if start is None or end is None else start + (end - start) * fraction
+    for column in INTERPOLATED_DIRECTIONS:
+        start, end = getattr(before, column), getattr(after, column)
+        if start is None or end is None:
+            values[column] = start
+        else:
+            values[column] = (start + ((end - start + 180) % 360 - 180) * fraction) % 360
+
+    safety_score, suitability_level, _ = SuitabilityService().calculate_safety_score(values)
+    return WeatherData(
+        beach_id=before.beach_id,
+        timestamp=at,
+        source=before.source,
+        safety_score=safety_score,
+        suitability_level=suitability_level,
+        **values
+    )
+
+
+def get_weather_data_at(
+    db: Session,
+    beach_id: int,
+    at: datetime,
+    interpolate: bool = False,
+    source: str = "stormglass"
+) -> Optional[WeatherData]:
+    """
+    Get the weather of a beach at a given time
+
+    The forecast hour in effect is the latest stored hour at or before the
+    time, found with a backward seek on the index of the (beach_id,
+    timestamp, source) unique constraint, bounded to
+    CURRENT_CONDITIONS_MAX_AGE so it never walks the beach's history. With interpolate, the next stored hour is found with a forward
+    seek and the two are interpolated at the requested time (see
+    _interpolate_weather_data); hours more than INTERPOLATION_MAX_GAP apart
+    are not interpolated.
+
+    Returns:
+        The stored hour in effect, a transient interpolated row, or None when
+        there is no hour in effect
+    """
+    at = _as_naive_utc(at)
+    before = db.query(WeatherData).filter(
+        WeatherData.beach_id == beach_id,
+        WeatherData.source == source,
+        WeatherData.timestamp <= at,
+        WeatherData.timestamp > at - CURRENT_CONDITIONS_MAX_AGE
+    ).order_by(WeatherData.timestamp.desc()).first()
+    if before is None or not interpolate or before.timestamp == at:
+        return before
+
+    after = db.query(WeatherData).filter(
+        WeatherData.beach_id == beach_id,
+        WeatherData.source == source,
+        WeatherData.timestamp > at,
+        WeatherData.timestamp <= before.timestamp + INTERPOLATION_MAX_GAP
+    ).order_by(WeatherData.timestamp.asc()).first()
+    if after is None:
+        return before
+    return _interpolate_weather_data(before, after, at)
+
+
+def get_stored_suitability_levels(
+    db: Session,
+    beach_id: int,
+    timestamps: List[datetime],
+    source: str = "stormglass"
+) -> Dict[datetime, Optional[str]]:
+    """
+    Get the stored suitability level of forecast hours of a beach
+
+    Returns:
+        Levels keyed by the given timestamps, hours not stored yet are left out
+    """
+    if not timestamps:
+        return {}
+
+    by_time = {_as_naive_utc(timestamp): timestamp for timestamp in timestamps}
+    rows = db.query(WeatherData.timestamp, WeatherData.suitability_level).filter(
+        WeatherData.beach_id == beach_id,
+        WeatherData.source == source,
+        WeatherData.timestamp >= min(by_time),
+        WeatherData.timestamp <= max(by_time)
+    ).all()
+    return {by_time[timestamp]: level for timestamp, level in rows if timestamp in by_time}
+
+
+def get_forecast_horizons(db: Session, beach_ids: List[int], source: str = "stormglass") -> Dict[int, datetime]:
+    """
+    Get the last stored forecast hour of several beaches in one query
+
+    Beaches without stored data are left out of the result.
+    """
+    if not beach_ids:
+        return {}
+
+    rows = db.query(WeatherData.beach_id, func.max(WeatherData.timestamp)).filter(
+        WeatherData.beach_id.in_(beach_ids),
+        WeatherData.source == source
+    ).group_by(WeatherData.beach_id).all()
+
+    return {beach_id: horizon for beach_id, horizon in rows}
+
+
+def _latest_weather_subquery(db: Session, beach_ids: List[int], now: datetime):
+    """
+    Rank the weather rows of beaches that may be in effect now, newest first, with a window function
+    """
+    return db.query(
+        WeatherData.id.label("id"),
+        func.row_number().over(
+            partition_by=WeatherData.beach_id,
+            order_by=WeatherData.timestamp.desc()
+        ).label("row_number")
+    ).filter(
+        WeatherData.beach_id.in_(beach_ids),
+        WeatherData.timestamp <= now,
+        WeatherData.timestamp > now - CURRENT_CONDITIONS_MAX_AGE
+    ).subquery()
+
+
+def _latest_suitability_levels(db: Session, beach_ids: List[int], now: datetime) -> Dict[int, Optional[str]]:
+    """Get the suitability level of the forecast hour in effect at beaches, with a window function"""
+    ranked = _latest_weather_subquery(db, beach_ids, now)
+    rows = db.query(WeatherData.beach_id, WeatherData.suitability_level).join(
+        ranked, WeatherData.id == ranked.c.id
+    ).filter(ranked.c.row_number == 1).all()
+
+    return {beach_id: level for beach_id, level in rows}
+
+
+def get_latest_suitability_levels(
+    db: Session,
+    beach_ids: List[int],
+    now: Optional[datetime] = None
+) -> Dict[int, Optional[str]]:
+    """
+    Get the current suitability level for several beaches in one query
+
+    Read from the current conditions table; beaches without a row for the
+    current hour fall back to their forecast hour in effect. Beaches without
+    either are left out.
+    """
+    if not beach_ids:
+        return {}
+
+    now = now or datetime.utcnow()
+    levels = dict(db.query(
+        BeachCurrentConditions.beach_id, BeachCurrentConditions.suitability_level
+    ).filter(
+        BeachCurrentConditions.beach_id.in_(beach_ids),
+        BeachCurrentConditions.timestamp >= _current_hour(now)
+    ).all())
+
+    missing = [beach_id for beach_id in beach_ids if beach_id not in levels]
+    if missing:
+        levels.update(_latest_suitability_levels(db, missing, now))
+    return levels
+
+
+def _warning_message(suitability_level: Optional[str]) -> Optional[str]:
+    """Generate the warning message for a suitability level"""
+    if suitability_level == "warning":
+        return "Exercise caution due to moderate conditions."
+    elif suitability_level == "danger":
+        return "Dangerous conditions present. Not recommended for swimming or water activities."
+    return None
+
+
+def _latest_beaches_conditions(db: Session, beach_ids: List[int], now: datetime) -> Dict[int, BeachConditions]:
+    """
+    Build conditions summaries from the forecast hour in effect at beaches
+
+    The hour in effect of every beach is picked with a window function and
+    joined with the beach. Only used for beaches without an up to date
+    current conditions row.
+    """
+    ranked = _latest_weather_subquery(db, beach_ids, now)
+    rows = db.query(
+        WeatherData.beach_id,
+        Beach.name,
+        WeatherData.timestamp,
+        WeatherData.wave_height,
+        WeatherData.wind_speed,
+        WeatherData.water_temperature,
+        WeatherData.suitability_level,
+        WeatherData.safety_score
+    ).join(
+        ranked, WeatherData.id == ranked.c.id
+    ).join(
+        Beach, Beach.id == WeatherData.beach_id
+    ).filter(ranked.c.row_number == 1).all()
+
+    return {
+        row.beach_id: BeachConditions(
+            beach_id=row.beach_id,
+            beach_name=row.name,
+            timestamp=row.timestamp,
+            wave_height=row.wave_height,
+            wind_speed=row.wind_speed,
+            water_temperature=row.water_temperature,
+            suitability_level=row.suitability_level,
+            safety_score=row.safety_score,
+            warning_message=_warning_message(row.suitability_level)
+        )
+        for row in rows
+    }
+
+
+def get_beaches_conditions(
+    db: Session,
+    beach_ids: List[int],
+    now: Optional[datetime] = None
+) -> Dict[int, BeachConditions]:
+    """
+    Get current conditions summaries for several beaches in one query
+
+    Conditions are read from the current conditions table maintained at
+    ingest time, by primary key. Rows of an earlier hour (not refreshed
+    since the hour changed, e.g. after a skipped sweep) are ignored; beaches
+    without a row for the current hour fall back to their forecast hour in
+    effect, and are left out when there is none.
+    """
+    if not beach_ids:
+        return {}
+
+    now = now or datetime.utcnow()
+    rows = db.query(BeachCurrentConditions, Beach.name).join(
+        Beach, Beach.id == BeachCurrentConditions.beach_id
+    ).filter(
+        BeachCurrentConditions.beach_id.in_(beach_ids),
+        BeachCurrentConditions.timestamp >= _current_hour(now)
+    ).all()
+
+    conditions = {
+        current.beach_id: BeachConditions(
+            beach_id=current.beach_id,
+            beach_name=name,
+            timestamp=current.timestamp,
+            wave_height=current.wave_height,
+            wind_speed=current.wind_speed,
+            water_temperature=current.water_temperature,
+            suitability_level=current.suitability_level,
+            safety_score=current.safety_score,
+            warning_message=_warning_message(current.suitability_level)
+        )
+        for current, name in rows
+    }
+
+    missing = [beach_id for beach_id in beach_ids if beach_id not in conditions]
+    if missing:
+        conditions.update(_latest_beaches_conditions(db, missing, now))
+    return conditions
+
+
 def get_current_beach_conditions(db: Session, beach_id: int) -> Optional[BeachConditions]:
     """
     Get current beach conditions summary
     """
-    # Get beach
-    beach = db.query(Beach).filter(Beach.id == beach_id).first()
-    if not beach:
-        return None
-    
-    # Get latest weather data
-    weather_data = get_latest_weather_data(db, beach_id)
-    if not weather_data:
+    return get_beaches_conditions(db, [beach_id]).get(beach_id)
+
+
+def get_beach_conditions_at(
+    db: Session,
+    beach_id: int,
+    at: datetime,
+    interpolate: bool = False
+) -> Optional[BeachConditions]:
+    """
+    Get a beach conditions summary at a given time, see get_weather_data_at
+    """
+    weather_data = get_weather_data_at(db, beach_id, at, interpolate=interpolate)
+    if weather_data is None:
         return None
-    
-    # Generate warning message
-    warning_message = None
-    if weather_data.suitability_level == "warning":
-        warning_message = "Exercise caution due to moderate conditions."
-    elif weather_data.suitability_level == "danger":
-        warning_message = "Dangerous conditions present. Not recommended for swimming or water activities."
-    
-    # Create conditions summary
-    conditions = BeachConditions(
-        beach_id=beach.id,
-        beach_name=beach.name,
+
+    beach_name = db.query(Beach.name).filter(Beach.id == beach_id).scalar()
+    return BeachConditions(
+        beach_id=beach_id,
+        beach_name=beach_name,
         timestamp=weather_data.timestamp,
         wave_height=weather_data.wave_height,
         wind_speed=weather_data.wind_speed,
         water_temperature=weather_data.water_temperature,
         suitability_level=weather_data.suitability_level,
         safety_score=weather_data.safety_score,
-        warning_message=warning_message
+        warning_message=_warning_message(weather_data.suitability_level)
     )
-    
-    return conditions
 
 
 # Create a CRUD object to expose all operations
 weather = {
     "get": get_weather_data,
     "get_beach_data": get_beach_weather_data,
+    "get_raw_retention_cutoff": get_raw_retention_cutoff,
     "create": create_weather_data,
+    "create_bulk": create_weather_data_bulk,
+    "upsert_forecast_hours": upsert_forecast_hours,
+    "create_payload": create_weather_payload,
+    "get_raw": get_weather_data_raw,
     "get_latest": get_latest_weather_data,
-    "get_conditions": get_current_beach_conditions
+    "get_at": get_weather_data_at,
+    "get_horizons": get_forecast_horizons,
+    "get_stored_levels": get_stored_suitability_levels,
+    "get_latest_levels": get_latest_suitability_levels,
+    "get_conditions": get_current_beach_conditions,
+    "get_conditions_at": get_beach_conditions_at,
+    "get_conditions_batch": get_beaches_conditions,
+    "refresh_current_conditions": refresh_current_conditions
 } 
\ No newline at end of file
@@ -4,6 +4,9 @@ from app.db.session import Base
 from app.models.user import User
 from app.models.beach import Beach
 from app.models.weather_data import WeatherData
+from app.models.weather_payload import WeatherPayload
+from app.models.weather_daily_summary import WeatherDailySummary
+from app.models.beach_current_conditions import BeachCurrentConditions
 from app.models.user_favorite import UserFavorite
 from app.models.notification import Notification
 
@@ -0,0 +1,179 @@
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    expiry: float  # time.monotonic() deadline
+    size: int  # bytes of the JSON serialized value
+
+
+class MemoryCache:
+    """
+    Bounded in-process cache with LRU eviction and expiry
+
+    Entries are kept in least recently used order; setting an entry evicts
+    the least recently used ones until the entry count and the total size
+    fit the limits. Sizes are those of the JSON serialized values, as they
+    would be stored in Redis. Expired entries are dropped when read and by
+    a background sweeper thread, which pops them off a heap ordered by
+    expiry, so entries that are never read again do not pile up.
+
+    All operations hold a lock for a short, non-blocking section, so the
+    cache can be shared by threads and called from the event loop.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, sweep_interval: float = 60.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # (expiry, key) of every set; stale pairs are skipped when popped
+        self._expiries: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "rejected": 0,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, marking it as recently used; None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            if entry.expiry <= time.monotonic():
+                self._remove(key)
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: float, size: Optional[int] = None) -> bool:
+        """
+        Store a value for ttl seconds, evicting least recently used entries to stay within the limits
+
+        The size is computed from the value unless given, e.g. by callers
+        that already have it serialized.
+
+        Returns:
+            bool: False when the value alone is larger than the size limit
+        """
+        if size is None:
+            size = len(json.dumps(value))
+        if size > self.max_bytes:
+            with self._lock:
+                self.stats["rejected"] += 1
+            logger.warning(f"Not caching {key} in memory: {size} bytes exceeds the {self.max_bytes} bytes limit")
+            return False
+
+        expiry = time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, expiry, size)
+            self._bytes += size
+            heapq.heappush(self._expiries, (expiry, key))
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+
+            # Overwritten and evicted keys leave stale heap pairs behind
+            if len(self._expiries) > 2 * len(self._entries) + 64:
+                self._expiries = [(entry.expiry, key) for key, entry in self._entries.items()]
+                heapq.heapify(self._expiries)
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._expiries.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """
+        Remove the expired entries
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        now = time.monotonic()
+        with self._lock:
+            while self._expiries and self._expiries[0][0] <= now:
+                expiry, key = heapq.heappop(self._expiries)
+                entry = self._entries.get(key)
+                # Skip pairs of keys that were overwritten or evicted since
+                if entry is not None and entry.expiry == expiry:
+                    self._remove(key)
+                    removed += 1
+            self.stats["expirations"] += removed
+        return removed
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.debug(f"Swept {removed} expired in-memory cache entries")
+            except Exception as e:
+                logger.error(f"Error sweeping in-memory cache: {e}")
+
+    def start_sweeper(self) -> None:
+        """Start the background thread removing expired entries, if not running"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="memory-cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._stop.set()
+        self._sweeper.join(timeout=5)
+        self._sweeper = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters and usage for the health endpoint"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_ratio": round(self.stats["hits"] / lookups, 3) if lookups else None,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "sweeper_running": self._sweeper is not None and self._sweeper.is_alive(),
+            }
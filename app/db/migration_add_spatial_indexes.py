@@ -0,0 +1,85 @@
+"""
+Migration script to add spatial indexes:
+- composite (latitude, longitude) index on beach
+- composite (current_latitude, current_longitude) index on user
+- PostGIS geography columns with GiST indexes, only if the extension is available
+
+To run this migration:
+python -m app.db.migration_add_spatial_indexes
+"""
+
+import logging
+from sqlalchemy import text
+from app.db.session import engine
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Composite indexes, also declared on the models for new databases
+INDEXES = [
+    ("ix_beach_latitude_longitude", "beach", "latitude, longitude"),
+    ("ix_user_current_latitude_current_longitude", '"user"', "current_latitude, current_longitude"),
+]
+
+# Tables that get a generated PostGIS geography column
+GEOGRAPHY_COLUMNS = [
+    ("beach", "latitude", "longitude"),
+    ("user", "current_latitude", "current_longitude"),
+]
+
+
+def _add_geography_columns(conn) -> None:
+    """Add generated geography columns and GiST indexes"""
+    for table_name, lat_column, lng_column in GEOGRAPHY_COLUMNS:
+        exists = conn.execute(text(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = :table_name AND column_name = 'geog'"
+        ), {"table_name": table_name}).first()
+        if exists:
+            logger.info(f"Column 'geog' already exists in the {table_name} table")
+        else:
+            logger.info(f"Adding geography column to {table_name} table")
+            conn.execute(text(f"""
+                ALTER TABLE "{table_name}" ADD COLUMN geog geography(Point, 4326)
+                GENERATED ALWAYS AS (
+                    CASE WHEN {lat_column} IS NULL OR {lng_column} IS NULL THEN NULL
+                    ELSE ST_SetSRID(ST_MakePoint({lng_column}, {lat_column}), 4326)::geography END
+                ) STORED
+            """))
+
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS ix_{table_name}_geog ON "{table_name}" USING GIST (geog)'))
+        logger.info(f"GiST index on {table_name}.geog is in place")
+
+
+def run_migration():
+    """Run the migration to add spatial indexes"""
+    try:
+        with engine.begin() as conn:
+            for index_name, table_name, columns in INDEXES:
+                logger.info(f"Creating index '{index_name}' on {table_name}")
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"))
+
+            if engine.dialect.name != "postgresql":
+                logger.info("Not a PostgreSQL database, skipping PostGIS columns")
+                return
+
+            postgis = conn.execute(text(
+                "SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'"
+            )).first()
+            if not postgis:
+                logger.info("PostGIS extension is not available, spatial queries will use the lat/lng indexes")
+                return
+
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+            _add_geography_columns(conn)
+
+        logger.info("All changes committed successfully")
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    logger.info("Starting migration to add spatial indexes")
+    run_migration()
+    logger.info("Migration finished")
@@ -0,0 +1,50 @@
+"""
+Migration script to store a suitability level on daily weather summaries:
+- adds weatherdailysummary.suitability_level, kept up to date by re-scoring
+- fills it for existing summaries from their warning and danger hour counts
+
+Run app.db.migration_partition_weather_data first.
+
+To run this migration:
+python -m app.db.migration_add_summary_suitability_level
+"""
+
+import logging
+from sqlalchemy import inspect, text
+from app.db.session import engine
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Run the migration to add and fill the daily summary suitability level"""
+    try:
+        with engine.begin() as conn:
+            columns = {column["name"] for column in inspect(conn).get_columns("weatherdailysummary")}
+            if "suitability_level" in columns:
+                logger.info("Column 'suitability_level' already exists")
+            else:
+                logger.info("Adding column 'suitability_level' to weatherdailysummary")
+                conn.execute(text("ALTER TABLE weatherdailysummary ADD COLUMN suitability_level VARCHAR(20)"))
+
+            result = conn.execute(text(
+                "UPDATE weatherdailysummary SET suitability_level = CASE "
+                "WHEN danger_hours > 0 THEN 'danger' "
+                "WHEN warning_hours > 0 THEN 'warning' "
+                "ELSE 'safe' END "
+                "WHERE suitability_level IS NULL"
+            ))
+            logger.info(f"Filled the suitability level of {result.rowcount} summaries")
+
+        logger.info("All changes committed successfully")
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    logger.info("Starting migration to add the daily summary suitability level")
+    run_migration()
+    logger.info("Migration finished")
@@ -0,0 +1,58 @@
+"""
+Migration script to make weather data rows unique per beach, forecast hour and source:
+- removes duplicate rows left by earlier ingests, keeping the newest one
+- adds the (beach_id, timestamp, source) unique constraint used by the upsert
+
+To run this migration:
+python -m app.db.migration_add_weather_unique_constraint
+"""
+
+import logging
+from sqlalchemy import text
+from app.db.session import engine
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CONSTRAINT_NAME = "uq_weatherdata_beach_id_timestamp_source"
+
+
+def run_migration():
+    """Run the migration to deduplicate weather data and add the unique constraint"""
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(text(
+                "SELECT 1 FROM information_schema.table_constraints "
+                "WHERE table_name = 'weatherdata' AND constraint_name = :constraint_name"
+            ), {"constraint_name": CONSTRAINT_NAME}).first()
+            if exists:
+                logger.info(f"Constraint '{CONSTRAINT_NAME}' already exists")
+                return
+
+            # Rows are append-only, so the highest id holds the newest forecast
+            logger.info("Removing duplicate weather data rows")
+            result = conn.execute(text("""
+                DELETE FROM weatherdata
+                WHERE id NOT IN (
+                    SELECT MAX(id) FROM weatherdata GROUP BY beach_id, timestamp, source
+                )
+            """))
+            logger.info(f"Removed {result.rowcount} duplicate rows")
+
+            logger.info(f"Adding constraint '{CONSTRAINT_NAME}'")
+            conn.execute(text(
+                f"ALTER TABLE weatherdata ADD CONSTRAINT {CONSTRAINT_NAME} "
+                "UNIQUE (beach_id, timestamp, source)"
+            ))
+
+        logger.info("All changes committed successfully")
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    logger.info("Starting migration to add the weather data unique constraint")
+    run_migration()
+    logger.info("Migration finished")
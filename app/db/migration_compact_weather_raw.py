@@ -0,0 +1,98 @@
+"""
+Migration script to stop storing the full raw StormGlass hour in every weather data row:
+- creates the weatherpayload table holding compressed raw responses
+- adds weatherdata.payload_id referencing it
+- compacts additional_data of existing rows in batches, keeping only the
+  fields that are not stored in columns (or dropping it with --drop)
+
+Rows are compacted in primary key order, one transaction per batch, so the
+migration can be interrupted and run again. On PostgreSQL the freed space is
+only returned to the OS by VACUUM FULL (or pg_repack) on weatherdata.
+
+To run this migration:
+python -m app.db.migration_compact_weather_raw [--drop]
+"""
+
+import logging
+import sys
+from sqlalchemy import bindparam, inspect, select, text, update
+from app.db.session import engine
+from app.models.weather_data import WeatherData
+from app.models.weather_payload import WeatherPayload
+from app.services.suitability import raw_remainder
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+
+def add_payload_reference():
+    """Create the payload table and the weatherdata.payload_id column"""
+    with engine.begin() as conn:
+        WeatherPayload.__table__.create(conn, checkfirst=True)
+
+        columns = {column["name"] for column in inspect(conn).get_columns("weatherdata")}
+        if "payload_id" in columns:
+            logger.info("Column 'payload_id' already exists")
+            return
+
+        logger.info("Adding column 'payload_id' to weatherdata")
+        conn.execute(text(
+            "ALTER TABLE weatherdata ADD COLUMN payload_id INTEGER "
+            "REFERENCES weatherpayload(id) ON DELETE SET NULL"
+        ))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_weatherdata_payload_id ON weatherdata (payload_id)"))
+
+
+def compact_rows(drop: bool = False, batch_size: int = BATCH_SIZE):
+    """Rewrite additional_data of existing rows to its unstored remainder, or NULL if drop is set"""
+    table = WeatherData.__table__
+    statement = update(table).where(table.c.id == bindparam("row_id")).values(
+        additional_data=bindparam("compacted")
+    )
+
+    last_id = 0
+    compacted = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(table.c.id, table.c.additional_data)
+                .where(table.c.id > last_id, table.c.additional_data.isnot(None))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            changes = []
+            for row_id, additional_data in rows:
+                value = None if drop or not isinstance(additional_data, dict) else raw_remainder(additional_data)
+                if value != additional_data:
+                    changes.append({"row_id": row_id, "compacted": value})
+            if changes:
+                conn.execute(statement, changes)
+
+        last_id = rows[-1].id
+        compacted += len(changes)
+        logger.info(f"Compacted {compacted} rows (up to ID {last_id})")
+
+    return compacted
+
+
+def run_migration(drop: bool = False):
+    """Run the migration to add raw payload storage and compact existing rows"""
+    try:
+        add_payload_reference()
+        compacted = compact_rows(drop=drop)
+        logger.info(f"All changes committed successfully, {compacted} rows compacted")
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    logger.info("Starting migration to compact raw weather data")
+    run_migration(drop="--drop" in sys.argv)
+    logger.info("Migration finished")
@@ -0,0 +1,41 @@
+"""
+Migration script to drop weather data indexes made redundant by the unique constraint:
+- drops the (beach_id, timestamp) index, whose columns lead uq_weatherdata_beach_id_timestamp_source
+- drops the single column beach_id index for the same reason
+
+Lookups of the forecast hour of a beach at a given time seek on the unique
+constraint's index, so writes maintain one index less.
+
+To run this migration:
+python -m app.db.migration_drop_redundant_weather_indexes
+"""
+
+import logging
+from sqlalchemy import text
+from app.db.session import engine
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_NAMES = ("ix_weatherdata_beach_id_timestamp", "ix_weatherdata_beach_id")
+
+
+def run_migration():
+    """Run the migration to drop the indexes covered by the (beach_id, timestamp, source) unique index"""
+    try:
+        with engine.begin() as conn:
+            for index_name in INDEX_NAMES:
+                logger.info(f"Dropping index '{index_name}'")
+                conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+        logger.info("All changes committed successfully")
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    logger.info("Starting migration to drop redundant weather data indexes")
+    run_migration()
+    logger.info("Migration finished")
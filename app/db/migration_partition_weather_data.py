@@ -0,0 +1,111 @@
+"""
+Migration script to partition weather data by month on PostgreSQL:
+- recreates weatherdata as a table range partitioned on timestamp, with one
+  partition per month and a default partition for anything outside them
+- copies the existing rows and drops the unpartitioned table
+- creates the weatherdailysummary table used by the retention job
+
+The primary key becomes (id, timestamp), as PostgreSQL requires the
+partition key in unique constraints; ids keep coming from the same sequence.
+Run app.db.migration_compact_weather_raw first. On other databases only the
+summary table is created and retention deletes rows instead of dropping
+partitions.
+
+To run this migration:
+python -m app.db.migration_partition_weather_data
+"""
+
+import logging
+from datetime import datetime
+from sqlalchemy import ForeignKeyConstraint, UniqueConstraint, inspect, text
+from sqlalchemy.schema import AddConstraint, CreateIndex
+from app.db.partitions import (
+    DEFAULT_PARTITION, MONTHS_AHEAD, PARENT_TABLE, add_months, create_default_partition,
+    ensure_partitions, is_partitioned, month_start
+)
+from app.db.session import engine
+import app.db.base  # noqa: F401 - registers the tables referenced by foreign keys
+from app.models.weather_daily_summary import WeatherDailySummary
+from app.models.weather_data import WeatherData
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LEGACY_TABLE = "weatherdata_unpartitioned"
+
+
+def partition_table(conn):
+    """Move the rows of the plain weather data table into a partitioned one"""
+    columns = {column["name"] for column in inspect(conn).get_columns(PARENT_TABLE)}
+    if "payload_id" not in columns:
+        raise RuntimeError("Run app.db.migration_compact_weather_raw before partitioning weather data")
+
+    logger.info(f"Renaming {PARENT_TABLE} to {LEGACY_TABLE}")
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} RENAME TO {LEGACY_TABLE}"))
+    # Free the index and constraint names for the partitioned table
+    for index_name in conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = :table_name"
+    ), {"table_name": LEGACY_TABLE}).scalars().all():
+        conn.execute(text(f'ALTER INDEX "{index_name}" RENAME TO "{index_name}_unpartitioned"'))
+
+    logger.info(f"Creating partitioned table {PARENT_TABLE}")
+    conn.execute(text(
+        f"CREATE TABLE {PARENT_TABLE} (LIKE {LEGACY_TABLE} INCLUDING DEFAULTS) PARTITION BY RANGE (timestamp)"
+    ))
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ADD CONSTRAINT {PARENT_TABLE}_pkey PRIMARY KEY (id, timestamp)"))
+    table = WeatherData.__table__
+    for constraint in table.constraints:
+        if isinstance(constraint, (UniqueConstraint, ForeignKeyConstraint)):
+            conn.execute(AddConstraint(constraint))
+    for index in table.indexes:
+        conn.execute(CreateIndex(index))
+
+    # Partitions from the oldest stored month to the months ahead of now
+    oldest = conn.execute(text(f"SELECT MIN(timestamp) FROM {LEGACY_TABLE}")).scalar()
+    current_month = month_start(datetime.utcnow())
+    first_month = min(month_start(oldest), current_month) if oldest else current_month
+    create_default_partition(conn)
+    ensure_partitions(conn, first_month, add_months(current_month, MONTHS_AHEAD))
+
+    logger.info("Copying weather data rows")
+    copied = conn.execute(text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM {LEGACY_TABLE}")).rowcount
+    logger.info(f"Copied {copied} rows")
+
+    # The id sequence is owned by the old table and would be dropped with it
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table_name, 'id')"), {"table_name": LEGACY_TABLE}).scalar()
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {PARENT_TABLE}.id"))
+    conn.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+
+
+def run_migration():
+    """Run the migration to partition weather data and add the daily summaries"""
+    try:
+        with engine.begin() as conn:
+            WeatherDailySummary.__table__.create(conn, checkfirst=True)
+
+            if conn.dialect.name != "postgresql":
+                logger.info("Partitioning needs PostgreSQL, keeping the plain weather data table")
+            elif is_partitioned(conn):
+                logger.info(f"Table {PARENT_TABLE} is already partitioned")
+                current_month = month_start(datetime.utcnow())
+                ensure_partitions(conn, current_month, add_months(current_month, MONTHS_AHEAD))
+            else:
+                partition_table(conn)
+
+            if is_partitioned(conn):
+                stray = conn.execute(text(f"SELECT COUNT(*) FROM {DEFAULT_PARTITION}")).scalar()
+                if stray:
+                    logger.warning(f"{stray} rows are outside the monthly partitions and stay in {DEFAULT_PARTITION}")
+
+        logger.info("All changes committed successfully")
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    logger.info("Starting migration to partition weather data")
+    run_migration()
+    logger.info("Migration finished")
@@ -0,0 +1,137 @@
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# Weather data is range partitioned by month on timestamp (PostgreSQL only),
+# see app.db.migration_partition_weather_data
+PARENT_TABLE = "weatherdata"
+DEFAULT_PARTITION = "weatherdata_default"
+PARTITION_PATTERN = re.compile(r"^weatherdata_p(\d{4})(\d{2})$")
+
+# Months created ahead of the current one, so forecasts never land in the default partition
+MONTHS_AHEAD = 2
+
+
+def month_start(value: datetime) -> datetime:
+    """Get midnight of the first day of a timestamp's month"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Get the first day of the month a number of months after (or before) another"""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """Check whether the weather data table is a partitioned PostgreSQL table"""
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table_name"
+    ), {"table_name": PARENT_TABLE}).first() is not None
+
+
+def list_partitions(conn: Connection) -> Dict[str, Optional[datetime]]:
+    """Get the partitions of the weather data table with their month (None for the default partition)"""
+    names = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table_name"
+    ), {"table_name": PARENT_TABLE}).scalars().all()
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        partitions[name] = datetime(int(match.group(1)), int(match.group(2)), 1) if match else None
+    return partitions
+
+
+def create_default_partition(conn: Connection) -> None:
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+
+
+def create_partition(conn: Connection, month: datetime) -> None:
+    """
+    Create the partition of a month
+
+    Rows of the month that went to the default partition are moved into the
+    new partition before it is attached, as PostgreSQL requires.
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    has_default = DEFAULT_PARTITION in list_partitions(conn)
+    stray = has_default and conn.execute(text(
+        f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE timestamp >= :start AND timestamp < :end LIMIT 1"
+    ), bounds).first() is not None
+
+    if not stray:
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+        ))
+        return
+
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+    moved = conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE timestamp >= :start AND timestamp < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), bounds).rowcount
+    conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+    ))
+    logger.info(f"Moved {moved} rows from {DEFAULT_PARTITION} to {name}")
+
+
+def ensure_partitions(conn: Connection, first_month: datetime, last_month: datetime) -> List[str]:
+    """
+    Create the missing monthly partitions between two months (inclusive)
+
+    Returns:
+        Names of the partitions created
+    """
+    existing = list_partitions(conn)
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        name = partition_name(month)
+        if name not in existing:
+            create_partition(conn, month)
+            created.append(name)
+        month = add_months(month, 1)
+    if created:
+        logger.info(f"Created weather data partitions {', '.join(created)}")
+    return created
+
+
+def drop_partitions_before(conn: Connection, cutoff: datetime) -> List[str]:
+    """
+    Drop the monthly partitions holding only rows older than a cutoff
+
+    Dropping a partition removes a month of rows without scanning or
+    vacuuming them.
+
+    Returns:
+        Names of the partitions dropped
+    """
+    dropped = []
+    for name, month in sorted(list_partitions(conn).items(), key=lambda item: item[1] or datetime.max):
+        if month is not None and add_months(month, 1) <= cutoff:
+            conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    if dropped:
+        logger.info(f"Dropped weather data partitions {', '.join(dropped)}")
+    return dropped
@@ -1,15 +1,21 @@
 import redis
 import json
 import logging
-from typing import Any, Optional, Dict
-import time
+import threading
+import uuid
+from typing import Any, Dict, Optional
 
 from app.core.config import settings
+from app.db.memory_cache import MemoryCache
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache fallback
-in_memory_cache: Dict[str, Dict[str, Any]] = {}
+# In-memory cache fallback, bounded and swept (see MemoryCache)
+in_memory_cache = MemoryCache(
+    max_entries=settings.MEMORY_CACHE_MAX_ENTRIES,
+    max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+    sweep_interval=settings.MEMORY_CACHE_SWEEP_INTERVAL
+)
 
 # Try to create Redis client
 redis_client = None
@@ -36,6 +42,132 @@ except Exception as e:
     logger.warning("Using in-memory cache instead")
     use_redis = False
 
+# Short-lived in-process copies of small Redis values (L1 in front of Redis)
+l1_cache = MemoryCache(
+    max_entries=settings.L1_CACHE_MAX_ENTRIES,
+    max_bytes=settings.L1_CACHE_MAX_BYTES
+)
+
+# Identifies this process in invalidation messages, so it skips its own
+PROCESS_ID = uuid.uuid4().hex
+
+
+class CacheInvalidationListener:
+    """
+    Drop the L1 entries of keys changed by other processes
+
+    set_cache and delete_cache publish the changed key on a Redis channel;
+    this thread subscribes to it and removes the key from the L1 cache of
+    its process. L1 is only used while subscribed: invalidations published
+    while the subscription is down are lost, so L1 is bypassed until the
+    listener has subscribed again, and cleared when it has.
+    """
+
+    def __init__(self, cache: MemoryCache, channel: str, retry_interval: float = 5.0):
+        self.cache = cache
+        self.channel = channel
+        self.retry_interval = retry_interval
+        # Bumped on every invalidation, received or local, so readers can tell whether
+        # a value they just read from Redis may already be stale
+        self.generation = 0
+        self.subscribed = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats: Dict[str, int] = {
+            "received": 0,
+            "subscriptions": 0,
+        }
+
+    def invalidate_local(self, key: str) -> None:
+        """Drop the L1 entry of a key this process changed, rejecting reads of it still in flight"""
+        self.generation += 1
+        self.cache.delete(key)
+
+    def _invalidate(self, data: str) -> None:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            logger.warning(f"Ignoring malformed cache invalidation: {data!r}")
+            return
+        if message.get("origin") == PROCESS_ID:
+            return
+        self.generation += 1
+        self.cache.delete(message["key"])
+        self.stats["received"] += 1
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Entries cached before subscribing may have missed invalidations
+                self.generation += 1
+                self.cache.clear()
+                self.subscribed = True
+                self.stats["subscriptions"] += 1
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message:
+                        self._invalidate(message["data"])
+            except Exception as e:
+                logger.error(f"Cache invalidation subscription failed: {e}")
+            finally:
+                self.subscribed = False
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            self._stop.wait(self.retry_interval)
+
+    def start(self) -> None:
+        """Start listening for invalidations, if not running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.subscribed = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters for the health endpoint"""
+        return {**self.stats, "subscribed": self.subscribed}
+
+
+invalidation_listener = CacheInvalidationListener(l1_cache, settings.CACHE_INVALIDATION_CHANNEL)
+
+
+def start_cache_invalidation() -> None:
+    """Enable the L1 cache by listening for invalidations (only with Redis)"""
+    if use_redis and redis_client and settings.L1_CACHE_TTL > 0:
+        invalidation_listener.start()
+
+
+def stop_cache_invalidation() -> None:
+    invalidation_listener.stop()
+    l1_cache.clear()
+
+
+def _l1_enabled() -> bool:
+    return settings.L1_CACHE_TTL > 0 and invalidation_listener.subscribed
+
+
+def get_cache_tier_stats() -> Dict[str, Any]:
+    """Get L1 and in-memory cache counters for the health endpoint"""
+    return {
+        "l1": {**l1_cache.get_stats(), "invalidation": invalidation_listener.get_stats()},
+        "memory_fallback": in_memory_cache.get_stats(),
+    }
+
+
 def get_redis_connection():
     """Get Redis connection"""
     return redis_client if use_redis else None
@@ -55,7 +187,12 @@ def set_cache(key: str, value: Any, expiration: int = settings.STORMGLASS_CACHE_
     if use_redis and redis_client:
         try:
             serialized_value = json.dumps(value)
-            redis_client.set(key, serialized_value, ex=expiration)
+            # Write and tell the other processes to drop their L1 copy in one round trip
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.set(key, serialized_value, ex=expiration)
+            pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, json.dumps({"origin": PROCESS_ID, "key": key}))
+            pipe.execute()
+            invalidation_listener.invalidate_local(key)
             return True
         except Exception as e:
             logger.error(f"Error setting Redis cache: {e}")
@@ -64,12 +201,7 @@ def set_cache(key: str, value: Any, expiration: int = settings.STORMGLASS_CACHE_
             
     # Use in-memory cache
     try:
-        expiry_time = int(time.time()) + expiration
-        in_memory_cache[key] = {
-            "value": value,
-            "expiry": expiry_time
-        }
-        return True
+        return in_memory_cache.set(key, value, expiration)
     except Exception as e:
         logger.error(f"Error setting in-memory cache: {e}")
         return False
@@ -78,6 +210,9 @@ def get_cache(key: str) -> Optional[Any]:
     """
     Get cached value from Redis or in-memory
     
+    Small values read from Redis are kept in the L1 cache for
+    L1_CACHE_TTL seconds while invalidations are being received.
+    
     Args:
         key: Cache key
         
@@ -85,10 +220,21 @@ def get_cache(key: str) -> Optional[Any]:
         Any: Cached value or None if not found
     """
     if use_redis and redis_client:
+        l1 = _l1_enabled()
+        if l1:
+            value = l1_cache.get(key)
+            if value is not None:
+                return value
+            generation = invalidation_listener.generation
         try:
             cached_value = redis_client.get(key)
             if cached_value:
-                return json.loads(cached_value)
+                value = json.loads(cached_value)
+                # Skip L1 if the key may have been invalidated during the read
+                if (l1 and len(cached_value) <= settings.L1_CACHE_MAX_VALUE_BYTES
+                        and invalidation_listener.generation == generation):
+                    l1_cache.set(key, value, settings.L1_CACHE_TTL, size=len(cached_value))
+                return value
         except Exception as e:
             logger.error(f"Error getting Redis cache: {e}")
             # Fall back to in-memory cache
@@ -96,16 +242,7 @@ def get_cache(key: str) -> Optional[Any]:
     
     # Use in-memory cache
     try:
-        cache_entry = in_memory_cache.get(key)
-        if cache_entry:
-            # Check if expired
-            current_time = int(time.time())
-            if current_time < cache_entry["expiry"]:
-                return cache_entry["value"]
-            else:
-                # Clean up expired entry
-                del in_memory_cache[key]
-        return None
+        return in_memory_cache.get(key)
     except Exception as e:
         logger.error(f"Error getting in-memory cache: {e}")
         return None
@@ -124,15 +261,18 @@ def delete_cache(key: str) -> bool:
     
     if use_redis and redis_client:
         try:
-            redis_client.delete(key)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.delete(key)
+            pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, json.dumps({"origin": PROCESS_ID, "key": key}))
+            pipe.execute()
         except Exception as e:
             logger.error(f"Error deleting Redis cache: {e}")
             success = False
+    invalidation_listener.invalidate_local(key)
     
     # Also remove from in-memory cache
     try:
-        if key in in_memory_cache:
-            del in_memory_cache[key]
+        in_memory_cache.delete(key)
     except Exception as e:
         logger.error(f"Error deleting in-memory cache: {e}")
         success = False
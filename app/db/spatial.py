@@ -0,0 +1,97 @@
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, func, literal_column, or_, text
+from sqlalchemy.orm import Session
+
+from app.services.spatial_index import bounding_box
+
+logger = logging.getLogger(__name__)
+
+# Tables that have a PostGIS "geog" column, checked once per process
+_geography_tables: Dict[str, bool] = {}
+
+
+def has_geography(db: Session, table_name: str) -> bool:
+    """
+    Check whether a table has the optional PostGIS geography column
+
+    The column (and its GiST index) is added by
+    app.db.migration_add_spatial_indexes when the PostGIS extension is available.
+    """
+    if table_name not in _geography_tables:
+        available = False
+        if db.bind.dialect.name == "postgresql":
+            try:
+                available = db.execute(text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = :table_name AND column_name = 'geog' AND udt_name = 'geography'"
+                ), {"table_name": table_name}).first() is not None
+            except Exception as e:
+                logger.warning(f"Could not check for PostGIS geography column on {table_name}: {e}")
+        _geography_tables[table_name] = available
+        logger.info(f"Spatial queries on {table_name} use {'PostGIS' if available else 'lat/lng bounding box'}")
+    return _geography_tables[table_name]
+
+
+def bounding_box_filter(lat_col: Any, lng_col: Any, latitude: float, longitude: float, radius_km: float):
+    """
+    Build a latitude/longitude range filter enclosing a search radius
+
+    The filter can be served by a composite (latitude, longitude) index.
+    Boxes crossing the antimeridian are split into two longitude ranges.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    lat_filter = lat_col.between(min_lat, max_lat)
+
+    if max_lng - min_lng >= 360.0:
+        return lat_filter
+    if min_lng < -180.0:
+        return and_(lat_filter, or_(lng_col >= min_lng + 360.0, lng_col <= max_lng))
+    if max_lng > 180.0:
+        return and_(lat_filter, or_(lng_col >= min_lng, lng_col <= max_lng - 360.0))
+    return and_(lat_filter, lng_col.between(min_lng, max_lng))
+
+
+def within_distance_filter(
+    db: Session,
+    table_name: str,
+    lat_col: Any,
+    lng_col: Any,
+    latitude: float,
+    longitude: float,
+    radius_km: Any,
+    box_radius_km: Optional[float] = None
+):
+    """
+    Build a filter for rows within a radius of a location
+
+    Uses ST_DWithin on the PostGIS geography column when it exists and a
+    bounding box on the plain latitude/longitude columns otherwise. Rows
+    matched by the bounding box still need an exact distance check.
+
+    The GiST index only serves ST_DWithin with a constant distance, so a
+    per-row radius is checked after a ST_DWithin on box_radius_km.
+
+    Args:
+        db: Database session
+        table_name: Table holding the coordinates
+        lat_col: Latitude column
+        lng_col: Longitude column
+        latitude: Center latitude
+        longitude: Center longitude
+        radius_km: Radius in kilometers, a value or a per-row column expression
+        box_radius_km: Largest radius, bounding the search when radius_km is an expression
+    """
+    if has_geography(db, table_name):
+        geog = literal_column(f'"{table_name}".geog')
+        point = func.geography(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326))
+        within = func.ST_DWithin(geog, point, radius_km * 1000)
+        if box_radius_km is None:
+            return within
+        return and_(func.ST_DWithin(geog, point, box_radius_km * 1000), within)
+
+    return bounding_box_filter(
+        lat_col, lng_col, latitude, longitude,
+        box_radius_km if box_radius_km is not None else radius_km
+    )
@@ -5,7 +5,11 @@ import os
 from app.api.routes import api_router
 from app.core.config import settings
 from app.db.session import create_tables, engine
+from app.db.redis import in_memory_cache, start_cache_invalidation, stop_cache_invalidation
 from app.tasks.scheduler import scheduler
+from app.services.http_client import get_http_client, close_http_client
+from app.services.suitability import shutdown_parse_executor
+from app.tasks.weather import shutdown_persistence_executor
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,6 +42,12 @@ def create_application() -> FastAPI:
     @application.on_event("startup")
     async def startup_event():
         logger.info("Starting up Beach Safety application...")
+        # Open the pooled HTTP client used for StormGlass requests
+        get_http_client()
+        # Expire entries of the in-memory cache fallback in the background
+        in_memory_cache.start_sweeper()
+        # Serve hot keys from the L1 cache while invalidations are received
+        start_cache_invalidation()
         try:
             # Create database tables
             create_tables()
@@ -60,6 +70,12 @@ def create_application() -> FastAPI:
         if hasattr(scheduler, 'scheduler') and scheduler.scheduler and scheduler.scheduler.running:
             logger.info("Shutting down scheduler...")
             scheduler.shutdown()
+        # Close pooled connections after the last scheduled fetch has stopped
+        await close_http_client()
+        shutdown_persistence_executor()
+        shutdown_parse_executor()
+        in_memory_cache.stop_sweeper()
+        stop_cache_invalidation()
 
     return application
 
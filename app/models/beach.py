@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Text, Boolean, Integer
+from sqlalchemy import Column, String, Float, Text, Boolean, Integer, Index
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -6,6 +6,10 @@ from app.models.base import BaseModel
 
 class Beach(BaseModel):
     """Beach model for storing beach information"""
+    __table_args__ = (
+        Index("ix_beach_latitude_longitude", "latitude", "longitude"),
+    )
+
     name = Column(String(100), nullable=False, index=True)
     description = Column(Text, nullable=True)
     latitude = Column(Float, nullable=False)
@@ -23,6 +27,9 @@ class Beach(BaseModel):
     
     # Relationships
     weather_data = relationship("WeatherData", back_populates="beach", cascade="all, delete-orphan")
+    current_conditions = relationship(
+        "BeachCurrentConditions", back_populates="beach", uselist=False, cascade="all, delete-orphan"
+    )
     
     def __repr__(self):
         return f"<Beach {self.name} ({self.city}, {self.state})>" 
\ No newline at end of file
@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.db.session import Base
+
+
+class BeachCurrentConditions(Base):
+    """
+    BeachCurrentConditions model holding the forecast hour in effect now, one row per beach
+
+    Maintained by the ingestion pipeline in the same transaction as the
+    forecast it is taken from, so conditions reads are a primary key lookup.
+    """
+    __tablename__ = "beachcurrentconditions"
+
+    beach_id = Column(Integer, ForeignKey("beach.id", ondelete="CASCADE"), primary_key=True)
+    timestamp = Column(DateTime, nullable=False)  # forecast hour in effect
+    source = Column(String(50), nullable=False, default="stormglass")
+
+    wave_height = Column(Float, nullable=True)
+    wind_speed = Column(Float, nullable=True)
+    water_temperature = Column(Float, nullable=True)
+    current_speed = Column(Float, nullable=True)
+    safety_score = Column(Integer, nullable=True)
+    suitability_level = Column(String(20), nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    beach = relationship("Beach", back_populates="current_conditions")
+
+    def __repr__(self):
+        return f"<BeachCurrentConditions for beach_id={self.beach_id} at {self.timestamp}>"
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, String, Boolean, Float
+from sqlalchemy import Column, String, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
 
 class User(BaseModel):
     """User model for storing user information"""
+    __table_args__ = (
+        Index("ix_user_current_latitude_current_longitude", "current_latitude", "current_longitude"),
+    )
+
     email = Column(String(255), nullable=False, unique=True, index=True)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(100), nullable=False)
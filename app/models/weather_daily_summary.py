@@ -0,0 +1,44 @@
+from sqlalchemy import Column, String, Float, Integer, Date, ForeignKey, UniqueConstraint
+
+from app.models.base import BaseModel
+
+# Hourly columns rolled up into daily minimum, maximum and mean
+SUMMARY_METRICS = ("wave_height", "swell_height", "wind_speed", "water_temperature", "current_speed")
+
+
+class WeatherDailySummary(BaseModel):
+    """WeatherDailySummary model keeping daily rollups of hourly weather data past its retention"""
+    __table_args__ = (
+        UniqueConstraint("beach_id", "date", "source", name="uq_weatherdailysummary_beach_id_date_source"),
+    )
+
+    beach_id = Column(Integer, ForeignKey("beach.id"), nullable=False, index=True)
+    date = Column(Date, nullable=False)
+    source = Column(String(50), nullable=False, default="stormglass")
+    hours = Column(Integer, nullable=False)  # hourly rows rolled up
+
+    wave_height_min = Column(Float, nullable=True)
+    wave_height_max = Column(Float, nullable=True)
+    wave_height_mean = Column(Float, nullable=True)
+    swell_height_min = Column(Float, nullable=True)
+    swell_height_max = Column(Float, nullable=True)
+    swell_height_mean = Column(Float, nullable=True)
+    wind_speed_min = Column(Float, nullable=True)
+    wind_speed_max = Column(Float, nullable=True)
+    wind_speed_mean = Column(Float, nullable=True)
+    water_temperature_min = Column(Float, nullable=True)
+    water_temperature_max = Column(Float, nullable=True)
+    water_temperature_mean = Column(Float, nullable=True)
+    current_speed_min = Column(Float, nullable=True)
+    current_speed_max = Column(Float, nullable=True)
+    current_speed_mean = Column(Float, nullable=True)
+
+    # Suitability over the day
+    safety_score_min = Column(Integer, nullable=True)
+    safety_score_mean = Column(Float, nullable=True)
+    warning_hours = Column(Integer, nullable=False, default=0)
+    danger_hours = Column(Integer, nullable=False, default=0)
+    suitability_level = Column(String(20), nullable=True)  # worst level of the day, updated by re-scoring
+
+    def __repr__(self):
+        return f"<WeatherDailySummary for beach_id={self.beach_id} on {self.date}>"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -7,7 +7,13 @@ from app.models.base import BaseModel
 
 class WeatherData(BaseModel):
     """WeatherData model for storing beach weather information"""
-    beach_id = Column(Integer, ForeignKey("beach.id"), nullable=False, index=True)
+    __table_args__ = (
+        # One row per beach, forecast hour and source; newer forecasts overwrite it.
+        # Its index also serves beach_id lookups and seeks to the hour of a beach at a time
+        UniqueConstraint("beach_id", "timestamp", "source", name="uq_weatherdata_beach_id_timestamp_source"),
+    )
+
+    beach_id = Column(Integer, ForeignKey("beach.id"), nullable=False)
     timestamp = Column(DateTime, nullable=False, index=True)
     source = Column(String(50), nullable=False, default="stormglass")
     
@@ -40,8 +46,11 @@ class WeatherData(BaseModel):
     ph = Column(Float, nullable=True)
     oxygen = Column(Float, nullable=True)
     
-    # Additional data stored as JSON
-    additional_data = Column(JSON, nullable=True)
+    # Additional data stored as JSON, see WEATHER_RAW_STORAGE
+    additional_data = Column(JSON(none_as_null=True), nullable=True)
+    
+    # Raw response the row was parsed from, when stored as a blob
+    payload_id = Column(Integer, ForeignKey("weatherpayload.id", ondelete="SET NULL"), nullable=True, index=True)
     
     # Suitability scores
     safety_score = Column(Integer, nullable=True)  # 0-100 score
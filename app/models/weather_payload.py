@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Float, Integer, DateTime, LargeBinary
+
+from app.models.base import BaseModel
+
+
+class WeatherPayload(BaseModel):
+    """WeatherPayload model storing a raw upstream response once per fetch"""
+    source = Column(String(50), nullable=False, default="stormglass")
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    start = Column(DateTime, nullable=False)
+    end = Column(DateTime, nullable=False)
+
+    # Compressed JSON of the response
+    encoding = Column(String(20), nullable=False, default="zlib")
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)  # bytes before compression
+
+    def __repr__(self):
+        return f"<WeatherPayload {self.id} at ({self.latitude}, {self.longitude}) from {self.start} to {self.end}>"
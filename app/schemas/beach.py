@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel, Field
 
 
@@ -54,4 +54,23 @@ class Beach(BeachInDBBase):
 
 # Properties properties stored in DB
 class BeachInDB(BeachInDBBase):
-    pass 
\ No newline at end of file
+    pass 
+
+
+# Clustered beach marker on a map tile
+class BeachCluster(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    worst_suitability_level: Optional[str] = None
+    # Only set for single-beach markers
+    beach_id: Optional[int] = None
+    beach_name: Optional[str] = None
+
+
+# Clustered beach markers for one map tile
+class BeachTile(BaseModel):
+    z: int
+    x: int
+    y: int
+    clusters: List[BeachCluster]
@@ -2,6 +2,8 @@ from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field
 
+from app.core.config import settings
+
 
 # Shared properties
 class UserBase(BaseModel):
@@ -11,7 +13,7 @@ class UserBase(BaseModel):
     is_admin: bool = False
     email_notifications: bool = True
     push_notifications: bool = True
-    notification_radius_km: float = 10.0
+    notification_radius_km: float = Field(10.0, gt=0, le=settings.MAX_NOTIFICATION_RADIUS_KM)
 
 
 # Properties to receive via API on creation
@@ -32,6 +34,7 @@ class UserInDBBase(UserBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    notification_radius_km: Optional[float] = 10.0  # stored radii may predate the bound
     
     class Config:
         from_attributes = True
@@ -102,7 +102,7 @@ class WeatherDataInDBBase(WeatherDataBase):
 
 # Properties to return to client
 class WeatherData(WeatherDataInDBBase):
-    pass
+    id: Optional[int] = None  # None for daily summaries of data past its retention
 
 
 # Properties properties stored in DB
@@ -120,4 +120,5 @@ class BeachConditions(BaseModel):
     water_temperature: Optional[float] = None
     suitability_level: str
     safety_score: int
-    warning_message: Optional[str] = None 
\ No newline at end of file
+    warning_message: Optional[str] = None
+    distance_km: Optional[float] = None 
\ No newline at end of file
@@ -0,0 +1,210 @@
+import logging
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from geopy.distance import geodesic
+
+logger = logging.getLogger(__name__)
+
+# Mean Earth radius in kilometers
+EARTH_RADIUS_KM = 6371.0088
+
+# Great-circle distances can be up to ~0.5% shorter than geodesic ones,
+# so haversine shortlists are padded to never miss a point near the boundary
+ELLIPSOID_MARGIN = 1.01
+
+# WGS-84 ellipsoid
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B_KM = WGS84_A_KM * (1 - WGS84_F)
+
+Radius = Union[float, np.ndarray]
+
+
+def haversine_km(
+    latitude: float,
+    longitude: float,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray
+) -> np.ndarray:
+    """
+    Great-circle distance from one point to many points
+
+    Args:
+        latitude: Origin latitude
+        longitude: Origin longitude
+        latitudes: Array of target latitudes
+        longitudes: Array of target longitudes
+
+    Returns:
+        Array of distances in kilometers
+    """
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlng = np.radians(longitudes - longitude)
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def ellipsoid_km(
+    latitude: float,
+    longitude: float,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    max_iterations: int = 200,
+    tolerance: float = 1e-12
+) -> np.ndarray:
+    """
+    WGS-84 ellipsoidal distance from one point to many points (Vincenty inverse)
+
+    Points where the iteration does not converge (nearly antipodal pairs)
+    fall back to geopy's geodesic solver.
+
+    Returns:
+        Array of distances in kilometers
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    if latitudes.size == 0:
+        return np.empty(0, dtype=np.float64)
+
+    u1 = np.arctan((1 - WGS84_F) * np.tan(np.radians(latitude)))
+    u2 = np.arctan((1 - WGS84_F) * np.tan(np.radians(latitudes)))
+    big_l = np.radians(longitudes - longitude)
+    sin_u1, cos_u1 = np.sin(u1), np.cos(u1)
+    sin_u2, cos_u2 = np.sin(u2), np.cos(u2)
+
+    lam = big_l.copy()
+    converged = np.zeros(lam.shape, dtype=bool)
+    sin_sigma = cos_sigma = sigma = cos_sq_alpha = cos_2sigma_m = np.zeros_like(lam)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iterations):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.sqrt((cos_u2 * sin_lam) ** 2 + (cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam) ** 2)
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma)
+            cos_sq_alpha = 1 - sin_alpha ** 2
+            # Points on the equator have cos_sq_alpha == 0
+            cos_2sigma_m = np.where(cos_sq_alpha == 0, 0.0, cos_sigma - 2 * sin_u1 * sin_u2 / cos_sq_alpha)
+            c = WGS84_F / 16 * cos_sq_alpha * (4 + WGS84_F * (4 - 3 * cos_sq_alpha))
+            lam_prev = lam
+            lam = big_l + (1 - c) * WGS84_F * sin_alpha * (
+                sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+            )
+            converged = np.abs(lam - lam_prev) < tolerance
+            if converged.all():
+                break
+
+        u_sq = cos_sq_alpha * (WGS84_A_KM ** 2 - WGS84_B_KM ** 2) / WGS84_B_KM ** 2
+        big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = big_b * sin_sigma * (
+            cos_2sigma_m + big_b / 4 * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+                - big_b / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+            )
+        )
+        distances = WGS84_B_KM * big_a * (sigma - delta_sigma)
+
+    distances = np.where(sin_sigma == 0, 0.0, distances)
+    for i in np.flatnonzero(~converged | ~np.isfinite(distances)):
+        distances[i] = geodesic((latitude, longitude), (latitudes[i], longitudes[i])).kilometers
+    return distances
+
+
+class PointSet:
+    """
+    Coordinates held in contiguous arrays for one-to-many distance queries
+
+    Used by the nearby beach search and the safety alert fan-out instead of
+    calling geodesic() once per pair inside a Python loop.
+    """
+
+    def __init__(self, ids: Sequence[int], latitudes: Sequence[float], longitudes: Sequence[float]):
+        self.ids = np.ascontiguousarray(ids, dtype=np.int64)
+        self.latitudes = np.ascontiguousarray(latitudes, dtype=np.float64)
+        self.longitudes = np.ascontiguousarray(longitudes, dtype=np.float64)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, float, float]]) -> "PointSet":
+        """Build a point set from (id, latitude, longitude) rows"""
+        rows = list(rows)
+        if not rows:
+            return cls([], [], [])
+        ids, latitudes, longitudes = zip(*rows)
+        return cls(ids, latitudes, longitudes)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def distances_from(self, latitude: float, longitude: float, refine: bool = False) -> np.ndarray:
+        """
+        Get the distance in kilometers from a location to every point
+
+        Args:
+            latitude: Origin latitude
+            longitude: Origin longitude
+            refine: Use exact ellipsoidal distances instead of haversine
+        """
+        if refine:
+            return ellipsoid_km(latitude, longitude, self.latitudes, self.longitudes)
+        return haversine_km(latitude, longitude, self.latitudes, self.longitudes)
+
+    def within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: Radius,
+        refine: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the points within a radius of a location
+
+        The haversine pass shortlists candidates with a small safety margin;
+        with refine enabled only that shortlist gets the exact ellipsoidal
+        distance before the final radius check.
+
+        Args:
+            latitude: Origin latitude
+            longitude: Origin longitude
+            radius_km: Radius in kilometers, either one value or one per point
+            refine: Use exact ellipsoidal distances for the final check
+
+        Returns:
+            Tuple with matching ids and their distances in kilometers
+        """
+        distances = haversine_km(latitude, longitude, self.latitudes, self.longitudes)
+        radius = np.broadcast_to(np.asarray(radius_km, dtype=np.float64), distances.shape)
+
+        if not refine:
+            mask = distances <= radius
+            return self.ids[mask], distances[mask]
+
+        shortlist = np.flatnonzero(distances <= radius * ELLIPSOID_MARGIN)
+        exact = ellipsoid_km(latitude, longitude, self.latitudes[shortlist], self.longitudes[shortlist])
+        mask = exact <= radius[shortlist]
+        return self.ids[shortlist[mask]], exact[mask]
+
+    def nearest_within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None,
+        refine: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the points within a radius sorted by distance
+
+        Returns:
+            Tuple with matching ids and their distances in kilometers, closest first
+        """
+        ids, distances = self.within(latitude, longitude, radius_km, refine=refine)
+        order = np.argsort(distances, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        return ids[order], distances[order]
@@ -0,0 +1,56 @@
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared client, created on application startup and closed on shutdown
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create an HTTP client with pooled keep-alive connections
+
+    HTTP/2 is only enabled when requested and the optional h2 package
+    (httpx[http2]) is installed, otherwise the client uses HTTP/1.1.
+    """
+    http2 = settings.STORMGLASS_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.STORMGLASS_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.STORMGLASS_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.STORMGLASS_HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            settings.STORMGLASS_READ_TIMEOUT,
+            connect=settings.STORMGLASS_CONNECT_TIMEOUT
+        )
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it if startup has not run"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+        logger.info("Created shared HTTP client")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Closed shared HTTP client")
+    _client = None
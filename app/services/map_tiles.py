@@ -0,0 +1,151 @@
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.redis import get_cache, set_cache
+from app.models.beach import Beach
+from app.services.suitability import SUITABILITY_SEVERITY
+
+logger = logging.getLogger(__name__)
+
+# Key holding the current tile cache version, bumped to invalidate every tile
+TILE_VERSION_KEY = "beach_tiles:version"
+TILE_VERSION_TTL = 30 * 24 * 3600
+
+# Web Mercator latitude limit
+MAX_MERCATOR_LAT = 85.0511287798
+
+
+def invalidate_tile_cache() -> None:
+    """Invalidate all cached map tiles (after a beach change or new conditions)"""
+    set_cache(TILE_VERSION_KEY, str(time.time_ns()), TILE_VERSION_TTL)
+
+
+def worst_suitability_level(levels: List[Optional[str]]) -> Optional[str]:
+    """Get the most severe suitability level, ignoring beaches without data"""
+    known = [level for level in levels if level is not None]
+    if not known:
+        return None
+    return max(known, key=lambda level: SUITABILITY_SEVERITY.get(level, 1))
+
+
+class MapTileService:
+    """Service for serving pre-clustered beach markers per map tile"""
+
+    def __init__(self):
+        self.cache_ttl = settings.MAP_TILE_CACHE_TTL
+        self.cluster_grid = settings.MAP_TILE_CLUSTER_GRID
+        self.max_cluster_zoom = settings.MAP_TILE_MAX_CLUSTER_ZOOM
+
+    @staticmethod
+    def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+        """
+        Get the bounds of a slippy map (XYZ) tile
+
+        Returns:
+            Tuple with min latitude, max latitude, min longitude and max longitude
+        """
+        n = 2 ** z
+        min_lng = x / n * 360.0 - 180.0
+        max_lng = (x + 1) / n * 360.0 - 180.0
+        max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+        min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+        return min_lat, max_lat, min_lng, max_lng
+
+    def _cluster_cell(self, z: int, x: int, y: int, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Get the clustering cell of a location inside a tile"""
+        n = 2 ** z
+        lat = math.radians(min(max(latitude, -MAX_MERCATOR_LAT), MAX_MERCATOR_LAT))
+        tile_x = (longitude + 180.0) / 360.0 * n - x
+        tile_y = (1 - math.asinh(math.tan(lat)) / math.pi) / 2 * n - y
+        col = min(max(int(tile_x * self.cluster_grid), 0), self.cluster_grid - 1)
+        row = min(max(int(tile_y * self.cluster_grid), 0), self.cluster_grid - 1)
+        return row, col
+
+    def cluster_beaches(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        beaches: List[Tuple[int, str, float, float]],
+        levels: Dict[int, Optional[str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Group beaches of a tile into grid-based clusters
+
+        Args:
+            z, x, y: Tile coordinates
+            beaches: List of (id, name, latitude, longitude) inside the tile
+            levels: Current suitability level by beach ID
+
+        Returns:
+            List of cluster dictionaries matching the BeachCluster schema
+        """
+        groups: Dict[Any, List[Tuple[int, str, float, float]]] = {}
+        for beach in beaches:
+            if z >= self.max_cluster_zoom:
+                key = beach[0]
+            else:
+                key = self._cluster_cell(z, x, y, beach[2], beach[3])
+            groups.setdefault(key, []).append(beach)
+
+        clusters = []
+        for members in groups.values():
+            cluster = {
+                "latitude": sum(member[2] for member in members) / len(members),
+                "longitude": sum(member[3] for member in members) / len(members),
+                "count": len(members),
+                "worst_suitability_level": worst_suitability_level([levels.get(member[0]) for member in members]),
+                "beach_id": None,
+                "beach_name": None,
+            }
+            if len(members) == 1:
+                cluster["beach_id"] = members[0][0]
+                cluster["beach_name"] = members[0][1]
+            clusters.append(cluster)
+
+        return clusters
+
+    def get_tile(self, db: Session, z: int, x: int, y: int) -> Dict[str, Any]:
+        """
+        Get the clustered beach markers of a tile, served from cache when possible
+
+        Args:
+            db: Database session
+            z, x, y: Tile coordinates
+
+        Returns:
+            Dictionary matching the BeachTile schema
+        """
+        # Import here to avoid circular dependency
+        from app.crud.weather import get_latest_suitability_levels
+
+        version = get_cache(TILE_VERSION_KEY) or "0"
+        cache_key = f"beach_tiles:{version}:{z}:{x}:{y}"
+        cached_tile = get_cache(cache_key)
+        if cached_tile:
+            return cached_tile
+
+        min_lat, max_lat, min_lng, max_lng = self.tile_bounds(z, x, y)
+        beaches = db.query(Beach.id, Beach.name, Beach.latitude, Beach.longitude).filter(
+            Beach.is_active == True,
+            Beach.latitude >= min_lat,
+            Beach.latitude < max_lat,
+            Beach.longitude >= min_lng,
+            Beach.longitude < max_lng
+        ).all()
+
+        levels = get_latest_suitability_levels(db, [beach.id for beach in beaches])
+        tile = {
+            "z": z,
+            "x": x,
+            "y": y,
+            "clusters": self.cluster_beaches(z, x, y, beaches, levels)
+        }
+
+        set_cache(cache_key, tile, self.cache_ttl)
+        return tile
@@ -4,12 +4,12 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from geopy.distance import geodesic
 
 from app.core.config import settings
 from app.models.user import User
 from app.models.beach import Beach
 from app.models.notification import Notification
+from app.crud.user import get_users_to_notify
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -116,18 +116,20 @@ class NotificationService:
         db: Session,
         beach: Beach,
         warning_message: str,
-        condition_level: str,
-        radius_km: float = 10.0
+        condition_level: str
     ) -> List[Notification]:
         """
         Notify users near a beach about dangerous conditions
         
+        Users are notified when the beach is within their own notification
+        radius (DEFAULT_NOTIFICATION_RADIUS_KM for users without one, at most
+        MAX_NOTIFICATION_RADIUS_KM).
+        
         Args:
             db: Database session
             beach: Beach object
             warning_message: Warning message
             condition_level: Condition level (warning, danger)
-            radius_km: Notification radius in kilometers
             
         Returns:
             List[Notification]: Created notifications
@@ -139,56 +141,43 @@ class NotificationService:
             return notifications
             
         try:
-            # Get all active users with location data
-            users = db.query(User).filter(
-                User.is_active == True,
-                User.current_latitude.isnot(None),
-                User.current_longitude.isnot(None)
-            ).all()
-            
-            beach_location = (beach.latitude, beach.longitude)
+            # Get active users whose notification radius covers the beach
+            recipients = get_users_to_notify(db, beach.latitude, beach.longitude)
             
-            for user in users:
-                # Calculate distance
-                user_location = (user.current_latitude, user.current_longitude)
-                distance = geodesic(user_location, beach_location).kilometers
+            for user, distance in recipients:
+                # Create notification
+                title = f"{condition_level.upper()} - {beach.name}"
+                content = f"Beach safety alert for {beach.name}: {warning_message}. Current distance: {distance:.1f} km."
+                
+                notification = self.create_user_notification(
+                    db=db,
+                    user_id=user.id,
+                    title=title,
+                    content=content,
+                    beach_id=beach.id,
+                    notification_type="safety_alert"
+                )
+                
+                notifications.append(notification)
                 
-                # Check if user is within notification radius
-                custom_radius = user.notification_radius_km or radius_km
-                if distance <= custom_radius:
-                    # Create notification
-                    title = f"{condition_level.upper()} - {beach.name}"
-                    content = f"Beach safety alert for {beach.name}: {warning_message}. Current distance: {distance:.1f} km."
-                    
-                    notification = self.create_user_notification(
-                        db=db,
-                        user_id=user.id,
-                        title=title,
-                        content=content,
-                        beach_id=beach.id,
-                        notification_type="safety_alert"
+                # Send email if enabled
+                if user.email_notifications:
+                    email_content = f"""
+                    <html>
+                        <body>
+                            <h2>Beach Safety Alert</h2>
+                            <p>There is a <strong>{condition_level}</strong> condition at <strong>{beach.name}</strong>.</p>
+                            <p>{warning_message}</p>
+                            <p>Current distance: {distance:.1f} km.</p>
+                            <p>Stay safe and check the Beach Safety App for more information.</p>
+                        </body>
+                    </html>
+                    """
+                    self.send_email_notification(
+                        recipient=user.email,
+                        subject=title,
+                        content=email_content
                     )
-                    
-                    notifications.append(notification)
-                    
-                    # Send email if enabled
-                    if user.email_notifications:
-                        email_content = f"""
-                        <html>
-                            <body>
-                                <h2>Beach Safety Alert</h2>
-                                <p>There is a <strong>{condition_level}</strong> condition at <strong>{beach.name}</strong>.</p>
-                                <p>{warning_message}</p>
-                                <p>Current distance: {distance:.1f} km.</p>
-                                <p>Stay safe and check the Beach Safety App for more information.</p>
-                            </body>
-                        </html>
-                        """
-                        self.send_email_notification(
-                            recipient=user.email,
-                            subject=title,
-                            content=email_content
-                        )
             
             return notifications
         except Exception as e:
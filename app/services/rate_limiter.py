@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.core.config import settings
+from app.db.redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# Atomically refill the bucket and take one token. Returns the seconds to
+# wait before a token is available (0 when one was taken).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+
+class RateLimiter:
+    """
+    Concurrency, rate and daily quota limiter for an upstream API
+
+    Every request takes a concurrency slot, a token from a token bucket
+    refilled at rate_per_second and one unit of the daily quota. The bucket,
+    the quota counter and any Retry-After pause live in Redis so that all
+    workers share them, with an in-memory fallback when Redis is unavailable.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        rate_per_second: float,
+        burst: int,
+        daily_quota: int
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1)
+        self.daily_quota = daily_quota  # 0 disables the quota check
+        self.bucket_key = f"rate_limit:{name}:bucket"
+        self.paused_key = f"rate_limit:{name}:paused_until"
+
+        # Semaphores are bound to an event loop, so one is created per loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._script = None
+
+        # In-memory fallback state
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._tokens_at = time.time()
+        self._paused_until = 0.0
+        self._quota_used: Dict[str, int] = {}
+
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "in_flight": 0,
+            "throttled": 0,
+            "throttled_seconds": 0.0,
+            "rate_limited_responses": 0,
+            "quota_rejections": 0,
+        }
+
+    def _quota_key(self) -> str:
+        """Get the quota counter key of the current UTC day"""
+        return f"rate_limit:{self.name}:quota:{datetime.now(timezone.utc).strftime('%Y-%m-%d')}"
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore of the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _take_token(self) -> float:
+        """Take a token from the bucket, returning the seconds to wait if none is left"""
+        now = time.time()
+        redis = get_redis_connection()
+        if redis:
+            try:
+                paused_until = float(redis.get(self.paused_key) or 0)
+                if paused_until > now:
+                    return paused_until - now
+                if self._script is None:
+                    self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+                return float(self._script(keys=[self.bucket_key], args=[self.rate_per_second, self.burst, now]))
+            except Exception as e:
+                logger.error(f"Error using Redis rate limiter: {e}")
+                logger.info("Falling back to in-memory rate limiter")
+
+        with self._lock:
+            if self._paused_until > now:
+                return self._paused_until - now
+            self._tokens = min(self.burst, self._tokens + max(0.0, now - self._tokens_at) * self.rate_per_second)
+            self._tokens_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate_per_second
+
+    def _take_quota(self) -> bool:
+        """Count one request against the daily quota, returning False if it is used up"""
+        if self.daily_quota <= 0:
+            return True
+
+        key = self._quota_key()
+        redis = get_redis_connection()
+        if redis:
+            try:
+                used = redis.incr(key)
+                if used == 1:
+                    redis.expire(key, 2 * 24 * 3600)
+                if used > self.daily_quota:
+                    redis.decr(key)
+                    return False
+                return True
+            except Exception as e:
+                logger.error(f"Error using Redis quota counter: {e}")
+                logger.info("Falling back to in-memory quota counter")
+
+        with self._lock:
+            used = self._quota_used.get(key, 0)
+            if used >= self.daily_quota:
+                return False
+            # Only the current day is kept
+            self._quota_used = {key: used + 1}
+            return True
+
+    def quota_used(self) -> int:
+        """Get the number of requests counted against today's quota"""
+        key = self._quota_key()
+        redis = get_redis_connection()
+        if redis:
+            try:
+                return int(redis.get(key) or 0)
+            except Exception as e:
+                logger.error(f"Error reading Redis quota counter: {e}")
+        with self._lock:
+            return self._quota_used.get(key, 0)
+
+    def record_usage(self, request_count: Optional[int]) -> None:
+        """
+        Align the quota counter with the request count reported by the API
+
+        Requests made outside this service (other deployments, manual calls)
+        also count against the upstream quota.
+        """
+        if not request_count or self.daily_quota <= 0:
+            return
+
+        key = self._quota_key()
+        redis = get_redis_connection()
+        if redis:
+            try:
+                if int(redis.get(key) or 0) < request_count:
+                    redis.set(key, request_count, ex=2 * 24 * 3600)
+                return
+            except Exception as e:
+                logger.error(f"Error updating Redis quota counter: {e}")
+
+        with self._lock:
+            if self._quota_used.get(key, 0) < request_count:
+                self._quota_used = {key: request_count}
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for a while, after a 429 or a Retry-After header"""
+        self.stats["rate_limited_responses"] += 1
+        paused_until = time.time() + seconds
+        logger.warning(f"Rate limited by {self.name}, pausing requests for {seconds:.1f}s")
+
+        redis = get_redis_connection()
+        if redis:
+            try:
+                redis.set(self.paused_key, paused_until, ex=max(int(seconds) + 1, 1))
+                return
+            except Exception as e:
+                logger.error(f"Error setting Redis rate limit pause: {e}")
+
+        with self._lock:
+            self._paused_until = max(self._paused_until, paused_until)
+
+    @asynccontextmanager
+    async def limit(self) -> AsyncIterator[bool]:
+        """
+        Wait for a request slot
+
+        Yields:
+            bool: False when the daily quota is used up and the request must not be sent
+        """
+        async with self._get_semaphore():
+            waited = 0.0
+            while True:
+                wait = self._take_token()
+                if wait <= 0:
+                    break
+                waited += wait
+                await asyncio.sleep(wait)
+            if waited:
+                self.stats["throttled"] += 1
+                self.stats["throttled_seconds"] += waited
+
+            if not self._take_quota():
+                self.stats["quota_rejections"] += 1
+                yield False
+                return
+
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            try:
+                yield True
+            finally:
+                self.stats["in_flight"] -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter counters for the health endpoint"""
+        used = self.quota_used()
+        return {
+            **self.stats,
+            "throttled_seconds": round(self.stats["throttled_seconds"], 3),
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.rate_per_second,
+            "daily_quota": self.daily_quota or None,
+            "daily_quota_used": used,
+            "daily_quota_remaining": max(self.daily_quota - used, 0) if self.daily_quota else None,
+        }
+
+
+# Limiter shared by every StormGlass request of this process
+stormglass_limiter = RateLimiter(
+    "stormglass",
+    max_concurrency=settings.STORMGLASS_MAX_CONCURRENCY,
+    rate_per_second=settings.STORMGLASS_RATE_PER_SECOND,
+    burst=settings.STORMGLASS_RATE_BURST,
+    daily_quota=settings.STORMGLASS_DAILY_QUOTA
+)
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.db.redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# Delete the lease only if this process still holds it
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent fetches of the same cache key
+
+    Within a process, callers of a key that is already being fetched await
+    the same future. Across processes, the fetching process holds a Redis
+    lease on the key; other processes poll the cache until the value shows
+    up, the lease is released or the wait times out, and only then fetch
+    themselves.
+    """
+
+    def __init__(self, name: str, lease_ttl: int, wait_timeout: float, poll_interval: float = 0.25):
+        self.name = name
+        self.lease_ttl = lease_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._release_script = None
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "fetches": 0,
+            "coalesced_local": 0,
+            "coalesced_remote": 0,
+            "lease_timeouts": 0,
+        }
+
+    def _lease_key(self, key: str) -> str:
+        return f"single_flight:{self.name}:{key}"
+
+    def _acquire_lease(self, key: str, token: str) -> bool:
+        """Try to take the cross-process lease of a key (always succeeds without Redis)"""
+        redis = get_redis_connection()
+        if not redis:
+            return True
+        try:
+            return bool(redis.set(self._lease_key(key), token, nx=True, ex=self.lease_ttl))
+        except Exception as e:
+            logger.error(f"Error acquiring Redis lease: {e}")
+            return True
+
+    def _release_lease(self, key: str, token: str) -> None:
+        redis = get_redis_connection()
+        if not redis:
+            return
+        try:
+            if self._release_script is None:
+                self._release_script = redis.register_script(RELEASE_LEASE_SCRIPT)
+            self._release_script(keys=[self._lease_key(key)], args=[token])
+        except Exception as e:
+            logger.error(f"Error releasing Redis lease: {e}")
+
+    def _lease_held(self, key: str) -> bool:
+        redis = get_redis_connection()
+        if not redis:
+            return False
+        try:
+            return bool(redis.exists(self._lease_key(key)))
+        except Exception as e:
+            logger.error(f"Error checking Redis lease: {e}")
+            return False
+
+    async def _wait_for_remote(self, key: str, read_cache: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """Wait for another process to fill the cache, returning None if it does not"""
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            cached = read_cache()
+            if cached is not None:
+                return cached
+            if not self._lease_held(key):
+                return None
+        self.stats["lease_timeouts"] += 1
+        logger.warning(f"Timed out waiting for another worker to fetch {key}")
+        return None
+
+    async def _run(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        read_cache: Callable[[], Optional[Any]]
+    ) -> Any:
+        token = uuid.uuid4().hex
+        if not self._acquire_lease(key, token):
+            cached = await self._wait_for_remote(key, read_cache)
+            if cached is not None:
+                self.stats["coalesced_remote"] += 1
+                return cached
+            self._acquire_lease(key, token)
+
+        try:
+            # The previous lease holder may have filled the cache just before we got the lease
+            cached = read_cache()
+            if cached is not None:
+                self.stats["coalesced_remote"] += 1
+                return cached
+            self.stats["fetches"] += 1
+            return await fetch()
+        finally:
+            self._release_lease(key, token)
+
+    async def do(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        read_cache: Callable[[], Optional[Any]]
+    ) -> Any:
+        """
+        Fetch a key once for all concurrent callers
+
+        Args:
+            key: Cache key being fetched
+            fetch: Coroutine function that fetches and caches the value
+            read_cache: Function returning the cached value or None
+
+        Returns:
+            The fetched or cached value
+        """
+        self.stats["calls"] += 1
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced_local"] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._run(key, fetch, read_cache)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get counters for the health endpoint"""
+        return {**self.stats, "in_flight": len(self._inflight)}
+
+
+# Single-flight layer of the StormGlass marine data cache
+marine_flight = SingleFlight(
+    "marine",
+    lease_ttl=settings.STORMGLASS_LEASE_TTL,
+    wait_timeout=settings.STORMGLASS_LEASE_WAIT
+)
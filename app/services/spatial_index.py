@@ -0,0 +1,189 @@
+import math
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.distance import EARTH_RADIUS_KM, ELLIPSOID_MARGIN
+
+Cell = Tuple[int, int]
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Get the latitude/longitude box enclosing a search radius
+
+    Args:
+        latitude: Center latitude
+        longitude: Center longitude
+        radius_km: Search radius in kilometers
+
+    Returns:
+        Tuple with min latitude, max latitude, min longitude and max longitude.
+        Longitudes are not wrapped and may fall outside -180..180.
+    """
+    angular_radius = (radius_km * ELLIPSOID_MARGIN) / EARTH_RADIUS_KM
+    lat_delta = math.degrees(angular_radius)
+    min_lat = latitude - lat_delta
+    max_lat = latitude + lat_delta
+
+    # Box touches a pole (or the radius spans half the globe), every longitude qualifies
+    if min_lat <= -90.0 or max_lat >= 90.0 or angular_radius >= math.pi / 2:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    lng_delta = math.degrees(math.asin(math.sin(angular_radius) / math.cos(math.radians(latitude))))
+    return min_lat, max_lat, longitude - lng_delta, longitude + lng_delta
+
+
+def _in_longitude_range(longitude: float, min_lng: float, max_lng: float) -> bool:
+    """Check a longitude against a range that may wrap around the antimeridian"""
+    if max_lng - min_lng >= 360.0:
+        return True
+    offset = (longitude - min_lng) % 360.0
+    return offset <= max_lng - min_lng
+
+
+class SpatialIndex:
+    """
+    Grid-bucketed index of points for fast radius lookups
+
+    Every point is stored in the grid cell containing it, so a radius query
+    only scans the cells overlapping the search area. Points that carry their
+    own radius (e.g. a user's notification radius) are stored in every cell
+    their circle overlaps, which turns "who covers this location" into a
+    single cell lookup.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.25):
+        self.cell_size = cell_size_deg
+        self._lng_cells = int(math.ceil(360.0 / cell_size_deg))
+        self._cells: Dict[Cell, Set[int]] = {}
+        self._points: Dict[int, Tuple[float, float, float]] = {}
+        self._point_cells: Dict[int, List[Cell]] = {}
+        self._lock = threading.RLock()
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, point_id: int) -> bool:
+        return point_id in self._points
+
+    def _cell_row(self, latitude: float) -> int:
+        return int(math.floor((min(max(latitude, -90.0), 90.0) + 90.0) / self.cell_size))
+
+    def _cell_col(self, longitude: float) -> int:
+        return int(math.floor((longitude + 180.0) / self.cell_size)) % self._lng_cells
+
+    def _cells_for_box(self, min_lat: float, max_lat: float, min_lng: float, max_lng: float) -> Iterator[Cell]:
+        """Yield every grid cell overlapping a (possibly antimeridian-wrapping) box"""
+        rows = range(self._cell_row(min_lat), self._cell_row(max_lat) + 1)
+        if max_lng - min_lng >= 360.0:
+            cols: Iterable[int] = range(self._lng_cells)
+        else:
+            first = int(math.floor((min_lng + 180.0) / self.cell_size))
+            last = int(math.floor((max_lng + 180.0) / self.cell_size))
+            cols = sorted({col % self._lng_cells for col in range(first, last + 1)})
+        for row in rows:
+            for col in cols:
+                yield row, col
+
+    def insert(self, point_id: int, latitude: float, longitude: float, radius_km: float = 0.0) -> None:
+        """
+        Insert or move a point
+
+        Args:
+            point_id: Point identifier (e.g. beach or user ID)
+            latitude: Point latitude
+            longitude: Point longitude
+            radius_km: Coverage radius; the point is bucketed into every cell it reaches
+        """
+        if radius_km > 0:
+            cells = list(self._cells_for_box(*bounding_box(latitude, longitude, radius_km)))
+        else:
+            cells = [(self._cell_row(latitude), self._cell_col(longitude))]
+
+        with self._lock:
+            self._discard(point_id)
+            self._points[point_id] = (latitude, longitude, radius_km)
+            self._point_cells[point_id] = cells
+            for cell in cells:
+                self._cells.setdefault(cell, set()).add(point_id)
+
+    def remove(self, point_id: int) -> None:
+        """Remove a point if it is indexed"""
+        with self._lock:
+            self._discard(point_id)
+
+    def _discard(self, point_id: int) -> None:
+        for cell in self._point_cells.pop(point_id, []):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(point_id)
+                if not bucket:
+                    del self._cells[cell]
+        self._points.pop(point_id, None)
+
+    def rebuild(self, points: Iterable[Tuple]) -> None:
+        """
+        Replace the index contents
+
+        Args:
+            points: Iterable of (id, latitude, longitude) or (id, latitude, longitude, radius_km)
+        """
+        with self._lock:
+            self._cells = {}
+            self._points = {}
+            self._point_cells = {}
+            for point in points:
+                self.insert(*point)
+            self.loaded_at = time.monotonic()
+
+    def is_stale(self, max_age_seconds: float = settings.SPATIAL_INDEX_REFRESH_SECONDS) -> bool:
+        """Check whether the index was never loaded or is older than max_age_seconds"""
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age_seconds
+
+    def query(self, latitude: float, longitude: float, radius_km: float) -> List[Tuple[int, float, float]]:
+        """
+        Get points whose location falls inside the bounding box of a search radius
+
+        Only candidate cells are scanned; callers still need an exact distance
+        check to discard points in the box corners.
+
+        Returns:
+            List of (id, latitude, longitude) tuples
+        """
+        min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+        results = []
+        with self._lock:
+            seen: Set[int] = set()
+            for cell in self._cells_for_box(min_lat, max_lat, min_lng, max_lng):
+                for point_id in self._cells.get(cell, ()):
+                    if point_id in seen:
+                        continue
+                    seen.add(point_id)
+                    point_lat, point_lng, _ = self._points[point_id]
+                    if min_lat <= point_lat <= max_lat and _in_longitude_range(point_lng, min_lng, max_lng):
+                        results.append((point_id, point_lat, point_lng))
+        return results
+
+    def covering(self, latitude: float, longitude: float) -> List[Tuple[int, float, float, float]]:
+        """
+        Get points whose own radius may reach a location
+
+        Only the cell containing the location is read; callers still need an
+        exact distance check against each point's radius.
+
+        Returns:
+            List of (id, latitude, longitude, radius_km) tuples
+        """
+        cell = (self._cell_row(latitude), self._cell_col(longitude))
+        with self._lock:
+            return [(point_id, *self._points[point_id]) for point_id in self._cells.get(cell, ())]
+
+
+# Global beach location index, shared by the beach CRUD operations
+beach_index = SpatialIndex(settings.SPATIAL_INDEX_CELL_DEG)
+
+# Global user location index, bucketed by each user's notification radius
+user_index = SpatialIndex(settings.SPATIAL_INDEX_CELL_DEG)
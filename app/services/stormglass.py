@@ -2,25 +2,111 @@ import httpx
 import logging
 import json
 import random
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional, Tuple
 
 from app.core.config import settings
 from app.db.redis import get_cache, set_cache
+from app.services.http_client import get_http_client
+from app.services.rate_limiter import RateLimiter, stormglass_limiter
+from app.services.single_flight import marine_flight
 
 logger = logging.getLogger(__name__)
 
+# Pause after a 429 response without a Retry-After header (seconds)
+DEFAULT_RETRY_AFTER = 10.0
+
+# Forecast hour format used in marine cache keys
+WINDOW_KEY_FORMAT = "%Y-%m-%dT%H"
+
+# Marine cache lookups of this process
+cache_stats: Dict[str, int] = {"hits": 0, "window_hits": 0, "misses": 0}
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def align_forecast_window(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Widen a time range to whole forecast hours"""
+    window_start = start.replace(minute=0, second=0, microsecond=0)
+    window_end = end.replace(minute=0, second=0, microsecond=0)
+    if window_end < end:
+        window_end += timedelta(hours=1)
+    return window_start, window_end
+
+
+def plan_fetch_range(horizon: Optional[datetime], now: datetime) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Plan the forecast range to request for a stored forecast horizon
+
+    Only the hours beyond the stored horizon are needed, plus the next
+    WEATHER_REVISION_HOURS hours whose forecast is most likely to have been
+    revised. Both go out as one request: StormGlass counts requests against
+    the daily quota, not hours, so a cell never costs more than one request
+    per cycle and re-fetching the stored hours between the two is free.
+    Ranges shorter than WEATHER_MIN_FETCH_HOURS wait for a later cycle.
+
+    Args:
+        horizon: Last stored forecast hour, None if nothing usable is stored
+        now: Current time (naive UTC)
+
+    Returns:
+        (start, end) range, None if the beach is up to date
+    """
+    now = now.replace(minute=0, second=0, microsecond=0)
+    end = now + timedelta(hours=settings.WEATHER_FORECAST_HOURS)
+    min_hours = timedelta(hours=settings.WEATHER_MIN_FETCH_HOURS)
+
+    if horizon is None or horizon < now:
+        return now, end
+
+    extension_start = horizon + timedelta(hours=1)
+    if end - extension_start >= min_hours:
+        return (now if settings.WEATHER_REVISION_HOURS > 0 else extension_start), end
+
+    if settings.WEATHER_REVISION_HOURS > 0:
+        revision_end = min(now + timedelta(hours=settings.WEATHER_REVISION_HOURS), end)
+        if revision_end - now >= min_hours:
+            return now, revision_end
+    return None
+
+
+def slice_hours(data: Dict[str, Any], start: datetime, end: datetime) -> Dict[str, Any]:
+    """Keep the forecast hours of a cached response that fall within a time range"""
+    window_start, window_end = align_forecast_window(_as_utc(start), _as_utc(end))
+    hours = [
+        hour for hour in data.get("hours", [])
+        if window_start <= _as_utc(datetime.fromisoformat(hour["time"].replace("Z", "+00:00"))) <= window_end
+    ]
+    return {**data, "hours": hours}
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get marine cache counters and hit ratio for the health endpoint"""
+    lookups = sum(cache_stats.values())
+    hits = cache_stats["hits"] + cache_stats["window_hits"]
+    return {**cache_stats, "hit_ratio": round(hits / lookups, 3) if lookups else None}
+
 
 class StormGlassService:
     """Service for interacting with StormGlass API"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, limiter: Optional[RateLimiter] = None):
+        # Requests go through the shared pooled client and limiter unless given
+        self.client = client
+        self.limiter = limiter or stormglass_limiter
+        self.flight = marine_flight
+        self.max_retries = settings.STORMGLASS_MAX_RETRIES
         self.api_key = settings.STORMGLASS_API_KEY
         self.base_url = settings.STORMGLASS_BASE_URL
         self.headers = {
             "Authorization": self.api_key
         }
         self.cache_ttl = settings.STORMGLASS_CACHE_TTL
+        self.coordinate_precision = settings.STORMGLASS_CACHE_COORD_PRECISION
         self.use_mock = not self.api_key or self.api_key == ""
         if self.use_mock:
             logger.warning("No StormGlass API key provided, using mock data")
@@ -54,14 +140,32 @@ class StormGlassService:
         if not end:
             end = start + timedelta(days=1)
         
-        # Generate cache key
-        cache_key = f"marine:{latitude}:{longitude}:{start.isoformat()}:{end.isoformat()}"
+        # Canonical key: rounded coordinates and a window aligned to forecast hours
+        latitude, longitude = self.round_coordinates(latitude, longitude)
+        start, end = _as_utc(start), _as_utc(end)
+        window_start, window_end = align_forecast_window(start, end)
+        cache_key = (
+            f"marine:{latitude}:{longitude}:"
+            f"{window_start.strftime(WINDOW_KEY_FORMAT)}:{window_end.strftime(WINDOW_KEY_FORMAT)}"
+        )
+        window_key = f"marine_window:{latitude}:{longitude}"
         
         # Check if data is in cache
         cached_data = get_cache(cache_key)
         if cached_data:
+            cache_stats["hits"] += 1
             logger.info(f"Using cached marine data for {latitude}, {longitude}")
-            return cached_data
+            return slice_hours(cached_data, start, end)
+        
+        # Serve a sub-range of the last window cached for this location
+        cached_data = self._get_covering_window(window_key, window_start, window_end)
+        if cached_data:
+            cache_stats["window_hits"] += 1
+            logger.info(f"Using cached marine data window for {latitude}, {longitude}")
+            return slice_hours(cached_data, start, end)
+        
+        cache_stats["misses"] += 1
+        start, end = window_start, window_end
         
         # Parameters for API request - use only specific parameters and sg source
         params = {
@@ -78,30 +182,104 @@ class StormGlassService:
             "end": end.isoformat()
         }
         
+        # Concurrent misses of the same key share one upstream request
+        data = await self.flight.do(
+            cache_key,
+            lambda: self._fetch_marine_data(cache_key, latitude, longitude, params),
+            lambda: get_cache(cache_key)
+        )
+        if "error" in data:
+            return data
+        
+        # Point the location at the newest window so sub-ranges can be sliced from it
+        set_cache(window_key, {
+            "key": cache_key,
+            "start": window_start.isoformat(),
+            "end": window_end.isoformat()
+        }, self.cache_ttl)
+        return data
+    
+    def round_coordinates(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """Round coordinates to the cache key precision"""
+        return round(latitude, self.coordinate_precision), round(longitude, self.coordinate_precision)
+    
+    def _get_covering_window(
+        self,
+        window_key: str,
+        start: datetime,
+        end: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Get the cached window of a location if it covers the requested range"""
+        window = get_cache(window_key)
+        if not window:
+            return None
+        if datetime.fromisoformat(window["start"]) > start or datetime.fromisoformat(window["end"]) < end:
+            return None
+        return get_cache(window["key"])
+    
+    async def _fetch_marine_data(
+        self,
+        cache_key: str,
+        latitude: float,
+        longitude: float,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Request marine data from StormGlass API and cache successful responses"""
         try:
-            async with httpx.AsyncClient() as client:
-                logger.info(f"Fetching marine data from StormGlass API for {latitude}, {longitude}")
-                response = await client.get(
-                    f"{self.base_url}/weather/point",
-                    headers=self.headers,
-                    params=params,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    logger.info(f"Successfully fetched marine data: {len(data.get('hours', []))} hours")
-                    # Cache the data
-                    set_cache(cache_key, data, self.cache_ttl)
-                    return data
-                else:
-                    logger.error(f"StormGlass API error: {response.status_code} - {response.text}")
-                    return {"error": f"API Error: {response.status_code}", "message": response.text}
+            client = self.client or get_http_client()
+            for attempt in range(self.max_retries + 1):
+                # Wait for a concurrency slot, a rate limit token and daily quota
+                async with self.limiter.limit() as allowed:
+                    if not allowed:
+                        logger.error("StormGlass daily quota used up, skipping request")
+                        return {"error": "Quota Exceeded", "message": "StormGlass daily request quota used up"}
                     
+                    logger.info(f"Fetching marine data from StormGlass API for {latitude}, {longitude}")
+                    response = await client.get(
+                        f"{self.base_url}/weather/point",
+                        headers=self.headers,
+                        params=params
+                    )
+                
+                if response.status_code != 429:
+                    break
+                
+                # Rate limited: hold back every request until Retry-After has passed
+                retry_after = self._retry_after(response)
+                self.limiter.pause(retry_after)
+                if attempt == self.max_retries or retry_after > settings.STORMGLASS_MAX_RETRY_WAIT:
+                    break
+            
+            if response.status_code == 200:
+                data = response.json()
+                logger.info(f"Successfully fetched marine data: {len(data.get('hours', []))} hours")
+                self.limiter.record_usage(data.get("meta", {}).get("requestCount"))
+                # Cache the data
+                set_cache(cache_key, data, self.cache_ttl)
+                return data
+            else:
+                logger.error(f"StormGlass API error: {response.status_code} - {response.text}")
+                return {"error": f"API Error: {response.status_code}", "message": response.text}
+                
         except Exception as e:
             logger.error(f"Error fetching marine data: {str(e)}")
             return {"error": "Connection Error", "message": str(e)}
     
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> float:
+        """Get the Retry-After delay of a response in seconds (seconds or HTTP date format)"""
+        value = response.headers.get("Retry-After")
+        if value:
+            try:
+                return max(float(value), 0.0)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(value)
+                    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+                except (TypeError, ValueError):
+                    pass
+        return DEFAULT_RETRY_AFTER
+    
     async def get_combined_data(
         self,
         latitude: float,
@@ -1,10 +1,239 @@
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Dict, Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Warning codes, combined as a bitmask per forecast hour
+WAVE_DANGER = 1
+WAVE_WARNING = 2
+WIND_DANGER = 4
+WIND_WARNING = 8
+CURRENT_DANGER = 16
+CURRENT_WARNING = 32
+INSUFFICIENT_DATA = 64
+
+# Messages of each warning code, in the order they are reported
+WARNING_MESSAGES = [
+    (WAVE_DANGER, "wave_height", "Dangerous wave height: {} meters"),
+    (WAVE_WARNING, "wave_height", "Warning: High waves at {} meters"),
+    (WIND_DANGER, "wind_speed", "Dangerous wind conditions: {} m/s"),
+    (WIND_WARNING, "wind_speed", "Warning: Strong winds at {} m/s"),
+    (CURRENT_DANGER, "current_speed", "Dangerous currents: {} m/s"),
+    (CURRENT_WARNING, "current_speed", "Warning: Strong currents at {} m/s"),
+    (INSUFFICIENT_DATA, None, "Insufficient weather data available"),
+]
+
+
+class ForecastHour(NamedTuple):
+    """
+    Parsed and scored forecast hour
+
+    A tuple is a fraction of the size of a dict per hour, pickles compactly
+    out of the parsing processes and is written by the bulk writer as is.
+    """
+    timestamp: datetime
+    wave_height: Optional[float]
+    wave_direction: Optional[float]
+    wave_period: Optional[float]
+    swell_height: Optional[float]
+    swell_direction: Optional[float]
+    swell_period: Optional[float]
+    wind_speed: Optional[float]
+    wind_direction: Optional[float]
+    water_temperature: Optional[float]
+    current_speed: Optional[float]
+    current_direction: Optional[float]
+    visibility: Optional[float]
+    additional_data: Optional[Dict[str, Any]]
+    safety_score: int
+    suitability_level: str
+    warning_codes: int
+    payload_id: Optional[int] = None  # WeatherPayload holding the raw response
+
+
+# ForecastHour fields stored as weather data columns
+FORECAST_HOUR_COLUMNS = tuple(
+    field for field in ForecastHour._fields if field not in ("visibility", "warning_codes")
+)
+
+
+def forecast_hour_rows(
+    beach_id: int,
+    hours: List[ForecastHour],
+    source: str = "stormglass",
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Build the weather data insert rows of a beach's forecast hours"""
+    now = now or datetime.utcnow()
+    get_columns = itemgetter(*(ForecastHour._fields.index(column) for column in FORECAST_HOUR_COLUMNS))
+    return [
+        {
+            **dict(zip(FORECAST_HOUR_COLUMNS, get_columns(hour))),
+            "beach_id": beach_id,
+            "source": source,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for hour in hours
+    ]
+
+
+# StormGlass parameters parsed into weather data columns
+STORED_PARAMS = frozenset({
+    "time",
+    "waveHeight", "waveDirection", "wavePeriod",
+    "swellHeight", "swellDirection", "swellPeriod",
+    "windSpeed", "windDirection",
+    "waterTemperature",
+    "currentSpeed", "currentDirection",
+})
+
+# Values of WEATHER_RAW_STORAGE
+RAW_STORAGE_MODES = ("full", "remainder", "blob")
+
+
+def raw_remainder(hour_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Get the part of a raw forecast hour that is not stored in columns, None if nothing is left"""
+    remainder = {key: value for key, value in hour_data.items() if key not in STORED_PARAMS}
+    return remainder or None
+
+
+# Suitability levels by level code
+SUITABILITY_LEVELS = np.array(["safe", "warning", "danger", "unknown"])
+LEVEL_UNKNOWN = 3
+
+# Severity order of suitability levels, e.g. to pick the worst of several
+SUITABILITY_SEVERITY = {"safe": 0, "unknown": 1, "warning": 2, "danger": 3}
+
+
+def render_warnings(
+    warning_codes: int,
+    wave_height: Optional[float] = None,
+    wind_speed: Optional[float] = None,
+    current_speed: Optional[float] = None
+) -> List[str]:
+    """
+    Render the warning messages of a forecast hour from its warning codes
+
+    Args:
+        warning_codes: Bitmask of warning codes
+        wave_height, wind_speed, current_speed: Values quoted in the messages
+
+    Returns:
+        List of warning messages
+    """
+    values = {"wave_height": wave_height, "wind_speed": wind_speed, "current_speed": current_speed}
+    return [
+        message.format(values[field]) if field else message
+        for code, field, message in WARNING_MESSAGES
+        if warning_codes & code
+    ]
+
+
+def hours_to_notify(
+    hours: List["ForecastHour"],
+    stored_levels: Dict[datetime, Optional[str]]
+) -> List["ForecastHour"]:
+    """
+    Get the warning and danger hours of a forecast that users were not notified of yet
+
+    The revision window is fetched again every cycle, so an hour is only
+    notified when it was not stored before or when its level is more
+    severe than the stored one.
+
+    Args:
+        hours: Forecast hours about to be stored
+        stored_levels: Stored suitability level by hour timestamp, hours not stored yet left out
+    """
+    notify = []
+    for hour in hours:
+        if hour.suitability_level not in ("warning", "danger"):
+            continue
+        if hour.timestamp in stored_levels:
+            previous = stored_levels[hour.timestamp]
+            if SUITABILITY_SEVERITY[hour.suitability_level] <= SUITABILITY_SEVERITY.get(previous, 1):
+                continue
+        notify.append(hour)
+    return notify
+
+
+def hours_to_store(
+    hours: List["ForecastHour"],
+    horizon: Optional[datetime],
+    now: datetime
+) -> List["ForecastHour"]:
+    """
+    Get the hours of a fetched forecast that a beach needs written
+
+    A cell is fetched as one request from now whenever its forecast needs
+    extending (see plan_fetch_range), so most of the fetched hours are
+    already stored. Only the revision window and the hours past the beach's
+    own stored horizon are written; the stored hours between them are kept.
+
+    Args:
+        hours: Parsed forecast hours
+        horizon: Last stored forecast hour of the beach (naive UTC), None if nothing is stored
+        now: Time the sweep was planned at (naive UTC)
+    """
+    if horizon is None:
+        return hours
+
+    revision_end = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=settings.WEATHER_REVISION_HOURS)
+    store = []
+    for hour in hours:
+        timestamp = hour.timestamp
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        if timestamp > horizon or (settings.WEATHER_REVISION_HOURS > 0 and timestamp <= revision_end):
+            store.append(hour)
+    return store
+
+
+class SafetyScores:
+    """Scores, levels and warning codes of a batch of forecast hours"""
+
+    def __init__(
+        self,
+        scores: np.ndarray,
+        level_codes: np.ndarray,
+        warning_codes: np.ndarray,
+        wave_heights: np.ndarray,
+        wind_speeds: np.ndarray,
+        current_speeds: np.ndarray
+    ):
+        self.scores = scores
+        self.level_codes = level_codes
+        self.warning_codes = warning_codes
+        self.wave_heights = wave_heights
+        self.wind_speeds = wind_speeds
+        self.current_speeds = current_speeds
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def levels(self) -> np.ndarray:
+        """Suitability level names of every hour"""
+        return SUITABILITY_LEVELS[self.level_codes]
+
+    def warnings(self, index: int) -> List[str]:
+        """Render the warning messages of one hour"""
+        codes = int(self.warning_codes[index])
+        if not codes:
+            return []
+        values = [float(values[index]) for values in (self.wave_heights, self.wind_speeds, self.current_speeds)]
+        return render_warnings(codes, *(None if math.isnan(value) else value for value in values))
+
 
 class SuitabilityService:
     """Service for determining beach suitability and safety levels"""
@@ -17,6 +246,66 @@ class SuitabilityService:
         self.wind_speed_danger = getattr(settings, 'WIND_SPEED_THRESHOLD_DANGER', 15.0)
         self.current_speed_warning = getattr(settings, 'CURRENT_SPEED_THRESHOLD_WARNING', 0.5)
         self.current_speed_danger = getattr(settings, 'CURRENT_SPEED_THRESHOLD_DANGER', 1.0)
+        
+        # Raw upstream data kept in additional_data
+        self.raw_storage = settings.WEATHER_RAW_STORAGE
+        if self.raw_storage not in RAW_STORAGE_MODES:
+            logger.warning(f"Unknown WEATHER_RAW_STORAGE '{self.raw_storage}', using 'full'")
+            self.raw_storage = "full"
+    
+    def score_batch(
+        self,
+        wave_heights: Sequence[Optional[float]],
+        wind_speeds: Sequence[Optional[float]],
+        current_speeds: Sequence[Optional[float]]
+    ) -> SafetyScores:
+        """
+        Calculate safety scores for many forecast hours at once
+        
+        Missing values may be given as None or NaN. Warning messages are not
+        built here; use SafetyScores.warnings or render_warnings when needed.
+        
+        Args:
+            wave_heights: Wave height of every hour (meters)
+            wind_speeds: Wind speed of every hour (m/s)
+            current_speeds: Current speed of every hour (m/s)
+            
+        Returns:
+            SafetyScores with a score (0-100), level and warning codes per hour
+        """
+        waves = np.asarray(wave_heights, dtype=np.float64)
+        winds = np.asarray(wind_speeds, dtype=np.float64)
+        currents = np.asarray(current_speeds, dtype=np.float64)
+        
+        scores = np.full(waves.shape, 100, dtype=np.int16)
+        codes = np.zeros(waves.shape, dtype=np.uint8)
+        
+        # NaN compares False, so missing values never deduct points
+        checks = [
+            (waves, self.wave_height_danger, self.wave_height_warning, 40, 20, WAVE_DANGER, WAVE_WARNING),
+            (winds, self.wind_speed_danger, self.wind_speed_warning, 30, 15, WIND_DANGER, WIND_WARNING),
+            (currents, self.current_speed_danger, self.current_speed_warning, 30, 15, CURRENT_DANGER, CURRENT_WARNING),
+        ]
+        with np.errstate(invalid="ignore"):
+            for values, danger, warning, danger_penalty, warning_penalty, danger_code, warning_code in checks:
+                is_danger = values >= danger
+                is_warning = (values >= warning) & ~is_danger
+                scores -= np.where(is_danger, danger_penalty, np.where(is_warning, warning_penalty, 0)).astype(np.int16)
+                codes |= np.where(is_danger, danger_code, np.where(is_warning, warning_code, 0)).astype(np.uint8)
+        
+        # Ensure score is within 0-100 range
+        np.clip(scores, 0, 100, out=scores)
+        
+        # Determine suitability level based on score
+        level_codes = np.where(scores >= 80, 0, np.where(scores >= 50, 1, 2)).astype(np.uint8)
+        
+        # If we couldn't evaluate any conditions, return unknown
+        unknown = np.isnan(waves) & np.isnan(winds) & np.isnan(currents)
+        scores[unknown] = 50
+        level_codes[unknown] = LEVEL_UNKNOWN
+        codes[unknown] = INSUFFICIENT_DATA
+        
+        return SafetyScores(scores, level_codes, codes, waves, winds, currents)
     
     def calculate_safety_score(self, weather_data: Dict[str, Any]) -> Tuple[int, str, List[str]]:
         """
@@ -90,7 +379,7 @@ class SuitabilityService:
         
         return score, suitability, warnings
     
-    def parse_stormglass_data(self, stormglass_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def parse_stormglass_data(self, stormglass_data: Dict[str, Any]) -> List[ForecastHour]:
         """
         Parse StormGlass API data and prepare it for the database
         
@@ -98,7 +387,7 @@ class SuitabilityService:
             stormglass_data: Data from StormGlass API
             
         Returns:
-            List of parsed weather data points
+            List of parsed and scored forecast hours
         """
         parsed_data = []
         
@@ -158,36 +447,46 @@ class SuitabilityService:
                 # Extract visibility
                 visibility = self._get_average_value(hour_data, "visibility")
                 
-                # Create weather data point
-                weather_data = {
-                    "timestamp": timestamp,
-                    "wave_height": wave_height,
-                    "wave_direction": wave_direction,
-                    "wave_period": wave_period,
-                    "swell_height": swell_height,
-                    "swell_direction": swell_direction,
-                    "swell_period": swell_period,
-                    "wind_speed": wind_speed,
-                    "wind_direction": wind_direction,
-                    "water_temperature": water_temperature,
-                    "current_speed": current_speed,
-                    "current_direction": current_direction,
-                    "visibility": visibility,
-                    "additional_data": hour_data  # Store full data for reference
-                }
-                
-                # Calculate safety score
-                safety_score, suitability_level, warnings = self.calculate_safety_score(weather_data)
-                weather_data["safety_score"] = safety_score
-                weather_data["suitability_level"] = suitability_level
-                weather_data["warnings"] = warnings
+                # Keep the raw hour according to WEATHER_RAW_STORAGE; blobs are stored once per fetch
+                if self.raw_storage == "full":
+                    additional_data = hour_data
+                elif self.raw_storage == "remainder":
+                    additional_data = raw_remainder(hour_data)
+                else:
+                    additional_data = None
                 
-                parsed_data.append(weather_data)
+                # Collect the values of the hour, scored for the whole forecast below
+                parsed_data.append((
+                    datetime.fromisoformat(timestamp.replace("Z", "+00:00")),
+                    wave_height, wave_direction, wave_period,
+                    swell_height, swell_direction, swell_period,
+                    wind_speed, wind_direction,
+                    water_temperature,
+                    current_speed, current_direction,
+                    visibility,
+                    additional_data
+                ))
             except Exception as e:
                 logger.error(f"Error parsing hour data: {e}")
                 continue
         
-        return parsed_data
+        if not parsed_data:
+            return []
+        
+        # Calculate safety scores for all hours in one pass
+        columns = dict(zip(ForecastHour._fields, zip(*parsed_data)))
+        result = self.score_batch(
+            [_nan_if_none(value) for value in columns["wave_height"]],
+            [_nan_if_none(value) for value in columns["wind_speed"]],
+            [_nan_if_none(value) for value in columns["current_speed"]]
+        )
+        # Warning codes are rendered with render_warnings only when a notification is sent
+        return [
+            ForecastHour(*values, score, level, codes)
+            for values, score, level, codes in zip(
+                parsed_data, result.scores.tolist(), result.levels.tolist(), result.warning_codes.tolist()
+            )
+        ]
     
     def _get_average_value(self, data: Dict[str, Any], key: str) -> Optional[float]:
         """
@@ -218,4 +517,67 @@ class SuitabilityService:
             return None
         except Exception as e:
             logger.debug(f"Error getting value for {key}: {e}")
-            return None 
\ No newline at end of file
+            return None 
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    """Map missing values to NaN for array scoring"""
+    return np.nan if value is None else value
+
+
+# Service of a parsing worker process, created on first use
+_worker_service: Optional[SuitabilityService] = None
+
+
+def parse_payload_records(stormglass_data: Dict[str, Any]) -> List[ForecastHour]:
+    """
+    Parse and score a StormGlass payload in a worker process
+
+    The service is created once per process and reused for every payload.
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = SuitabilityService()
+    return _worker_service.parse_stormglass_data(stormglass_data)
+
+
+# Optional process pool parsing StormGlass payloads off the event loop
+_parse_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the parsing process pool, None when WEATHER_PARSE_PROCESSES is 0"""
+    global _parse_executor
+    if _parse_executor is None and settings.WEATHER_PARSE_PROCESSES > 0:
+        # Spawned workers do not inherit the threads and connections of this process
+        _parse_executor = ProcessPoolExecutor(
+            max_workers=settings.WEATHER_PARSE_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    """Stop the parsing worker processes"""
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=True)
+        _parse_executor = None
+
+
+async def parse_forecast(
+    suitability_service: SuitabilityService,
+    stormglass_data: Dict[str, Any]
+) -> List[ForecastHour]:
+    """
+    Parse and score a StormGlass response
+
+    With WEATHER_PARSE_PROCESSES set, the payload is parsed in a worker
+    process and only the forecast hour tuples come back, so the event loop
+    only does I/O. Otherwise it is parsed inline.
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return suitability_service.parse_stormglass_data(stormglass_data)
+
+    return await asyncio.get_running_loop().run_in_executor(executor, parse_payload_records, stormglass_data)
@@ -0,0 +1,244 @@
+"""
+Re-score stored weather data after the suitability thresholds change.
+
+Rows are streamed in primary key order from a server-side cursor, scored in
+batches with SuitabilityService.score_batch and written back with one bulk
+UPDATE per batch (only rows whose score or level changed). Progress is
+checkpointed in the cache after every batch, so an interrupted run resumes
+from the last committed row as long as the thresholds are unchanged.
+
+Daily summaries of data past its retention are re-scored afterwards: the
+worst score and level of a day from its maxima, the mean score from its
+means. Their warning and danger hour counts are kept as rolled up.
+
+To run the job:
+python -m app.tasks.rescore [--restart]
+"""
+
+import logging
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, select, text, update
+
+from app.core.config import settings
+from app.db.redis import delete_cache, get_cache, set_cache
+from app.crud.weather import refresh_current_conditions
+from app.db.session import SessionLocal, engine
+from app.models.beach import Beach
+from app.models.weather_daily_summary import WeatherDailySummary
+from app.models.weather_data import WeatherData
+from app.services.map_tiles import invalidate_tile_cache
+from app.services.suitability import SuitabilityService
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_KEY = "rescore:weather_data:checkpoint"
+LAST_RUN_KEY = "rescore:weather_data:last_run"
+STATUS_TTL = 7 * 24 * 3600
+
+# Only one re-scoring run per process
+_run_lock = threading.Lock()
+
+
+def _thresholds(service: SuitabilityService) -> List[float]:
+    """Get the thresholds a run scores with, used to validate checkpoints"""
+    return [
+        service.wave_height_warning, service.wave_height_danger,
+        service.wind_speed_warning, service.wind_speed_danger,
+        service.current_speed_warning, service.current_speed_danger,
+    ]
+
+
+def _bulk_update_scores(conn, changed: List[Tuple[int, int, str]]) -> None:
+    """
+    Write new scores by primary key in one statement
+
+    PostgreSQL joins the table with unnest() over three array parameters,
+    which keeps the statement small however many rows change. Other
+    databases get an executemany UPDATE.
+    """
+    if conn.dialect.name == "postgresql":
+        row_ids, scores, levels = (list(column) for column in zip(*changed))
+        conn.execute(text("""
+            UPDATE weatherdata
+            SET safety_score = scored.score, suitability_level = scored.level
+            FROM unnest(CAST(:row_ids AS integer[]), CAST(:scores AS integer[]), CAST(:levels AS varchar[]))
+                AS scored(id, score, level)
+            WHERE weatherdata.id = scored.id
+        """), {"row_ids": row_ids, "scores": scores, "levels": levels})
+        return
+
+    table = WeatherData.__table__
+    conn.execute(
+        update(table).where(table.c.id == bindparam("row_id")).values(
+            safety_score=bindparam("new_score"),
+            suitability_level=bindparam("new_level")
+        ),
+        [{"row_id": row_id, "new_score": score, "new_level": level} for row_id, score, level in changed]
+    )
+
+
+def _rescore_summaries(service: SuitabilityService, batch_size: int) -> int:
+    """
+    Recompute the scores and levels of daily summaries
+
+    Returns:
+        int: Number of summaries updated
+    """
+    table = WeatherDailySummary.__table__
+    statement = update(table).where(table.c.id == bindparam("row_id")).values(
+        safety_score_min=bindparam("new_score_min"),
+        safety_score_mean=bindparam("new_score_mean"),
+        suitability_level=bindparam("new_level")
+    )
+    query = select(
+        table.c.id,
+        table.c.wave_height_max, table.c.wind_speed_max, table.c.current_speed_max,
+        table.c.wave_height_mean, table.c.wind_speed_mean, table.c.current_speed_mean,
+        table.c.safety_score_min, table.c.safety_score_mean, table.c.suitability_level
+    ).order_by(table.c.id)
+
+    updated = 0
+    with engine.connect() as read_conn:
+        result = read_conn.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+        for rows in result.partitions(batch_size):
+            worst = service.score_batch(
+                [row.wave_height_max for row in rows],
+                [row.wind_speed_max for row in rows],
+                [row.current_speed_max for row in rows]
+            )
+            mean = service.score_batch(
+                [row.wave_height_mean for row in rows],
+                [row.wind_speed_mean for row in rows],
+                [row.current_speed_mean for row in rows]
+            )
+            changed = [
+                {"row_id": row.id, "new_score_min": score_min, "new_score_mean": score_mean, "new_level": level}
+                for row, score_min, score_mean, level in zip(
+                    rows, worst.scores.tolist(), mean.scores.tolist(), worst.levels.tolist()
+                )
+                if (row.safety_score_min, row.safety_score_mean, row.suitability_level) != (score_min, score_mean, level)
+            ]
+            if changed:
+                with engine.begin() as write_conn:
+                    write_conn.execute(statement, changed)
+            updated += len(changed)
+
+    logger.info(f"Re-scored daily summaries, {updated} updated")
+    return updated
+
+
+def get_rescore_status() -> Dict[str, Any]:
+    """Get the checkpoint of the current or interrupted run and the last finished run"""
+    return {
+        "running": _run_lock.locked(),
+        "checkpoint": get_cache(CHECKPOINT_KEY),
+        "last_run": get_cache(LAST_RUN_KEY),
+    }
+
+
+def rescore_weather_data(batch_size: Optional[int] = None, restart: bool = False) -> Dict[str, Any]:
+    """
+    Recompute safety scores and suitability levels of all stored weather data
+
+    Args:
+        batch_size: Rows scored and updated per batch
+        restart: Ignore an existing checkpoint and start from the first row
+
+    Returns:
+        Summary of the run
+    """
+    if not _run_lock.acquire(blocking=False):
+        logger.warning("Re-scoring is already running")
+        return {"status": "already running"}
+
+    try:
+        batch_size = batch_size or settings.RESCORE_BATCH_SIZE
+        service = SuitabilityService()
+        thresholds = _thresholds(service)
+
+        checkpoint = None if restart else get_cache(CHECKPOINT_KEY)
+        if checkpoint and checkpoint.get("thresholds") != thresholds:
+            logger.info("Thresholds changed since the checkpoint was written, starting over")
+            checkpoint = None
+        if not checkpoint:
+            checkpoint = {
+                "last_id": 0,
+                "processed": 0,
+                "updated": 0,
+                "thresholds": thresholds,
+                "started_at": datetime.utcnow().isoformat(),
+            }
+        else:
+            logger.info(f"Resuming re-scoring after weather data ID {checkpoint['last_id']}")
+
+        table = WeatherData.__table__
+        query = select(
+            table.c.id, table.c.wave_height, table.c.wind_speed, table.c.current_speed,
+            table.c.safety_score, table.c.suitability_level
+        ).where(table.c.id > checkpoint["last_id"]).order_by(table.c.id)
+
+        # Reads stream from a server-side cursor on their own connection,
+        # every batch is written and committed on a second one
+        with engine.connect() as read_conn:
+            result = read_conn.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+            for rows in result.partitions(batch_size):
+                scores = service.score_batch(
+                    [row.wave_height for row in rows],
+                    [row.wind_speed for row in rows],
+                    [row.current_speed for row in rows]
+                )
+                changed = [
+                    (row.id, score, level)
+                    for row, score, level in zip(rows, scores.scores.tolist(), scores.levels.tolist())
+                    if row.safety_score != score or row.suitability_level != level
+                ]
+                if changed:
+                    with engine.begin() as write_conn:
+                        _bulk_update_scores(write_conn, changed)
+
+                checkpoint["last_id"] = rows[-1].id
+                checkpoint["processed"] += len(rows)
+                checkpoint["updated"] += len(changed)
+                set_cache(CHECKPOINT_KEY, checkpoint, STATUS_TTL)
+                logger.info(
+                    f"Re-scored {checkpoint['processed']} rows, {checkpoint['updated']} updated "
+                    f"(up to ID {checkpoint['last_id']})"
+                )
+
+        summary = {
+            **checkpoint,
+            "summaries_updated": _rescore_summaries(service, batch_size),
+            "status": "completed",
+            "finished_at": datetime.utcnow().isoformat(),
+        }
+        set_cache(LAST_RUN_KEY, summary, STATUS_TTL)
+        delete_cache(CHECKPOINT_KEY)
+
+        # Stored levels changed, so do the current conditions and the clustered map tiles
+        if summary["updated"] or summary["summaries_updated"]:
+            db = SessionLocal()
+            try:
+                refresh_current_conditions(db, [beach_id for beach_id, in db.query(Beach.id).all()])
+                db.commit()
+            finally:
+                db.close()
+            invalidate_tile_cache()
+
+        logger.info(
+            f"Re-scoring finished: {summary['processed']} rows, {summary['updated']} updated, "
+            f"{summary['summaries_updated']} daily summaries updated"
+        )
+        return summary
+    finally:
+        _run_lock.release()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Starting weather data re-scoring")
+    rescore_weather_data(restart="--restart" in sys.argv)
+    logger.info("Re-scoring finished")
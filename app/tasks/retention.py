@@ -0,0 +1,164 @@
+"""
+Apply the retention of hourly weather data.
+
+Hours older than WEATHER_RAW_RETENTION_DAYS are rolled up into daily
+minimum/maximum/mean summaries, then removed: on a partitioned PostgreSQL
+table by dropping whole monthly partitions, elsewhere by deleting rows in
+batches. Upcoming monthly partitions are created on every run.
+
+To run the job:
+python -m app.tasks.retention
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import case, delete, func, insert, literal, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.crud.weather import get_raw_retention_cutoff
+from app.db.partitions import (
+    DEFAULT_PARTITION, MONTHS_AHEAD, add_months, drop_partitions_before, ensure_partitions,
+    is_partitioned, month_start
+)
+from app.db.session import engine
+from app.models.weather_daily_summary import SUMMARY_METRICS, WeatherDailySummary
+from app.models.weather_data import WeatherData
+from app.models.weather_payload import WeatherPayload
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 10000
+
+
+def rollup_weather_data(conn, cutoff: datetime) -> int:
+    """
+    Summarize the hourly rows older than a cutoff into daily rows
+
+    Starts from the last summarized day, so each run only aggregates the
+    days that became old since the previous one. Summaries are upserted and
+    the job can be re-run safely.
+
+    Returns:
+        int: Number of daily summaries written
+    """
+    summary_table = WeatherDailySummary.__table__
+    table = WeatherData.__table__
+
+    last_day = conn.execute(select(func.max(summary_table.c.date))).scalar()
+    if isinstance(last_day, str):
+        last_day = datetime.fromisoformat(last_day)
+    since = datetime(last_day.year, last_day.month, last_day.day) if last_day else None
+
+    now = datetime.utcnow()
+    day = func.date(table.c.timestamp)
+    columns = ["beach_id", "date", "source", "hours"]
+    values = [table.c.beach_id, day, table.c.source, func.count()]
+    for metric in SUMMARY_METRICS:
+        columns += [f"{metric}_min", f"{metric}_max", f"{metric}_mean"]
+        values += [func.min(table.c[metric]), func.max(table.c[metric]), func.avg(table.c[metric])]
+    columns += [
+        "safety_score_min", "safety_score_mean", "warning_hours", "danger_hours", "suitability_level",
+        "created_at", "updated_at",
+    ]
+    danger_hours = func.sum(case((table.c.suitability_level == "danger", 1), else_=0))
+    warning_hours = func.sum(case((table.c.suitability_level == "warning", 1), else_=0))
+    values += [
+        func.min(table.c.safety_score),
+        func.avg(table.c.safety_score),
+        warning_hours,
+        danger_hours,
+        case((danger_hours > 0, "danger"), (warning_hours > 0, "warning"), else_="safe"),
+        literal(now),
+        literal(now),
+    ]
+
+    query = select(*values).where(table.c.timestamp < cutoff)
+    if since:
+        query = query.where(table.c.timestamp >= since)
+    query = query.group_by(table.c.beach_id, day, table.c.source)
+
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(summary_table).from_select(columns, query)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["beach_id", "date", "source"],
+            set_={column: stmt.excluded[column] for column in columns if column not in ("beach_id", "date", "source", "created_at")}
+        )
+    else:
+        # No portable upsert: replace the days being summarized
+        if since:
+            conn.execute(delete(summary_table).where(summary_table.c.date >= since.date()))
+        stmt = insert(summary_table).from_select(columns, query)
+
+    return conn.execute(stmt).rowcount
+
+
+def apply_weather_retention(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Roll up and remove hourly weather data past its retention
+
+    Returns:
+        Summary of the run
+    """
+    now = now or datetime.utcnow()
+    cutoff = get_raw_retention_cutoff(now)
+    result: Dict[str, Any] = {
+        "cutoff": cutoff.isoformat() if cutoff else None,
+        "summaries": 0,
+        "created_partitions": [],
+        "dropped_partitions": [],
+        "deleted_rows": 0,
+        "deleted_payloads": 0,
+    }
+
+    with engine.begin() as conn:
+        partitioned = is_partitioned(conn)
+        if partitioned:
+            current_month = month_start(now)
+            result["created_partitions"] = ensure_partitions(conn, current_month, add_months(current_month, MONTHS_AHEAD))
+
+    if cutoff is None:
+        return result
+
+    # Rolled up and dropped together, so no day is lost between the two
+    with engine.begin() as conn:
+        result["summaries"] = rollup_weather_data(conn, cutoff)
+        if partitioned:
+            result["dropped_partitions"] = drop_partitions_before(conn, cutoff)
+            result["deleted_rows"] = conn.execute(
+                text(f"DELETE FROM {DEFAULT_PARTITION} WHERE timestamp < :cutoff"), {"cutoff": cutoff}
+            ).rowcount
+
+    if not partitioned:
+        # The rows are summarized already, delete them in batches to keep transactions short
+        table = WeatherData.__table__
+        while True:
+            with engine.begin() as conn:
+                batch = select(table.c.id).where(table.c.timestamp < cutoff).limit(DELETE_BATCH_SIZE).scalar_subquery()
+                deleted = conn.execute(delete(table).where(table.c.id.in_(batch))).rowcount
+            result["deleted_rows"] += deleted
+            if deleted < DELETE_BATCH_SIZE:
+                break
+
+    with engine.begin() as conn:
+        payload_table = WeatherPayload.__table__
+        result["deleted_payloads"] = conn.execute(
+            delete(payload_table).where(payload_table.c.end < cutoff)
+        ).rowcount
+
+    logger.info(
+        f"Weather data retention up to {cutoff}: {result['summaries']} daily summaries, "
+        f"{len(result['dropped_partitions'])} partitions dropped, {result['deleted_rows']} rows "
+        f"and {result['deleted_payloads']} payloads deleted"
+    )
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Starting weather data retention")
+    apply_weather_retention()
+    logger.info("Weather data retention finished")
@@ -11,7 +11,9 @@ from sqlalchemy.sql import text
 from app.core.config import settings
 from app.db.session import SessionLocal, engine
 from app.crud.beach import get_beaches
-from app.tasks.weather import fetch_and_store_weather_data
+from app.tasks.weather import fetch_and_store_weather_grid, refresh_all_current_conditions
+from app.tasks.retention import apply_weather_retention
+from app.services.stormglass import StormGlassService
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +23,12 @@ async def fetch_weather():
     async with asyncio.Lock():
         db = SessionLocal()
         try:
-            beaches = get_beaches(db, is_active=True)
-            tasks = []
-            for beach in beaches:
-                tasks.append(fetch_and_store_weather_data(db, beach.id))
-            if tasks:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                success_count = sum(1 for r in results if r is True)
+            beaches = get_beaches(db, limit=None, is_active=True)
+            # One service for the sweep, requests share the pooled HTTP client
+            stormglass_service = StormGlassService()
+            if beaches:
+                results = await fetch_and_store_weather_grid(db, beaches, stormglass_service)
+                success_count = sum(1 for r in results.values() if r is True)
                 error_count = len(results) - success_count
                 logger.info(f"Weather data fetch completed: {success_count} successful, {error_count} failed")
         finally:
@@ -114,6 +115,27 @@ class WeatherScheduler:
                 next_run_time=datetime.utcnow()
             )
             logger.info("Weather data fetch job scheduled successfully")
+
+            # Current conditions move on with the clock, not only with the sweep
+            self.scheduler.add_job(
+                refresh_all_current_conditions,
+                'cron',
+                minute=0,
+                id='refresh_current_conditions',
+                replace_existing=True
+            )
+            logger.info("Current conditions refresh job scheduled successfully")
+
+            # Roll up old hours and drop expired partitions once a day
+            self.scheduler.add_job(
+                apply_weather_retention,
+                'interval',
+                hours=24,
+                id='weather_data_retention',
+                replace_existing=True,
+                next_run_time=datetime.utcnow()
+            )
+            logger.info("Weather data retention job scheduled successfully")
         except Exception as e:
             logger.error(f"Failed to schedule tasks: {e}")
 
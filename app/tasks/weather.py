@@ -1,25 +1,358 @@
+import asyncio
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
-from app.services.stormglass import StormGlassService
-from app.services.suitability import SuitabilityService
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.beach import Beach
+from app.services.stormglass import StormGlassService, plan_fetch_range
+from app.services.suitability import (
+    ForecastHour, SuitabilityService, hours_to_notify, hours_to_store, parse_forecast, render_warnings
+)
 from app.services.notification import NotificationService
 from app.crud.beach import get_beach
-from app.crud.weather import get_latest_weather_data, create_weather_data
-from app.schemas.weather_data import WeatherDataCreate
+from app.crud.weather import (
+    create_weather_payload, get_forecast_horizons, get_stored_suitability_levels, refresh_current_conditions,
+    upsert_forecast_hours
+)
+from app.services.map_tiles import invalidate_tile_cache
 
 logger = logging.getLogger(__name__)
 
+# Bounded pool running the blocking database writes of the sweep
+_persistence_executor: Optional[ThreadPoolExecutor] = None
 
-async def fetch_and_store_weather_data(db: Session, beach_id: int) -> bool:
+
+def get_persistence_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used to persist forecasts, creating it on first use"""
+    global _persistence_executor
+    if _persistence_executor is None:
+        _persistence_executor = ThreadPoolExecutor(
+            max_workers=settings.WEATHER_PERSIST_WORKERS,
+            thread_name_prefix="weather-persist"
+        )
+    return _persistence_executor
+
+
+def shutdown_persistence_executor() -> None:
+    """Wait for pending forecast writes and stop the persistence pool"""
+    global _persistence_executor
+    if _persistence_executor is not None:
+        _persistence_executor.shutdown(wait=True)
+        _persistence_executor = None
+
+
+def group_beaches_by_cell(beaches: List[Beach], resolution_deg: float) -> Dict[Any, List[Beach]]:
+    """
+    Group beaches that share a forecast grid cell
+
+    Args:
+        beaches: Beaches to group
+        resolution_deg: Cell size in degrees, 0 puts every beach in its own cell
+
+    Returns:
+        Dictionary of beaches by cell key
+    """
+    cells: Dict[Any, List[Beach]] = {}
+    for beach in beaches:
+        if resolution_deg > 0:
+            key: Tuple[int, int] = (
+                math.floor(beach.latitude / resolution_deg),
+                math.floor(beach.longitude / resolution_deg)
+            )
+        else:
+            key = beach.id
+        cells.setdefault(key, []).append(beach)
+    return cells
+
+
+async def fetch_forecast(
+    stormglass_service: StormGlassService,
+    latitude: float,
+    longitude: float,
+    start: datetime,
+    end: datetime
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the forecast of a location from StormGlass API
+
+    Returns:
+        StormGlass response, or None if the request failed
+    """
+    stormglass_data = await stormglass_service.get_combined_data(
+        latitude=latitude,
+        longitude=longitude,
+        start=start,
+        end=end
+    )
+
+    # Check for errors
+    if "error" in stormglass_data.get("marine", {}):
+        logger.error(f"Error fetching marine data: {stormglass_data['marine']['message']}")
+        return None
+    return stormglass_data
+
+
+def store_forecast(
+    db: Session,
+    beach: Beach,
+    parsed_data: List[ForecastHour],
+    notification_service: NotificationService
+) -> int:
+    """
+    Store the parsed forecast of a beach and notify users of dangerous conditions
+
+    Users are only notified of warning and danger hours that are new or got
+    worse than the stored forecast (see hours_to_notify).
+
+    Returns:
+        int: Number of rows stored
+    """
+    stored_levels = get_stored_suitability_levels(db, beach.id, [hour.timestamp for hour in parsed_data])
+
+    # Save the batch in one transaction, overwriting forecast hours already stored
+    stored_count = upsert_forecast_hours(db, beach.id, parsed_data)
+    logger.info(f"Stored {stored_count} weather data rows for beach {beach.name}")
+
+    for hour in hours_to_notify(parsed_data, stored_levels):
+        # Check if we need to send notifications for dangerous conditions
+        if hour.warning_codes:
+            warning_msg = " ".join(render_warnings(
+                hour.warning_codes,
+                hour.wave_height,
+                hour.wind_speed,
+                hour.current_speed
+            ))
+            logger.info(f"Sending notifications for beach {beach.name}: {warning_msg}")
+            notification_service.notify_nearby_users(
+                db=db,
+                beach=beach,
+                warning_message=warning_msg,
+                condition_level=hour.suitability_level
+            )
+    return stored_count
+
+
+def store_forecast_in_session(
+    beach_id: int,
+    parsed_data: List[ForecastHour],
+    notification_service: NotificationService
+) -> int:
+    """
+    Store the parsed forecast of a beach using a session of its own
+
+    Runs in the persistence thread pool, so it must not share a session
+    with the event loop or with other writes.
+
+    Returns:
+        int: Number of rows stored
+    """
+    db = SessionLocal()
+    try:
+        beach = get_beach(db, id=beach_id)
+        if not beach:
+            raise ValueError(f"Beach with ID {beach_id} not found")
+        return store_forecast(db, beach, parsed_data, notification_service)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def store_payload_in_session(
+    data: Dict[str, Any],
+    latitude: float,
+    longitude: float,
+    start: datetime,
+    end: datetime
+) -> int:
+    """
+    Store a raw StormGlass response as a compressed payload, using a session of its own
+
+    Returns:
+        int: ID of the stored payload
+    """
+    db = SessionLocal()
+    try:
+        return create_weather_payload(db, data, latitude, longitude, start, end)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def fetch_and_store_cell(
+    beaches: List[Beach],
+    stormglass_service: StormGlassService,
+    suitability_service: SuitabilityService,
+    notification_service: NotificationService,
+    fetch_range: Tuple[datetime, datetime],
+    horizons: Optional[Dict[int, datetime]] = None,
+    now: Optional[datetime] = None
+) -> Dict[int, bool]:
+    """
+    Fetch one forecast for beaches sharing a grid cell and store it for each of them
+
+    The forecast is requested at the centroid of the beaches, so a cell with
+    a single beach is fetched at the beach's own location. Each beach only
+    gets the revision window and the hours past its stored horizon written
+    (see hours_to_store). Writes run in the persistence thread pool, so the
+    event loop keeps fetching other cells.
+
+    Args:
+        fetch_range: Forecast range to request, from plan_fetch_range
+        horizons: Last stored forecast hour by beach ID, beaches without stored data left out
+        now: Time the sweep was planned at (naive UTC), defaults to now
+
+    Returns:
+        Dictionary of success status by beach ID
+    """
+    results = {beach.id: False for beach in beaches}
+    names = ", ".join(beach.name for beach in beaches)
+    start, end = fetch_range
+    horizons = horizons or {}
+    now = now or datetime.utcnow()
+    try:
+        latitude = sum(beach.latitude for beach in beaches) / len(beaches)
+        longitude = sum(beach.longitude for beach in beaches) / len(beaches)
+
+        # Fetch data from StormGlass API
+        logger.info(f"Fetching weather data for beaches {names} from {start} to {end}")
+        stormglass_data = await fetch_forecast(stormglass_service, latitude, longitude, start, end)
+        if stormglass_data is None:
+            return results
+
+        # Parse and process data
+        loop = asyncio.get_running_loop()
+        if suitability_service.raw_storage == "blob":
+            # The raw response is written once while it is parsed, rows only reference it
+            payload_id, parsed_data = await asyncio.gather(
+                loop.run_in_executor(
+                    get_persistence_executor(), store_payload_in_session,
+                    stormglass_data["marine"], latitude, longitude, start, end
+                ),
+                parse_forecast(suitability_service, stormglass_data)
+            )
+            parsed_data = [hour._replace(payload_id=payload_id) for hour in parsed_data]
+        else:
+            parsed_data = await parse_forecast(suitability_service, stormglass_data)
+        if not parsed_data:
+            logger.error("No data parsed from StormGlass API response")
+            return results
+    except Exception as e:
+        logger.exception(f"Error fetching weather data for beaches {names}: {str(e)}")
+        return results
+
+    # Fan the forecast out to every beach of the cell
+    executor = get_persistence_executor()
+    outcomes = await asyncio.gather(*(
+        loop.run_in_executor(
+            executor, store_forecast_in_session, beach.id,
+            hours_to_store(parsed_data, horizons.get(beach.id), now), notification_service
+        )
+        for beach in beaches
+    ), return_exceptions=True)
+    for beach, outcome in zip(beaches, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error storing weather data for beach {beach.name}: {str(outcome)}", exc_info=outcome)
+        else:
+            results[beach.id] = True
+    return results
+
+
+async def fetch_and_store_weather_grid(
+    db: Session,
+    beaches: List[Beach],
+    stormglass_service: Optional[StormGlassService] = None
+) -> Dict[int, bool]:
+    """
+    Fetch and store weather data for many beaches, one request per grid cell
+
+    Beaches within the same STORMGLASS_GRID_RESOLUTION_DEG cell get the same
+    upstream forecast, so the number of API calls scales with the number of
+    occupied cells instead of the number of beaches. Only the hours missing
+    from the stored forecast (and the revision window) are requested.
+
+    Args:
+        db: Database session, only used to plan the sweep
+        beaches: Beaches to refresh
+        stormglass_service: Service shared across the sweep (a new one is created if omitted)
+
+    Returns:
+        Dictionary of success status by beach ID
+    """
+    stormglass_service = stormglass_service or StormGlassService()
+    suitability_service = SuitabilityService()
+    notification_service = NotificationService()
+
+    now = datetime.utcnow()
+    horizons = get_forecast_horizons(db, [beach.id for beach in beaches])
+
+    results = {beach.id: True for beach in beaches}
+    cells = group_beaches_by_cell(beaches, settings.STORMGLASS_GRID_RESOLUTION_DEG)
+
+    # A cell is planned from its least advanced beach, upserts make the overlap harmless
+    planned = []
+    up_to_date = []
+    for members in cells.values():
+        member_horizons = [horizons.get(beach.id) for beach in members]
+        horizon = None if None in member_horizons else min(member_horizons)
+        fetch_range = plan_fetch_range(horizon, now)
+        if fetch_range:
+            planned.append((members, fetch_range))
+        else:
+            logger.info(f"Stored forecast is up to date for beaches {', '.join(beach.name for beach in members)}")
+            up_to_date.extend(beach.id for beach in members)
+
+    # Beaches that are not fetched still move on to the forecast hour in effect now
+    if up_to_date:
+        refresh_current_conditions(db, up_to_date, now=now)
+        db.commit()
+    if not planned:
+        return results
+
+    logger.info(f"Fetching weather data for {sum(len(members) for members, _ in planned)} beaches in {len(planned)} grid cells")
+    cell_results = await asyncio.gather(*(
+        fetch_and_store_cell(
+            members, stormglass_service, suitability_service, notification_service, fetch_range,
+            horizons=horizons, now=now
+        )
+        for members, fetch_range in planned
+    ))
+    for cell_result in cell_results:
+        results.update(cell_result)
+
+    # Beaches of failed cells move on to the stored hour in effect now, or lose their stale row
+    failed = [beach_id for beach_id, success in results.items() if not success]
+    if failed:
+        refresh_current_conditions(db, failed, now=now)
+        db.commit()
+
+    # New conditions change the cluster levels shown on the map
+    invalidate_tile_cache()
+
+    return results
+
+
+async def fetch_and_store_weather_data(
+    db: Session,
+    beach_id: int,
+    stormglass_service: Optional[StormGlassService] = None
+) -> bool:
     """
     Fetch weather data from StormGlass API and store in database
-    
+
     Args:
         db: Database session
         beach_id: Beach ID
-        
+        stormglass_service: Service shared across a sweep (a new one is created if omitted)
+
     Returns:
         bool: Success status
     """
@@ -29,96 +362,41 @@ async def fetch_and_store_weather_data(db: Session, beach_id: int) -> bool:
         if not beach:
             logger.error(f"Beach with ID {beach_id} not found")
             return False
-        
-        # Initialize services
-        stormglass_service = StormGlassService()
-        suitability_service = SuitabilityService()
-        notification_service = NotificationService()
-        
-        # Get latest data to avoid duplication
-        latest_data = get_latest_weather_data(db, beach_id=beach_id)
-        start_time = datetime.utcnow()
-        if latest_data:
-            # If we have data less than 3 hours old, skip
-            if (start_time - latest_data.timestamp) < timedelta(hours=3):
-                logger.info(f"Recent data exists for beach {beach.name}, skipping fetch")
-                return True
-        
-        # Set time range for data fetch
-        end_time = start_time + timedelta(days=2)  # Forecast for 2 days
-        
-        # Fetch data from StormGlass API
-        logger.info(f"Fetching weather data for beach {beach.name}")
-        stormglass_data = await stormglass_service.get_combined_data(
-            latitude=beach.latitude,
-            longitude=beach.longitude,
-            start=start_time,
-            end=end_time
-        )
-        
-        # Check for errors
-        if "error" in stormglass_data.get("marine", {}):
-            logger.error(f"Error fetching marine data: {stormglass_data['marine']['message']}")
-            return False
-            
-        # Parse and process data
-        parsed_data = suitability_service.parse_stormglass_data(stormglass_data)
-        if not parsed_data:
-            logger.error("No data parsed from StormGlass API response")
-            return False
-        
-        # Store data in database
-        for data_point in parsed_data:
-            # Create weather data object
-            weather_data_in = WeatherDataCreate(
-                beach_id=beach_id,
-                timestamp=datetime.fromisoformat(data_point["timestamp"].replace("Z", "+00:00")),
-                source="stormglass",
-                # Wave data
-                wave_height=data_point.get("wave_height"),
-                wave_direction=data_point.get("wave_direction"),
-                wave_period=data_point.get("wave_period"),
-                # Swell data
-                swell_height=data_point.get("swell_height"),
-                swell_direction=data_point.get("swell_direction"),
-                swell_period=data_point.get("swell_period"),
-                # Wind data
-                wind_speed=data_point.get("wind_speed"),
-                wind_direction=data_point.get("wind_direction"),
-                wind_gust=data_point.get("wind_gust"),
-                # Temperature data
-                water_temperature=data_point.get("water_temperature"),
-                # Current data
-                current_speed=data_point.get("current_speed"),
-                current_direction=data_point.get("current_direction"),
-                # Marine bio data
-                chlorophyll=data_point.get("chlorophyll"),
-                salinity=data_point.get("salinity"),
-                ph=data_point.get("ph"),
-                oxygen=data_point.get("oxygen"),
-                # Additional data
-                additional_data=data_point.get("additional_data"),
-                # Suitability scores
-                safety_score=data_point.get("safety_score"),
-                suitability_level=data_point.get("suitability_level")
-            )
-            
-            # Save to database
-            weather_data = create_weather_data(db, obj_in=weather_data_in)
-            logger.info(f"Stored weather data for beach {beach.name} at {weather_data.timestamp}")
-            
-            # Check if we need to send notifications for dangerous conditions
-            if data_point.get("suitability_level") in ["warning", "danger"] and data_point.get("warnings"):
-                warning_msg = " ".join(data_point.get("warnings", []))
-                logger.info(f"Sending notifications for beach {beach.name}: {warning_msg}")
-                notification_service.notify_nearby_users(
-                    db=db,
-                    beach=beach,
-                    warning_message=warning_msg,
-                    condition_level=data_point.get("suitability_level")
-                )
-        
-        return True
+
+        results = await fetch_and_store_weather_grid(db, [beach], stormglass_service)
+        return results[beach.id]
     except Exception as e:
         logger.exception(f"Error in fetch_and_store_weather_data: {str(e)}")
-        return False 
\ No newline at end of file
+        return False
+
+
+def refresh_all_current_conditions() -> None:
+    """
+    Move the current conditions of all beaches on to the forecast hour in effect
+
+    Scheduled at the start of every hour, so conditions reads stay on the
+    current conditions table between sweeps and when a sweep is late.
+    """
+    db = SessionLocal()
+    try:
+        refresh_current_conditions(db, [beach_id for beach_id, in db.query(Beach.id).all()])
+        db.commit()
+        invalidate_tile_cache()
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"Error refreshing current conditions: {str(e)}")
+    finally:
+        db.close()
+
+
+async def fetch_and_store_weather_data_task(beach_id: int) -> bool:
+    """
+    Fetch and store weather data for a beach with a session of its own
+
+    Used for background tasks, which outlive the request-scoped session.
+    """
+    db = SessionLocal()
+    try:
+        return await fetch_and_store_weather_data(db, beach_id)
+    finally:
+        db.close()
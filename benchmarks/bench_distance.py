@@ -0,0 +1,64 @@
+"""
+Benchmark one-to-many distance calculation.
+
+Compares the per-pair geopy geodesic() loop with the vectorized haversine
+pass and the haversine + ellipsoidal refinement pass used by the nearby
+beach search and the safety alert fan-out.
+
+To run this benchmark:
+python -m benchmarks.bench_distance
+"""
+
+import random
+import time
+
+from geopy.distance import geodesic
+
+from app.services.distance import PointSet
+
+SIZES = [1_000, 10_000, 100_000]
+RADIUS_KM = 50.0
+ORIGIN = (15.5, 73.8)
+
+
+def _timed(func, repeat: int = 1) -> float:
+    """Return the best wall-clock time of func() in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_benchmark() -> None:
+    random.seed(42)
+    print(f"{'points':>8} {'geopy loop':>12} {'haversine':>12} {'refined':>12} {'speedup':>9}")
+
+    for size in SIZES:
+        # Points scattered along the Indian coastline bounding box
+        rows = [(i, random.uniform(8.0, 23.0), random.uniform(68.0, 88.0)) for i in range(size)]
+        points = PointSet.from_rows(rows)
+
+        def geopy_loop():
+            return [
+                beach_id for beach_id, lat, lng in rows
+                if geodesic(ORIGIN, (lat, lng)).kilometers <= RADIUS_KM
+            ]
+
+        expected = set(geopy_loop())
+        refined_ids, _ = points.within(*ORIGIN, RADIUS_KM, refine=True)
+        assert set(refined_ids.tolist()) == expected, "refined results differ from geopy"
+
+        geopy_ms = _timed(geopy_loop)
+        haversine_ms = _timed(lambda: points.within(*ORIGIN, RADIUS_KM, refine=False), repeat=5)
+        refined_ms = _timed(lambda: points.within(*ORIGIN, RADIUS_KM, refine=True), repeat=5)
+
+        print(
+            f"{size:>8} {geopy_ms:>10.2f}ms {haversine_ms:>10.2f}ms "
+            f"{refined_ms:>10.2f}ms {geopy_ms / refined_ms:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
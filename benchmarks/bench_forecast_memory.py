@@ -0,0 +1,101 @@
+"""
+Benchmark the memory held by a weather sweep of 1,000 beaches.
+
+A sweep keeps the parsed forecast of every cell in memory until it is
+written. This compares holding the hours as one dict per hour with the
+ForecastHour tuples returned by parse_stormglass_data, and building the
+insert rows through a WeatherDataCreate model per hour with building them
+straight from the tuples. Memory is measured with tracemalloc; the raw
+payloads are allocated before tracing starts, so only the parsed
+representation is counted.
+
+To run this benchmark:
+python -m benchmarks.bench_forecast_memory
+"""
+
+import gc
+import logging
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Tuple
+
+from app.schemas.weather_data import WeatherDataCreate
+from app.services.stormglass import StormGlassService
+from app.services.suitability import FORECAST_HOUR_COLUMNS, SuitabilityService, forecast_hour_rows
+
+BEACHES = 1_000
+FORECAST_HOURS = 48
+
+
+def measure(build: Callable[[], Any]) -> Tuple[Any, float, int, int]:
+    """Run build under tracemalloc, returning its result, seconds, retained and peak bytes"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, current, peak
+
+
+def run_benchmark() -> None:
+    # Mock data is logged as a warning for every request
+    logging.getLogger("app.services.stormglass").setLevel(logging.ERROR)
+    stormglass_service = StormGlassService()
+    service = SuitabilityService()
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    payloads = [
+        stormglass_service._generate_mock_marine_data(start, start + timedelta(hours=FORECAST_HOURS))
+        for _ in range(BEACHES)
+    ]
+
+    def parse_dicts():
+        return [[hour._asdict() for hour in service.parse_stormglass_data(payload)] for payload in payloads]
+
+    def parse_tuples():
+        return [service.parse_stormglass_data(payload) for payload in payloads]
+
+    dicts, dict_seconds, dict_current, dict_peak = measure(parse_dicts)
+    hours = sum(len(forecast) for forecast in dicts)
+    del dicts
+    forecasts, tuple_seconds, tuple_current, tuple_peak = measure(parse_tuples)
+
+    # Rows are built one beach at a time, as the persistence workers do
+    def rows_via_models():
+        count = 0
+        for beach_id, forecast in enumerate(forecasts, start=1):
+            objs_in = [
+                WeatherDataCreate(
+                    beach_id=beach_id,
+                    source="stormglass",
+                    **{column: getattr(hour, column) for column in FORECAST_HOUR_COLUMNS}
+                )
+                for hour in forecast
+            ]
+            count += len([obj_in.model_dump() for obj_in in objs_in])
+        return count
+
+    def rows_via_tuples():
+        count = 0
+        for beach_id, forecast in enumerate(forecasts, start=1):
+            count += len(forecast_hour_rows(beach_id, forecast))
+        return count
+
+    _, model_seconds, _, model_peak = measure(rows_via_models)
+    _, row_seconds, _, row_peak = measure(rows_via_tuples)
+
+    print(f"{BEACHES:,} beaches, {hours:,} forecast hours")
+    print(f"{'parsed forecasts':<28} {'retained':>10} {'peak':>10} {'time':>10}")
+    print(f"{'dict per hour':<28} {dict_current / 2**20:>8.1f}MB {dict_peak / 2**20:>8.1f}MB "
+          f"{dict_seconds * 1000:>8.0f}ms")
+    print(f"{'ForecastHour':<28} {tuple_current / 2**20:>8.1f}MB {tuple_peak / 2**20:>8.1f}MB "
+          f"{tuple_seconds * 1000:>8.0f}ms")
+    print(f"{'insert rows':<28} {'':>10} {'peak':>10} {'time':>10}")
+    print(f"{'WeatherDataCreate per hour':<28} {'':>10} {model_peak / 2**20:>8.1f}MB {model_seconds * 1000:>8.0f}ms")
+    print(f"{'forecast_hour_rows':<28} {'':>10} {row_peak / 2**20:>8.1f}MB {row_seconds * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
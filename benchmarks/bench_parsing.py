@@ -0,0 +1,88 @@
+"""
+Benchmark parsing StormGlass payloads on the event loop and in worker processes.
+
+Parses a batch of ten-day forecasts the way the weather sweep does, once inline
+and once through the WEATHER_PARSE_PROCESSES pool, while a ticker coroutine
+measures how long the event loop is blocked between ticks.
+
+To run this benchmark:
+python -m benchmarks.bench_parsing
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+from app.services.stormglass import StormGlassService
+from app.services.suitability import (
+    SuitabilityService, get_parse_executor, parse_forecast, parse_payload_records, shutdown_parse_executor
+)
+
+PAYLOADS = 200
+FORECAST_DAYS = 10
+PROCESSES = min(os.cpu_count() or 1, 4)
+TICK_SECONDS = 0.005
+
+
+def build_payloads() -> List[Dict[str, Any]]:
+    # Mock data is logged as a warning for every request
+    logging.getLogger("app.services.stormglass").setLevel(logging.ERROR)
+    service = StormGlassService()
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return [
+        service._generate_mock_marine_data(start, start + timedelta(days=FORECAST_DAYS))
+        for _ in range(PAYLOADS)
+    ]
+
+
+async def parse_all(payloads: List[Dict[str, Any]]) -> Tuple[float, float, int]:
+    """Parse all payloads concurrently, returning the wall time, worst loop lag and hour count"""
+    suitability_service = SuitabilityService()
+    max_lag = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal max_lag
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            max_lag = max(max_lag, time.perf_counter() - before - TICK_SECONDS)
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(parse_forecast(suitability_service, payload) for payload in payloads))
+    elapsed = time.perf_counter() - start
+    done = True
+    await tick_task
+    return elapsed, max_lag, sum(len(result) for result in results)
+
+
+def run_benchmark() -> None:
+    payloads = build_payloads()
+
+    settings.WEATHER_PARSE_PROCESSES = 0
+    inline_seconds, inline_lag, hours = asyncio.run(parse_all(payloads))
+
+    settings.WEATHER_PARSE_PROCESSES = PROCESSES
+    # Start and import the workers up front so process spawning is not timed
+    executor = get_parse_executor()
+    list(executor.map(parse_payload_records, payloads[:PROCESSES * 2]))
+    try:
+        pool_seconds, pool_lag, pool_hours = asyncio.run(parse_all(payloads))
+    finally:
+        shutdown_parse_executor()
+    assert pool_hours == hours, "process pool parsed a different number of hours"
+
+    print(f"{PAYLOADS} payloads, {hours:,} forecast hours, {os.cpu_count()} CPUs")
+    print(f"{'':<24} {'wall time':>12} {'max loop lag':>14}")
+    print(f"{'inline':<24} {inline_seconds * 1000:>10.1f}ms {inline_lag * 1000:>12.1f}ms")
+    print(f"{f'{PROCESSES} worker processes':<24} {pool_seconds * 1000:>10.1f}ms {pool_lag * 1000:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
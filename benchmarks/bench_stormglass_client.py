@@ -0,0 +1,161 @@
+"""
+Benchmark StormGlass requests over a fresh client per request vs the shared pooled client.
+
+A local stub server answers /weather/point with a 48 hour payload. A sweep
+over 500 beaches is run sequentially (per-request latency) and concurrently
+(total sweep time). The stub is plain HTTP on localhost, so only the TCP
+handshake is saved here; against the real API each new connection also pays
+a DNS lookup and a TLS handshake.
+
+To run this benchmark:
+python -m benchmarks.bench_stormglass_client
+"""
+
+import asyncio
+import logging
+import socket
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import uvicorn
+
+from app.core.config import settings
+from app.services.http_client import create_http_client
+from app.services.rate_limiter import RateLimiter
+from app.services.stormglass import StormGlassService
+
+BEACHES = 500
+CONCURRENCY = 20
+HOURS = 48
+
+
+def _stub_payload() -> bytes:
+    """Build a StormGlass-like response body"""
+    start = datetime(2024, 1, 1)
+    hours = [
+        '{"time": "%s", "waveHeight": {"sg": 1.2}, "windSpeed": {"sg": 5.4}}'
+        % (start + timedelta(hours=i)).isoformat()
+        for i in range(HOURS)
+    ]
+    return ('{"hours": [%s], "meta": {}}' % ", ".join(hours)).encode()
+
+
+PAYLOAD = _stub_payload()
+
+
+async def stub_app(scope, receive, send):
+    """Minimal ASGI app standing in for the StormGlass API"""
+    if scope["type"] != "http":
+        return
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({"type": "http.response.body", "body": PAYLOAD})
+
+
+def _start_stub_server() -> str:
+    """Start the stub server in a background thread and return its base URL"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+# The shared StormGlass limiter would throttle the sweep to its token rate,
+# so the benchmark runs without rate, concurrency or quota limits
+UNLIMITED = RateLimiter("benchmark", max_concurrency=BEACHES, rate_per_second=1e9, burst=BEACHES, daily_quota=0)
+
+
+def _latitude(beach: int) -> float:
+    """Latitude of a beach, one cache cell (STORMGLASS_CACHE_COORD_PRECISION) apart from the next"""
+    return 10.0 + beach / 10 ** settings.STORMGLASS_CACHE_COORD_PRECISION
+
+
+def _service(base_url: str, client: httpx.AsyncClient) -> StormGlassService:
+    """Create a service that talks to the stub server"""
+    service = StormGlassService(client=client, limiter=UNLIMITED)
+    service.api_key = "benchmark"
+    service.headers = {"Authorization": service.api_key}
+    service.base_url = base_url
+    service.use_mock = False
+    return service
+
+
+async def _fetch_fresh_client(base_url: str, beach: int, start: datetime) -> float:
+    """Previous behaviour: a new client (and connection) for every request"""
+    began = time.perf_counter()
+    async with httpx.AsyncClient() as client:
+        await _service(base_url, client).get_marine_data(_latitude(beach), 73.0, start)
+    return time.perf_counter() - began
+
+
+async def _fetch_shared_client(service: StormGlassService, beach: int, start: datetime) -> float:
+    """Current behaviour: requests reuse pooled keep-alive connections"""
+    began = time.perf_counter()
+    await service.get_marine_data(_latitude(beach), 73.0, start)
+    return time.perf_counter() - began
+
+
+async def _sweep(fetch, concurrent: bool):
+    """Run one request per beach, returning (per-request latencies, total seconds)"""
+    began = time.perf_counter()
+    if concurrent:
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def limited(beach):
+            async with semaphore:
+                return await fetch(beach)
+
+        latencies = await asyncio.gather(*(limited(beach) for beach in range(BEACHES)))
+    else:
+        latencies = [await fetch(beach) for beach in range(BEACHES)]
+    return latencies, time.perf_counter() - began
+
+
+def _report(label: str, latencies, total: float) -> None:
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    p95 = latencies_ms[int(len(latencies_ms) * 0.95) - 1]
+    print(f"{label:<28} {statistics.mean(latencies_ms):>8.2f}ms {p95:>8.2f}ms {total:>8.2f}s")
+
+
+async def run_benchmark() -> None:
+    # Services are created per request in the fresh-client runs, silence their mock-data warning
+    logging.getLogger("app.services.stormglass").setLevel(logging.ERROR)
+    base_url = _start_stub_server()
+    print(f"{BEACHES} beaches against {base_url}")
+    print(f"{'':<28} {'mean':>10} {'p95':>10} {'total':>9}")
+
+    # Every beach has its own cache key and every run its own start time,
+    # so the response cache never answers
+    run = 0
+    for concurrent in (False, True):
+        mode = f"concurrent x{CONCURRENCY}" if concurrent else "sequential"
+
+        run += 1
+        start = datetime(2024, 1, 1) + timedelta(days=run)
+        latencies, total = await _sweep(lambda beach: _fetch_fresh_client(base_url, beach, start), concurrent)
+        _report(f"fresh client, {mode}", latencies, total)
+
+        run += 1
+        start = datetime(2024, 1, 1) + timedelta(days=run)
+        client = create_http_client()
+        service = _service(base_url, client)
+        try:
+            latencies, total = await _sweep(lambda beach: _fetch_shared_client(service, beach, start), concurrent)
+        finally:
+            await client.aclose()
+        _report(f"shared client, {mode}", latencies, total)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
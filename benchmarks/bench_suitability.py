@@ -0,0 +1,69 @@
+"""
+Benchmark safety scoring of forecast hours.
+
+Compares the per-hour calculate_safety_score() call with the columnar
+score_batch() pass used by parse_stormglass_data and the re-scoring job,
+and measures rendering the warnings of the hours that need a notification.
+
+To run this benchmark:
+python -m benchmarks.bench_suitability
+"""
+
+import time
+
+import numpy as np
+
+from app.services.suitability import SuitabilityService
+
+HOURS = 1_000_000
+LOOP_SAMPLE = 100_000
+
+
+def run_benchmark() -> None:
+    service = SuitabilityService()
+    rng = np.random.default_rng(42)
+
+    wave_heights = rng.uniform(0.0, 4.0, HOURS)
+    wind_speeds = rng.uniform(0.0, 25.0, HOURS)
+    current_speeds = rng.uniform(0.0, 2.0, HOURS)
+    # Some hours miss a value, as in real StormGlass responses
+    wave_heights[rng.random(HOURS) < 0.05] = np.nan
+    current_speeds[rng.random(HOURS) < 0.2] = np.nan
+
+    # The per-hour loop is timed on a sample and scaled up
+    hours = [
+        {
+            "wave_height": None if np.isnan(wave) else float(wave),
+            "wind_speed": float(wind),
+            "current_speed": None if np.isnan(current) else float(current),
+        }
+        for wave, wind, current in zip(
+            wave_heights[:LOOP_SAMPLE], wind_speeds[:LOOP_SAMPLE], current_speeds[:LOOP_SAMPLE]
+        )
+    ]
+    start = time.perf_counter()
+    expected = [service.calculate_safety_score(hour) for hour in hours]
+    loop_seconds = (time.perf_counter() - start) * HOURS / LOOP_SAMPLE
+
+    start = time.perf_counter()
+    result = service.score_batch(wave_heights, wind_speeds, current_speeds)
+    batch_seconds = time.perf_counter() - start
+
+    sample = result.scores[:LOOP_SAMPLE].tolist()
+    assert sample == [score for score, _, _ in expected], "batch scores differ from calculate_safety_score"
+
+    start = time.perf_counter()
+    alerts = np.flatnonzero(result.level_codes[:LOOP_SAMPLE] >= 1)
+    for index in alerts:
+        result.warnings(int(index))
+    render_seconds = (time.perf_counter() - start) * HOURS / LOOP_SAMPLE
+
+    print(f"{HOURS:,} forecast hours")
+    print(f"{'per-hour loop (scaled)':<32} {loop_seconds * 1000:>10.1f}ms")
+    print(f"{'score_batch':<32} {batch_seconds * 1000:>10.1f}ms  {loop_seconds / batch_seconds:>6.0f}x")
+    print(f"{'render alert warnings (scaled)':<32} {render_seconds * 1000:>10.1f}ms  "
+          f"({len(alerts) / LOOP_SAMPLE:.0%} of hours are warning or danger)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
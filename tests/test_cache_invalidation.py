@@ -0,0 +1,169 @@
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.db import redis as cache
+from app.db.memory_cache import MemoryCache
+
+CHANNEL = "test_cache_invalidation"
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def l1():
+    return MemoryCache(max_entries=100, max_bytes=10000)
+
+
+@pytest.fixture
+def listener(l1):
+    return cache.CacheInvalidationListener(l1, CHANNEL, retry_interval=0.1)
+
+
+def _message(key: str, origin: str = "another-process") -> str:
+    return json.dumps({"origin": origin, "key": key})
+
+
+def test_invalidation_drops_the_key(l1, listener):
+    l1.set("a", 1, ttl=60)
+    l1.set("b", 2, ttl=60)
+
+    listener._invalidate(_message("a"))
+    assert l1.get("a") is None
+    assert l1.get("b") == 2
+    assert listener.generation == 1
+    assert listener.stats["received"] == 1
+
+
+def test_own_invalidations_are_skipped(l1, listener):
+    l1.set("a", 1, ttl=60)
+
+    listener._invalidate(_message("a", origin=cache.PROCESS_ID))
+    assert l1.get("a") == 1
+    assert listener.generation == 0
+
+
+def test_malformed_invalidation_is_ignored(l1, listener):
+    l1.set("a", 1, ttl=60)
+
+    listener._invalidate("not json")
+    assert l1.get("a") == 1
+
+
+@pytest.fixture
+def redis_cache(monkeypatch, l1, listener):
+    """Point the cache module at a fake Redis server, with L1 and its listener"""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    monkeypatch.setattr(cache, "redis_client", client)
+    monkeypatch.setattr(cache, "use_redis", True)
+    monkeypatch.setattr(cache, "l1_cache", l1)
+    monkeypatch.setattr(cache, "invalidation_listener", listener)
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_CHANNEL", CHANNEL)
+    monkeypatch.setattr(settings, "L1_CACHE_TTL", 60.0)
+    yield client
+    listener.stop()
+
+
+def test_l1_is_bypassed_until_subscribed(redis_cache, l1):
+    cache.set_cache("a", {"value": 1})
+
+    assert cache.get_cache("a") == {"value": 1}
+    assert len(l1) == 0
+
+
+def test_reads_are_kept_in_l1_while_subscribed(redis_cache, l1, listener):
+    listener.start()
+    assert _wait_for(lambda: listener.subscribed)
+    cache.set_cache("a", {"value": 1})
+
+    assert cache.get_cache("a") == {"value": 1}
+    assert l1.get("a") == {"value": 1}
+
+
+def test_large_values_are_not_kept_in_l1(redis_cache, l1, listener, monkeypatch):
+    monkeypatch.setattr(settings, "L1_CACHE_MAX_VALUE_BYTES", 10)
+    listener.start()
+    assert _wait_for(lambda: listener.subscribed)
+    cache.set_cache("a", "x" * 20)
+
+    assert cache.get_cache("a") == "x" * 20
+    assert len(l1) == 0
+
+
+def test_change_by_another_process_invalidates_l1(redis_cache, l1, listener):
+    listener.start()
+    assert _wait_for(lambda: listener.subscribed)
+    cache.set_cache("a", 1)
+    assert cache.get_cache("a") == 1
+
+    # Another process writes the key and publishes it
+    redis_cache.set("a", json.dumps(2))
+    redis_cache.publish(CHANNEL, _message("a"))
+
+    assert _wait_for(lambda: l1.get("a") is None)
+    assert cache.get_cache("a") == 2
+
+
+def test_own_writes_and_deletes_drop_the_l1_copy(redis_cache, l1, listener):
+    listener.start()
+    assert _wait_for(lambda: listener.subscribed)
+    cache.set_cache("a", 1)
+    cache.get_cache("a")
+
+    cache.set_cache("a", 2)
+    assert l1.get("a") is None
+    assert cache.get_cache("a") == 2
+
+    cache.delete_cache("a")
+    assert l1.get("a") is None
+    assert cache.get_cache("a") is None
+
+
+def test_own_write_rejects_a_read_in_flight(redis_cache, l1, listener, monkeypatch):
+    listener.start()
+    assert _wait_for(lambda: listener.subscribed)
+    cache.set_cache("a", 1)
+    read = redis_cache.get
+
+    def read_then_write(key):
+        # The old value is read, then this process writes before it is put in L1
+        value = read(key)
+        cache.set_cache("a", 2)
+        return value
+
+    monkeypatch.setattr(redis_cache, "get", read_then_write)
+    assert cache.get_cache("a") == 1
+    assert l1.get("a") is None
+
+
+def test_own_delete_rejects_a_read_in_flight(redis_cache, l1, listener, monkeypatch):
+    listener.start()
+    assert _wait_for(lambda: listener.subscribed)
+    cache.set_cache("a", 1)
+    read = redis_cache.get
+
+    def read_then_delete(key):
+        value = read(key)
+        cache.delete_cache("a")
+        return value
+
+    monkeypatch.setattr(redis_cache, "get", read_then_delete)
+    cache.get_cache("a")
+    assert l1.get("a") is None
+
+
+def test_subscribing_clears_entries_cached_before(redis_cache, l1, listener):
+    l1.set("a", 1, ttl=60)
+
+    listener.start()
+    assert _wait_for(lambda: listener.subscribed)
+    assert len(l1) == 0
+    assert listener.stats["subscriptions"] == 1
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+# Models and crud connect to the database when imported, so they are imported
+# in the tests, after the db fixture skipped them if it is not reachable
+
+NOW = datetime(2024, 6, 1, 12, 30)
+HOUR = NOW.replace(minute=0)
+
+
+def _store_hour(db, beach, timestamp, level="safe", wave_height=0.5):
+    from app.models.weather_data import WeatherData
+
+    db.add(WeatherData(
+        beach_id=beach.id, timestamp=timestamp, source="stormglass",
+        wave_height=wave_height, suitability_level=level, safety_score=100
+    ))
+    db.flush()
+
+
+def _store_current(db, beach, timestamp, level="safe"):
+    from app.models.beach_current_conditions import BeachCurrentConditions
+
+    db.add(BeachCurrentConditions(
+        beach_id=beach.id, timestamp=timestamp, source="stormglass", suitability_level=level, safety_score=100
+    ))
+    db.flush()
+
+
+def test_refresh_copies_hour_in_effect(db, beach):
+    from app.crud.weather import get_beaches_conditions, refresh_current_conditions
+
+    _store_hour(db, beach, HOUR - timedelta(hours=1), "safe")
+    _store_hour(db, beach, HOUR, "warning")
+    _store_hour(db, beach, HOUR + timedelta(hours=1), "danger")
+    refresh_current_conditions(db, [beach.id], now=NOW)
+
+    conditions = get_beaches_conditions(db, [beach.id], now=NOW)[beach.id]
+    assert conditions.timestamp == HOUR
+    assert conditions.suitability_level == "warning"
+
+
+def test_stale_current_row_falls_back_to_hour_in_effect(db, beach):
+    from app.crud.weather import get_beaches_conditions, get_latest_suitability_levels
+
+    _store_current(db, beach, HOUR - timedelta(days=2), "danger")
+    _store_hour(db, beach, HOUR - timedelta(hours=2), "warning")
+
+    assert get_beaches_conditions(db, [beach.id], now=NOW)[beach.id].timestamp == HOUR - timedelta(hours=2)
+    assert get_latest_suitability_levels(db, [beach.id], now=NOW) == {beach.id: "warning"}
+
+
+def test_current_row_of_an_earlier_hour_falls_back_to_later_hour(db, beach):
+    from app.crud.weather import get_beaches_conditions, get_latest_suitability_levels
+
+    # The sweep refreshed the row at 11:xx and has not run since the hour changed
+    _store_current(db, beach, HOUR - timedelta(hours=1), "safe")
+    _store_hour(db, beach, HOUR - timedelta(hours=1), "safe")
+    _store_hour(db, beach, HOUR, "danger")
+
+    assert get_beaches_conditions(db, [beach.id], now=NOW)[beach.id].timestamp == HOUR
+    assert get_latest_suitability_levels(db, [beach.id], now=NOW) == {beach.id: "danger"}
+
+
+def test_hour_in_effect_older_than_current_hour_is_served(db, beach):
+    from app.crud.weather import get_beaches_conditions
+
+    # No newer hour stored, the row is still right but read through the fallback
+    _store_current(db, beach, HOUR - timedelta(hours=3), "warning")
+    _store_hour(db, beach, HOUR - timedelta(hours=3), "warning")
+
+    assert get_beaches_conditions(db, [beach.id], now=NOW)[beach.id].suitability_level == "warning"
+
+
+def test_beach_without_hour_in_effect_has_no_conditions(db, beach):
+    from app.crud.weather import get_beaches_conditions, get_latest_suitability_levels
+
+    _store_current(db, beach, HOUR - timedelta(days=2), "danger")
+    _store_hour(db, beach, HOUR - timedelta(days=2), "danger")
+    # Future hours are not in effect yet
+    _store_hour(db, beach, HOUR + timedelta(hours=1), "safe")
+
+    assert get_beaches_conditions(db, [beach.id], now=NOW) == {}
+    assert get_latest_suitability_levels(db, [beach.id], now=NOW) == {}
+
+
+def test_refresh_deletes_row_without_hour_in_effect(db, beach):
+    from app.crud.weather import refresh_current_conditions
+    from app.models.beach_current_conditions import BeachCurrentConditions
+
+    _store_current(db, beach, HOUR - timedelta(days=2), "danger")
+    refresh_current_conditions(db, [beach.id], now=NOW)
+
+    assert db.get(BeachCurrentConditions, beach.id) is None
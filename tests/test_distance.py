@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pytest
+from geopy.distance import geodesic
+
+from app.services.distance import ELLIPSOID_MARGIN, PointSet, ellipsoid_km, haversine_km
+
+ORIGINS = [(-33.9, 151.3), (0.0, 0.0), (0.0, 179.95), (89.9, 10.0), (-45.0, -170.0)]
+
+
+def _random_points(rng: random.Random, count: int = 200):
+    latitudes = np.array([rng.uniform(-90.0, 90.0) for _ in range(count)])
+    longitudes = np.array([rng.uniform(-180.0, 180.0) for _ in range(count)])
+    return latitudes, longitudes
+
+
+def _geodesic_km(origin, latitudes, longitudes) -> np.ndarray:
+    return np.array([geodesic(origin, (lat, lng)).kilometers for lat, lng in zip(latitudes, longitudes)])
+
+
+@pytest.mark.parametrize("origin", ORIGINS)
+def test_ellipsoid_km_matches_geopy_geodesic(origin):
+    latitudes, longitudes = _random_points(random.Random(hash(origin)))
+    # Same point, a point on the equator and a nearly antipodal point
+    latitudes = np.append(latitudes, [origin[0], 0.0, -origin[0] + 0.01])
+    longitudes = np.append(longitudes, [origin[1], origin[1] + 1.0, (origin[1] + 360.0) % 360.0 - 180.0])
+
+    distances = ellipsoid_km(*origin, latitudes, longitudes)
+    np.testing.assert_allclose(distances, _geodesic_km(origin, latitudes, longitudes), rtol=0, atol=1e-3)
+
+
+def test_ellipsoid_km_of_no_points_is_empty():
+    assert ellipsoid_km(0.0, 0.0, np.array([]), np.array([])).shape == (0,)
+
+
+@pytest.mark.parametrize("origin", ORIGINS)
+def test_haversine_stays_within_the_ellipsoid_margin(origin):
+    latitudes, longitudes = _random_points(random.Random(hash(origin)))
+    exact = _geodesic_km(origin, latitudes, longitudes)
+
+    approximate = haversine_km(*origin, latitudes, longitudes)
+    assert np.all(approximate <= exact * ELLIPSOID_MARGIN + 1e-9)
+    assert np.all(exact <= approximate * ELLIPSOID_MARGIN + 1e-9)
+
+
+@pytest.mark.parametrize("origin", ORIGINS)
+def test_within_matches_a_brute_force_geodesic_check(origin):
+    rng = random.Random(hash(origin))
+    latitudes, longitudes = _random_points(rng)
+    points = PointSet(range(len(latitudes)), latitudes, longitudes)
+    exact = _geodesic_km(origin, latitudes, longitudes)
+    radii = np.array([rng.uniform(100.0, 8000.0) for _ in range(len(points))])
+
+    ids, distances = points.within(*origin, 5000.0)
+    assert set(ids.tolist()) == set(np.flatnonzero(exact <= 5000.0).tolist())
+    np.testing.assert_allclose(distances, exact[ids], atol=1e-3)
+
+    ids, _ = points.within(*origin, radii)
+    assert set(ids.tolist()) == set(np.flatnonzero(exact <= radii).tolist())
+
+
+def test_nearest_within_sorts_and_limits():
+    points = PointSet.from_rows([(1, 0.0, 0.3), (2, 0.0, 0.1), (3, 0.0, 0.2), (4, 0.0, 5.0)])
+
+    ids, distances = points.nearest_within(0.0, 0.0, 50.0, limit=2)
+    assert ids.tolist() == [2, 3]
+    assert distances[0] < distances[1]
+
+
+def test_empty_point_set_finds_nothing():
+    ids, distances = PointSet.from_rows([]).within(0.0, 0.0, 100.0)
+    assert len(ids) == 0 and len(distances) == 0
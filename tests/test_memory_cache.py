@@ -0,0 +1,151 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import memory_cache
+from app.db.memory_cache import MemoryCache
+
+
+class Clock:
+    """Monotonic clock moved by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(memory_cache, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = MemoryCache(max_entries=2, max_bytes=1000)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats["evictions"] == 1
+
+
+def test_entries_are_evicted_to_fit_the_size_limit(clock):
+    value = "x" * 10
+    size = len(json.dumps(value))
+    cache = MemoryCache(max_entries=100, max_bytes=3 * size)
+    for key in "abcd":
+        cache.set(key, value, ttl=60)
+
+    assert len(cache) == 3
+    assert cache.get("a") is None
+    assert cache.get_stats()["bytes"] == 3 * size
+
+
+def test_overwriting_an_entry_replaces_its_size(clock):
+    cache = MemoryCache(max_entries=10, max_bytes=1000)
+    cache.set("a", "short", ttl=60)
+    cache.set("a", "a longer value", ttl=60)
+
+    assert len(cache) == 1
+    assert cache.get_stats()["bytes"] == len(json.dumps("a longer value"))
+
+
+def test_value_larger_than_the_limit_is_rejected(clock):
+    cache = MemoryCache(max_entries=10, max_bytes=10)
+    cache.set("small", 1, ttl=60)
+
+    assert cache.set("big", "x" * 20, ttl=60) is False
+    assert cache.get("big") is None
+    # Nothing was evicted to make room for it
+    assert cache.get("small") == 1
+    assert cache.stats["rejected"] == 1
+
+
+def test_given_size_is_used_instead_of_serializing(clock):
+    cache = MemoryCache(max_entries=10, max_bytes=100)
+
+    assert cache.set("a", "tiny", ttl=60, size=101) is False
+    assert cache.set("b", "tiny", ttl=60, size=60) is True
+    assert cache.get_stats()["bytes"] == 60
+
+
+def test_expired_entry_is_a_miss(clock):
+    cache = MemoryCache(max_entries=10, max_bytes=1000)
+    cache.set("a", 1, ttl=60)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats["expirations"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_sweep_removes_only_expired_entries(clock):
+    cache = MemoryCache(max_entries=10, max_bytes=1000)
+    cache.set("short", 1, ttl=10)
+    cache.set("long", 2, ttl=100)
+
+    clock.now += 50
+    assert cache.sweep() == 1
+    assert cache.get("long") == 2
+    assert len(cache) == 1
+
+
+def test_sweep_skips_entries_overwritten_with_a_later_expiry(clock):
+    cache = MemoryCache(max_entries=10, max_bytes=1000)
+    cache.set("a", 1, ttl=10)
+    cache.set("a", 2, ttl=100)
+
+    clock.now += 50
+    assert cache.sweep() == 0
+    assert cache.get("a") == 2
+
+
+def test_delete_and_clear(clock):
+    cache = MemoryCache(max_entries=10, max_bytes=1000)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_stats_hit_ratio(clock):
+    cache = MemoryCache(max_entries=10, max_bytes=1000)
+    assert cache.get_stats()["hit_ratio"] is None
+
+    cache.set("a", 1, ttl=60)
+    cache.get("a")
+    cache.get("b")
+    assert cache.get_stats()["hit_ratio"] == 0.5
+
+
+def test_sweeper_thread_starts_and_stops():
+    cache = MemoryCache(max_entries=10, max_bytes=1000, sweep_interval=0.01)
+    cache.set("a", 1, ttl=0)
+
+    cache.start_sweeper()
+    try:
+        assert cache.get_stats()["sweeper_running"]
+        deadline = time.monotonic() + 5
+        while len(cache) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(cache) == 0
+    finally:
+        cache.stop_sweeper()
+    assert not cache.get_stats()["sweeper_running"]
@@ -0,0 +1,146 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import rate_limiter
+from app.services.rate_limiter import RateLimiter
+
+
+class Clock:
+    """Wall clock moved by hand"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "get_redis_connection", lambda: None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    monkeypatch.setattr(rate_limiter, "get_redis_connection", lambda: client)
+    return client
+
+
+@pytest.fixture
+def lua():
+    # fakeredis runs the token bucket script with lupa
+    pytest.importorskip("lupa")
+
+
+def _limiter(daily_quota: int = 0) -> RateLimiter:
+    return RateLimiter("test", max_concurrency=2, rate_per_second=2.0, burst=3, daily_quota=daily_quota)
+
+
+def _check_bucket(limiters, clock):
+    """Take tokens alternately from limiters sharing a bucket"""
+    first, second = limiters[0], limiters[-1]
+    assert [first._take_token(), second._take_token(), first._take_token()] == [0.0, 0.0, 0.0]
+    # Empty bucket: one token comes back every 1 / rate seconds
+    assert second._take_token() == pytest.approx(0.5)
+    clock.now += 0.25
+    assert first._take_token() == pytest.approx(0.25)
+    clock.now += 0.25
+    assert second._take_token() == 0.0
+    # Refills never exceed the burst
+    clock.now += 60
+    assert [first._take_token() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert second._take_token() > 0
+
+
+def test_in_memory_bucket_refills_at_rate_up_to_burst(clock, no_redis):
+    _check_bucket([_limiter()], clock)
+
+
+def test_redis_bucket_is_shared_by_limiters_of_the_same_name(clock, fake_redis, lua):
+    _check_bucket([_limiter(), _limiter()], clock)
+
+
+def test_pause_holds_tokens_until_it_ends(clock, no_redis):
+    limiter = _limiter()
+    limiter.pause(10)
+
+    assert limiter._take_token() == pytest.approx(10)
+    clock.now += 10
+    assert limiter._take_token() == 0.0
+
+
+def test_redis_pause_is_shared(clock, fake_redis, lua):
+    _limiter().pause(10)
+    assert _limiter()._take_token() == pytest.approx(10)
+
+
+@pytest.mark.parametrize("backend", ["no_redis", "fake_redis"])
+def test_daily_quota_is_decremented_until_used_up(backend, request):
+    request.getfixturevalue(backend)
+    limiter = _limiter(daily_quota=2)
+
+    assert [limiter._take_quota() for _ in range(3)] == [True, True, False]
+    # Rejected requests are not counted
+    assert limiter.quota_used() == 2
+    assert limiter.get_stats()["daily_quota_remaining"] == 0
+
+
+def test_redis_quota_is_shared_and_expires(fake_redis):
+    assert _limiter(daily_quota=2)._take_quota()
+    assert _limiter(daily_quota=2)._take_quota()
+    assert not _limiter(daily_quota=2)._take_quota()
+    assert 0 < fake_redis.ttl(_limiter()._quota_key()) <= 2 * 24 * 3600
+
+
+def test_reported_usage_only_raises_the_quota_counter(fake_redis):
+    limiter = _limiter(daily_quota=10)
+    limiter._take_quota()
+
+    limiter.record_usage(7)
+    assert limiter.quota_used() == 7
+    limiter.record_usage(3)
+    assert limiter.quota_used() == 7
+
+
+def test_limit_rejects_requests_past_the_quota(no_redis):
+    limiter = _limiter(daily_quota=1)
+
+    async def send():
+        async with limiter.limit() as allowed:
+            return allowed
+
+    async def main():
+        return [await send(), await send()]
+
+    assert asyncio.run(main()) == [True, False]
+    assert limiter.stats["requests"] == 1
+    assert limiter.stats["quota_rejections"] == 1
+
+
+def test_limit_bounds_concurrency(no_redis):
+    limiter = RateLimiter("test", max_concurrency=2, rate_per_second=1000.0, burst=10, daily_quota=0)
+    peak = 0
+
+    async def send():
+        nonlocal peak
+        async with limiter.limit():
+            peak = max(peak, limiter.stats["in_flight"])
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(send() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.stats["requests"] == 6
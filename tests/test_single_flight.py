@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from app.services import single_flight
+from app.services.single_flight import SingleFlight
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(single_flight, "get_redis_connection", lambda: None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    # fakeredis runs the lease release script with lupa
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    monkeypatch.setattr(single_flight, "get_redis_connection", lambda: client)
+    return client
+
+
+def _flight(wait_timeout: float = 1.0) -> SingleFlight:
+    return SingleFlight("test", lease_ttl=30, wait_timeout=wait_timeout, poll_interval=0.01)
+
+
+class Source:
+    """Slow upstream that fills a shared cache"""
+
+    def __init__(self, cache: dict, value="fetched", error: Exception = None):
+        self.cache = cache
+        self.value = value
+        self.error = error
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if self.error:
+            raise self.error
+        self.cache["key"] = self.value
+        return self.value
+
+    def read_cache(self):
+        return self.cache.get("key")
+
+
+def test_concurrent_callers_share_one_fetch(no_redis):
+    flight = _flight()
+    source = Source({})
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", source.fetch, source.read_cache) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["fetched"] * 5
+    assert source.calls == 1
+    assert flight.stats["coalesced_local"] == 4
+    assert flight.get_stats()["in_flight"] == 0
+
+
+def test_different_keys_are_fetched_separately(no_redis):
+    flight = _flight()
+    source = Source({})
+
+    async def main():
+        await asyncio.gather(
+            flight.do("a", source.fetch, lambda: None),
+            flight.do("b", source.fetch, lambda: None)
+        )
+
+    asyncio.run(main())
+    assert source.calls == 2
+
+
+def test_fetch_error_reaches_every_caller(no_redis):
+    flight = _flight()
+    source = Source({}, error=RuntimeError("upstream down"))
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do("key", source.fetch, source.read_cache) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert source.calls == 1
+    assert flight.get_stats()["in_flight"] == 0
+
+
+def test_other_process_waits_for_the_lease_holder(fake_redis):
+    cache = {}
+    source = Source(cache)
+    other_source = Source(cache, value="fetched again")
+    # Each instance stands for a worker process sharing Redis and the cache
+    worker, other_worker = _flight(), _flight()
+
+    async def main():
+        first = asyncio.create_task(worker.do("key", source.fetch, source.read_cache))
+        await asyncio.sleep(0.01)
+        second = await other_worker.do("key", other_source.fetch, other_source.read_cache)
+        return await first, second
+
+    assert asyncio.run(main()) == ("fetched", "fetched")
+    assert (source.calls, other_source.calls) == (1, 0)
+    assert other_worker.stats["coalesced_remote"] == 1
+    assert not fake_redis.exists(worker._lease_key("key"))
+
+
+def test_failed_lease_holder_lets_the_waiter_fetch(fake_redis):
+    cache = {}
+    failing = Source(cache, error=RuntimeError("upstream down"))
+    source = Source(cache)
+    worker, other_worker = _flight(), _flight()
+
+    async def main():
+        first = asyncio.create_task(worker.do("key", failing.fetch, failing.read_cache))
+        await asyncio.sleep(0.01)
+        second = await other_worker.do("key", source.fetch, source.read_cache)
+        with pytest.raises(RuntimeError):
+            await first
+        return second
+
+    assert asyncio.run(main()) == "fetched"
+    assert source.calls == 1
+    assert other_worker.stats["fetches"] == 1
+
+
+def test_waiter_fetches_after_the_lease_wait_times_out(fake_redis):
+    # A stuck process holds the lease without filling the cache
+    fake_redis.set(_flight()._lease_key("key"), "stuck", ex=30)
+    flight = _flight(wait_timeout=0.05)
+    source = Source({})
+
+    assert asyncio.run(flight.do("key", source.fetch, source.read_cache)) == "fetched"
+    assert source.calls == 1
+    assert flight.stats["lease_timeouts"] == 1
+
+
+def test_lease_of_another_process_is_not_released(fake_redis):
+    flight = _flight()
+    lease_key = flight._lease_key("key")
+
+    assert flight._acquire_lease("key", "mine")
+    fake_redis.set(lease_key, "theirs")
+    flight._release_lease("key", "mine")
+    assert fake_redis.get(lease_key) == "theirs"
+    flight._release_lease("key", "theirs")
+    assert not fake_redis.exists(lease_key)
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+from sqlalchemy import column, literal_column
+from sqlalchemy.dialects import postgresql
+
+from app.db import spatial
+
+POSTGRES_SESSION = SimpleNamespace(bind=SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+
+
+def _compile(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_per_row_radius_is_bounded_by_a_constant_distance(monkeypatch):
+    monkeypatch.setitem(spatial._geography_tables, "user", True)
+    radius = literal_column("coalesce(notification_radius_km, 10)")
+
+    sql = _compile(spatial.within_distance_filter(
+        POSTGRES_SESSION, "user", column("lat"), column("lng"), -33.9, 151.3, radius, box_radius_km=50.0
+    ))
+    # The constant distance comes first, so the GiST index can narrow the rows
+    assert sql.index("ST_DWithin") < sql.index("50000") < sql.index("coalesce")
+    assert sql.count("ST_DWithin") == 2
+
+
+def test_constant_radius_needs_a_single_distance_check(monkeypatch):
+    monkeypatch.setitem(spatial._geography_tables, "beach", True)
+
+    sql = _compile(spatial.within_distance_filter(
+        POSTGRES_SESSION, "beach", column("lat"), column("lng"), -33.9, 151.3, 20.0
+    ))
+    assert sql.count("ST_DWithin") == 1
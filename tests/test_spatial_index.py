@@ -0,0 +1,86 @@
+import random
+
+import pytest
+from geopy.distance import geodesic
+
+from app.services.spatial_index import SpatialIndex
+
+# Search centers: open ocean, both sides of the antimeridian and near both poles
+CENTERS = [(-33.9, 151.3), (0.0, 179.95), (12.0, -179.9), (89.7, 40.0), (-89.6, -120.0)]
+
+
+def _points_around(rng: random.Random, latitude: float, longitude: float, count: int = 300, spread: float = 1.0):
+    """Random points within a few degrees of a center, longitudes wrapped to -180..180"""
+    points = []
+    for point_id in range(count):
+        point_lat = max(min(latitude + rng.uniform(-spread, spread), 90.0), -90.0)
+        point_lng = (longitude + rng.uniform(-3 * spread, 3 * spread) + 180.0) % 360.0 - 180.0
+        points.append((point_id, point_lat, point_lng))
+    return points
+
+
+def _within(points, latitude: float, longitude: float, radius_km: float):
+    return {
+        point_id for point_id, point_lat, point_lng in points
+        if geodesic((latitude, longitude), (point_lat, point_lng)).kilometers <= radius_km
+    }
+
+
+@pytest.mark.parametrize("center", CENTERS)
+@pytest.mark.parametrize("radius_km", [5.0, 60.0, 150.0])
+def test_query_finds_every_point_within_the_radius(center, radius_km):
+    rng = random.Random(hash((center, radius_km)))
+    points = _points_around(rng, *center)
+    index = SpatialIndex(cell_size_deg=0.25)
+    index.rebuild(points)
+
+    found = {point_id for point_id, _, _ in index.query(*center, radius_km)}
+    expected = _within(points, *center, radius_km)
+    assert expected <= found
+    if radius_km >= 60.0:
+        assert expected
+
+
+@pytest.mark.parametrize("center", CENTERS)
+def test_covering_finds_every_point_whose_radius_reaches_the_location(center):
+    rng = random.Random(hash(center))
+    points = [(point_id, lat, lng, rng.uniform(5.0, 120.0)) for point_id, lat, lng in _points_around(rng, *center)]
+    index = SpatialIndex(cell_size_deg=0.25)
+    index.rebuild(points)
+
+    for _ in range(10):
+        latitude, longitude = _points_around(rng, *center, count=1, spread=0.5)[0][1:]
+        expected = {
+            point_id for point_id, point_lat, point_lng, radius_km in points
+            if geodesic((latitude, longitude), (point_lat, point_lng)).kilometers <= radius_km
+        }
+        found = {point_id for point_id, _, _, _ in index.covering(latitude, longitude)}
+        assert expected <= found
+
+
+def test_query_and_covering_reach_across_the_antimeridian():
+    index = SpatialIndex(cell_size_deg=0.25)
+    index.insert(1, 0.0, -179.95, 20.0)
+    index.insert(2, 0.0, 179.95, 20.0)
+
+    assert {point_id for point_id, _, _ in index.query(0.0, 179.99, 15.0)} == {1, 2}
+    assert {point_id for point_id, _, _, _ in index.covering(0.0, -179.99)} == {1, 2}
+
+
+def test_moved_and_removed_points_are_not_returned():
+    index = SpatialIndex(cell_size_deg=0.25)
+    index.insert(1, -33.9, 151.3)
+    index.insert(2, -33.9, 151.3)
+
+    index.insert(1, 51.5, -0.1)
+    index.remove(2)
+    assert index.query(-33.9, 151.3, 10.0) == []
+    assert [point_id for point_id, _, _ in index.query(51.5, -0.1, 10.0)] == [1]
+    assert len(index) == 1
+
+
+def test_query_keeps_box_corners_for_the_exact_check():
+    index = SpatialIndex(cell_size_deg=0.25)
+    # About 14 km from the center diagonally, outside a 10 km radius but inside its box
+    index.insert(1, -33.9 + 0.089, 151.3 + 0.107)
+    assert [point_id for point_id, _, _ in index.query(-33.9, 151.3, 10.0)] == [1]
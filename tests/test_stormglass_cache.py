@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import rate_limiter, single_flight, stormglass
+from app.services.rate_limiter import RateLimiter
+from app.services.stormglass import StormGlassService, align_forecast_window, slice_hours
+
+NOW = datetime(2024, 3, 1, 6, 0)
+
+
+def _hours(start: datetime, end: datetime):
+    hours = []
+    while start <= end:
+        hours.append({"time": start.strftime("%Y-%m-%dT%H:%M:%S+00:00"), "waveHeight": {"sg": 1.0}})
+        start += timedelta(hours=1)
+    return hours
+
+
+class FakeStormGlass:
+    """HTTP client answering every marine request with the requested hours"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def get(self, url, headers=None, params=None):
+        self.requests.append(params)
+        start, end = datetime.fromisoformat(params["start"]), datetime.fromisoformat(params["end"])
+        return httpx.Response(200, json={"hours": _hours(start, end), "meta": {}})
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    cache = {}
+    monkeypatch.setattr(stormglass, "get_cache", cache.get)
+    monkeypatch.setattr(stormglass, "set_cache", lambda key, value, ttl=None: cache.__setitem__(key, value))
+    monkeypatch.setattr(single_flight, "get_redis_connection", lambda: None)
+    monkeypatch.setattr(rate_limiter, "get_redis_connection", lambda: None)
+    monkeypatch.setattr(settings, "STORMGLASS_API_KEY", "test-key")
+    monkeypatch.setattr(stormglass, "cache_stats", {"hits": 0, "window_hits": 0, "misses": 0})
+    return FakeStormGlass()
+
+
+@pytest.fixture
+def service(upstream):
+    limiter = RateLimiter("test", max_concurrency=2, rate_per_second=1000.0, burst=10, daily_quota=0)
+    return StormGlassService(client=upstream, limiter=limiter)
+
+
+def _times(data):
+    return [hour["time"][:13] for hour in data["hours"]]
+
+
+def test_align_forecast_window_widens_to_whole_hours():
+    start, end = datetime(2024, 3, 1, 6, 42, 13, 5), datetime(2024, 3, 2, 6, 42, 13, 5)
+    assert align_forecast_window(start, end) == (datetime(2024, 3, 1, 6), datetime(2024, 3, 2, 7))
+    assert align_forecast_window(NOW, NOW) == (NOW, NOW)
+
+
+def test_slice_hours_keeps_the_aligned_range():
+    data = {"hours": _hours(NOW, NOW + timedelta(hours=10)), "meta": {"cost": 1}}
+
+    sliced = slice_hours(data, NOW + timedelta(hours=2, minutes=30), NOW + timedelta(hours=4, minutes=10))
+    assert _times(sliced) == ["2024-03-01T08", "2024-03-01T09", "2024-03-01T10", "2024-03-01T11"]
+    assert sliced["meta"] == {"cost": 1}
+    assert len(data["hours"]) == 11
+
+
+def test_requests_within_the_same_hour_share_a_key(service, upstream):
+    async def main():
+        first = await service.get_marine_data(-33.891, 151.277, NOW + timedelta(minutes=3))
+        second = await service.get_marine_data(-33.8912, 151.2771, NOW + timedelta(minutes=41))
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert len(upstream.requests) == 1
+    assert upstream.requests[0]["start"] == "2024-03-01T06:00:00+00:00"
+    assert upstream.requests[0]["end"] == "2024-03-02T07:00:00+00:00"
+    assert _times(second) == _times(first)[:len(_times(second))]
+    assert stormglass.cache_stats == {"hits": 1, "window_hits": 0, "misses": 1}
+
+
+def test_sub_range_is_sliced_from_the_cached_window(service, upstream):
+    async def main():
+        await service.get_marine_data(-33.89, 151.28, NOW, NOW + timedelta(days=1))
+        return await service.get_marine_data(-33.89, 151.28, NOW + timedelta(hours=3), NOW + timedelta(hours=5))
+
+    sub_range = asyncio.run(main())
+    assert len(upstream.requests) == 1
+    assert _times(sub_range) == ["2024-03-01T09", "2024-03-01T10", "2024-03-01T11"]
+    assert stormglass.get_cache_stats() == {"hits": 0, "window_hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_range_beyond_the_cached_window_is_fetched(service, upstream):
+    async def main():
+        await service.get_marine_data(-33.89, 151.28, NOW, NOW + timedelta(hours=6))
+        await service.get_marine_data(-33.89, 151.28, NOW, NOW + timedelta(hours=12))
+        # Another location does not reuse the window
+        await service.get_marine_data(-33.95, 151.28, NOW, NOW + timedelta(hours=6))
+
+    asyncio.run(main())
+    assert len(upstream.requests) == 3
+    assert stormglass.cache_stats["misses"] == 3
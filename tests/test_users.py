@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.schemas.user import User, UserUpdate
+
+
+@pytest.mark.parametrize("radius_km", [0, -5, settings.MAX_NOTIFICATION_RADIUS_KM + 1, 20000])
+def test_notification_radius_out_of_bounds_is_rejected(radius_km):
+    with pytest.raises(ValidationError):
+        UserUpdate(notification_radius_km=radius_km)
+
+
+def test_notification_radius_within_bounds_is_accepted():
+    assert UserUpdate(notification_radius_km=settings.MAX_NOTIFICATION_RADIUS_KM).notification_radius_km == settings.MAX_NOTIFICATION_RADIUS_KM
+
+
+def test_stored_radius_above_the_bound_is_still_returned():
+    user = User(id=1, created_at=datetime.utcnow(), updated_at=datetime.utcnow(), notification_radius_km=5000)
+    assert user.notification_radius_km == 5000
+
+
+def test_stored_radius_above_the_bound_is_indexed_clamped(db, monkeypatch):
+    from importlib import import_module
+    from app.models.user import User as UserModel
+    from app.services.spatial_index import SpatialIndex
+
+    # app.crud.user is shadowed by the operations dict of the crud package
+    crud_user = import_module("app.crud.user")
+    index = SpatialIndex(cell_size_deg=0.25)
+    monkeypatch.setattr(crud_user, "user_index", index)
+    user = UserModel(id=1, is_active=True, current_latitude=-33.9, current_longitude=151.3, notification_radius_km=5000)
+
+    crud_user._sync_user_index(user)
+    clamped = SpatialIndex(cell_size_deg=0.25)
+    clamped.insert(1, -33.9, 151.3, settings.MAX_NOTIFICATION_RADIUS_KM)
+    assert index._point_cells[1] == clamped._point_cells[1]
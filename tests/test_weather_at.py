@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# Models and crud connect to the database when imported, so they are imported
+# in the tests, after the db fixture skipped them if it is not reachable
+
+HOUR = datetime(2024, 6, 1, 12)
+HALF_PAST = HOUR + timedelta(minutes=30)
+
+
+def _store_hour(db, beach, timestamp, **values):
+    from app.models.weather_data import WeatherData
+
+    row = WeatherData(beach_id=beach.id, timestamp=timestamp, source="stormglass", **values)
+    db.add(row)
+    db.flush()
+    return row
+
+
+def test_interpolates_between_neighbouring_hours(db, beach):
+    from app.crud.weather import get_weather_data_at
+
+    _store_hour(db, beach, HOUR, wave_height=1.0, wind_speed=4.0, wind_direction=350.0)
+    _store_hour(db, beach, HOUR + timedelta(hours=1), wave_height=2.0, wind_speed=None, wind_direction=10.0)
+
+    weather = get_weather_data_at(db, beach.id, HALF_PAST, interpolate=True)
+    assert weather.id is None
+    assert weather.timestamp == HALF_PAST
+    assert weather.wave_height == pytest.approx(1.5)
+    # A value missing on either side is taken from the hour in effect
+    assert weather.wind_speed == 4.0
+    # Directions turn the short way round through north
+    assert weather.wind_direction == pytest.approx(0.0, abs=1e-9)
+    assert weather.suitability_level is not None
+
+
+def test_exact_hour_is_not_interpolated(db, beach):
+    from app.crud.weather import get_weather_data_at
+
+    stored = _store_hour(db, beach, HOUR, wave_height=1.0)
+    _store_hour(db, beach, HOUR + timedelta(hours=1), wave_height=2.0)
+
+    assert get_weather_data_at(db, beach.id, HOUR, interpolate=True) is stored
+
+
+def test_aware_time_is_taken_as_utc(db, beach):
+    from app.crud.weather import get_weather_data_at
+
+    _store_hour(db, beach, HOUR, wave_height=1.0)
+    _store_hour(db, beach, HOUR + timedelta(hours=1), wave_height=2.0)
+
+    at = HALF_PAST.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=10)))
+    assert get_weather_data_at(db, beach.id, at, interpolate=True).wave_height == pytest.approx(1.5)
+
+
+def test_hours_further_apart_than_max_gap_are_not_interpolated(db, beach):
+    from app.crud.weather import INTERPOLATION_MAX_GAP, get_weather_data_at
+
+    stored = _store_hour(db, beach, HOUR, wave_height=1.0)
+    _store_hour(db, beach, HOUR + INTERPOLATION_MAX_GAP + timedelta(hours=1), wave_height=2.0)
+
+    assert get_weather_data_at(db, beach.id, HALF_PAST, interpolate=True) is stored
+
+
+def test_last_stored_hour_is_returned_as_is(db, beach):
+    from app.crud.weather import get_weather_data_at
+
+    stored = _store_hour(db, beach, HOUR, wave_height=1.0)
+
+    assert get_weather_data_at(db, beach.id, HALF_PAST, interpolate=True) is stored
+
+
+def test_hour_in_effect_without_interpolation(db, beach):
+    from app.crud.weather import get_weather_data_at
+
+    stored = _store_hour(db, beach, HOUR, wave_height=1.0)
+    _store_hour(db, beach, HOUR + timedelta(hours=1), wave_height=2.0)
+
+    assert get_weather_data_at(db, beach.id, HALF_PAST) is stored
+
+
+def test_no_weather_without_hour_in_effect(db, beach):
+    from app.crud.weather import CURRENT_CONDITIONS_MAX_AGE, get_weather_data_at
+
+    _store_hour(db, beach, HOUR - CURRENT_CONDITIONS_MAX_AGE, wave_height=1.0)
+    _store_hour(db, beach, HOUR + timedelta(hours=1), wave_height=2.0)
+
+    assert get_weather_data_at(db, beach.id, HOUR, interpolate=True) is None
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+
+# Models and crud connect to the database when imported, so they are imported
+# in the tests, after the db fixture skipped them if it is not reachable
+
+HOUR = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+
+
+def test_bulk_create_updates_stored_hours(db, beach):
+    from app.crud.weather import create_weather_data_bulk, get_current_beach_conditions
+    from app.models.weather_data import WeatherData
+    from app.schemas.weather_data import WeatherDataCreate
+
+    def rows(wave_height):
+        return [
+            WeatherDataCreate(
+                beach_id=beach.id, timestamp=HOUR + timedelta(hours=offset),
+                wave_height=wave_height, safety_score=100, suitability_level="safe"
+            )
+            for offset in range(-1, 2)
+        ]
+
+    assert create_weather_data_bulk(db, rows(0.5)) == 3
+    assert create_weather_data_bulk(db, rows(1.0)) == 3
+
+    stored = db.query(WeatherData).filter(WeatherData.beach_id == beach.id).all()
+    assert sorted(row.wave_height for row in stored) == [1.0, 1.0, 1.0]
+    assert get_current_beach_conditions(db, beach.id).timestamp == HOUR
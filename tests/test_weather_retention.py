@@ -0,0 +1,183 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.db import partitions
+from app.db.partitions import add_months, drop_partitions_before, partition_name
+
+# Models and crud connect to the database when imported, so they are imported
+# in the tests, after the db fixture skipped them if it is not reachable
+
+
+def _store_hour(db, beach, timestamp, **values):
+    from app.models.weather_data import WeatherData
+
+    row = WeatherData(beach_id=beach.id, timestamp=timestamp, source="stormglass", **values)
+    db.add(row)
+    db.flush()
+    return row
+
+
+def _store_summary(db, beach, day: date, wave_height: float):
+    from app.models.weather_daily_summary import WeatherDailySummary
+
+    summary = WeatherDailySummary(
+        beach_id=beach.id, date=day, source="stormglass", hours=24,
+        wave_height_min=wave_height, wave_height_max=wave_height, wave_height_mean=wave_height,
+        suitability_level="safe"
+    )
+    db.add(summary)
+    db.flush()
+    return summary
+
+
+@pytest.fixture
+def day(db):
+    """Day after every stored summary, as rollups resume from the last summarized day"""
+    from sqlalchemy import func
+    from app.models.weather_daily_summary import WeatherDailySummary
+
+    last_day = db.query(func.max(WeatherDailySummary.date)).scalar()
+    return datetime(last_day.year, last_day.month, last_day.day) + timedelta(days=1) if last_day else datetime(2024, 6, 1)
+
+
+def _summaries(db, beach):
+    from app.models.weather_daily_summary import WeatherDailySummary
+
+    return {
+        summary.date: summary
+        for summary in db.query(WeatherDailySummary).filter(WeatherDailySummary.beach_id == beach.id)
+    }
+
+
+def test_rollup_summarizes_each_day_before_the_cutoff(db, beach, day):
+    from app.tasks.retention import rollup_weather_data
+
+    _store_hour(db, beach, day, wave_height=1.0, wind_speed=2.0, safety_score=90, suitability_level="safe")
+    _store_hour(db, beach, day + timedelta(hours=1), wave_height=2.0, wind_speed=None, safety_score=60, suitability_level="warning")
+    _store_hour(db, beach, day + timedelta(hours=2), wave_height=3.0, wind_speed=4.0, safety_score=30, suitability_level="danger")
+    _store_hour(db, beach, day + timedelta(days=1), wave_height=1.0, safety_score=90, suitability_level="safe")
+    # On the cutoff day, still kept hourly
+    _store_hour(db, beach, day + timedelta(days=2), wave_height=9.0)
+
+    assert rollup_weather_data(db.connection(), day + timedelta(days=2)) == 2
+    summaries = _summaries(db, beach)
+    assert sorted(summaries) == [day.date(), day.date() + timedelta(days=1)]
+
+    summary = summaries[day.date()]
+    assert summary.hours == 3
+    assert (summary.wave_height_min, summary.wave_height_max) == (1.0, 3.0)
+    assert summary.wave_height_mean == pytest.approx(2.0)
+    # Missing values are left out of the mean
+    assert summary.wind_speed_mean == pytest.approx(3.0)
+    assert summary.swell_height_mean is None
+    assert (summary.safety_score_min, summary.safety_score_mean) == (30, pytest.approx(60.0))
+    assert (summary.warning_hours, summary.danger_hours) == (1, 1)
+    assert summary.suitability_level == "danger"
+    assert summaries[day.date() + timedelta(days=1)].suitability_level == "safe"
+
+
+def test_rollup_rerun_updates_the_last_day_and_adds_new_ones(db, beach, day):
+    from app.tasks.retention import rollup_weather_data
+
+    _store_hour(db, beach, day, wave_height=1.0)
+    rollup_weather_data(db.connection(), day + timedelta(days=1))
+
+    # Late hour of the last summarized day and a day that became old since
+    _store_hour(db, beach, day + timedelta(hours=5), wave_height=3.0)
+    _store_hour(db, beach, day + timedelta(days=1), wave_height=5.0)
+    rollup_weather_data(db.connection(), day + timedelta(days=2))
+    db.expire_all()
+
+    summaries = _summaries(db, beach)
+    assert sorted(summaries) == [day.date(), day.date() + timedelta(days=1)]
+    assert summaries[day.date()].hours == 2
+    assert summaries[day.date()].wave_height_max == 3.0
+    assert summaries[day.date() + timedelta(days=1)].wave_height_mean == 5.0
+
+
+@pytest.fixture
+def raw_and_summaries(db, beach):
+    """Hourly rows from the retention cutoff on and daily summaries before it"""
+    from app.crud.weather import get_raw_retention_cutoff
+
+    cutoff = get_raw_retention_cutoff()
+    hours = [cutoff + timedelta(hours=hour) for hour in (5, 3, 1, 0)]
+    for timestamp in hours:
+        _store_hour(db, beach, timestamp, wave_height=1.0)
+    # Past the cutoff but not dropped yet, covered by its summary
+    _store_hour(db, beach, cutoff - timedelta(hours=1), wave_height=1.0)
+    days = [cutoff.date() - timedelta(days=day) for day in (1, 2, 3)]
+    for day in days:
+        _store_summary(db, beach, day, wave_height=2.0)
+    return cutoff, hours + [datetime(day.year, day.month, day.day) for day in days]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 5, 100])
+def test_pages_continue_from_hourly_rows_into_summaries(db, beach, raw_and_summaries, limit):
+    from app.crud.weather import get_beach_weather_data
+
+    _, expected = raw_and_summaries
+    timestamps = []
+    for skip in range(0, len(expected) + limit, limit):
+        page = get_beach_weather_data(db, beach.id, skip=skip, limit=limit)
+        assert len(page) <= limit
+        timestamps += [row.timestamp for row in page]
+    assert timestamps == expected
+
+
+def test_summaries_are_returned_as_daily_rows(db, beach, raw_and_summaries):
+    from app.crud.weather import get_beach_weather_data
+
+    cutoff, _ = raw_and_summaries
+    rows = get_beach_weather_data(db, beach.id, end_date=cutoff - timedelta(days=1))
+    assert len(rows) == 3
+    assert all(row.id is None and row.additional_data["summary"] == "daily" for row in rows)
+    assert rows[0].wave_height == 2.0
+
+
+def test_range_after_the_cutoff_reads_hourly_rows_only(db, beach, raw_and_summaries):
+    from app.crud.weather import get_beach_weather_data
+
+    cutoff, expected = raw_and_summaries
+    rows = get_beach_weather_data(db, beach.id, start_date=cutoff)
+    assert [row.timestamp for row in rows] == expected[:4]
+
+
+def test_range_across_the_cutoff_reads_both(db, beach, raw_and_summaries):
+    from app.crud.weather import get_beach_weather_data
+
+    cutoff, expected = raw_and_summaries
+    rows = get_beach_weather_data(db, beach.id, start_date=cutoff - timedelta(days=2), end_date=cutoff + timedelta(hours=3))
+    assert [row.timestamp for row in rows] == expected[1:6]
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, parameters=None):
+        self.statements.append(str(statement))
+
+
+def test_only_partitions_ending_before_the_cutoff_are_dropped(monkeypatch):
+    existing = {
+        partition_name(datetime(2024, 1, 1)): datetime(2024, 1, 1),
+        partition_name(datetime(2024, 2, 1)): datetime(2024, 2, 1),
+        partition_name(datetime(2024, 3, 1)): datetime(2024, 3, 1),
+        partitions.DEFAULT_PARTITION: None,
+    }
+    monkeypatch.setattr(partitions, "list_partitions", lambda conn: existing)
+    conn = RecordingConnection()
+
+    # March still holds rows from the cutoff on
+    assert drop_partitions_before(conn, datetime(2024, 3, 15)) == ["weatherdata_p202401", "weatherdata_p202402"]
+    assert conn.statements == ["DROP TABLE weatherdata_p202401", "DROP TABLE weatherdata_p202402"]
+    assert drop_partitions_before(RecordingConnection(), datetime(2024, 4, 1))[-1] == "weatherdata_p202403"
+    assert drop_partitions_before(RecordingConnection(), datetime(2024, 1, 31)) == []
+
+
+def test_add_months_crosses_years():
+    assert add_months(datetime(2024, 11, 1), 2) == datetime(2025, 1, 1)
+    assert add_months(datetime(2024, 1, 1), -1) == datetime(2023, 12, 1)
+    assert partition_name(datetime(2025, 1, 1)) == "weatherdata_p202501"
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.services.stormglass import plan_fetch_range
+from app.services.suitability import ForecastHour, hours_to_notify, hours_to_store
+
+NOW = datetime(2024, 6, 1, 12, 30)
+HOUR = NOW.replace(minute=0)
+
+
+@pytest.fixture(autouse=True)
+def sweep_settings(monkeypatch):
+    monkeypatch.setattr(settings, "WEATHER_FORECAST_HOURS", 48)
+    monkeypatch.setattr(settings, "WEATHER_REVISION_HOURS", 6)
+    monkeypatch.setattr(settings, "WEATHER_MIN_FETCH_HOURS", 3)
+
+
+def test_plan_without_stored_forecast_fetches_full_horizon():
+    assert plan_fetch_range(None, NOW) == (HOUR, HOUR + timedelta(hours=48))
+
+
+def test_plan_with_horizon_in_the_past_fetches_full_horizon():
+    assert plan_fetch_range(HOUR - timedelta(hours=1), NOW) == (HOUR, HOUR + timedelta(hours=48))
+
+
+def test_plan_up_to_date_fetches_revision_window_only():
+    horizon = HOUR + timedelta(hours=47)
+    assert plan_fetch_range(horizon, NOW) == (HOUR, HOUR + timedelta(hours=6))
+
+
+def test_plan_extension_is_merged_with_revision_window():
+    # Disjoint ranges still go out as a single request
+    horizon = HOUR + timedelta(hours=40)
+    assert plan_fetch_range(horizon, NOW) == (HOUR, HOUR + timedelta(hours=48))
+
+
+def test_plan_extension_shorter_than_minimum_waits():
+    # 46h stored: the 2 missing hours are below WEATHER_MIN_FETCH_HOURS
+    horizon = HOUR + timedelta(hours=45)
+    assert plan_fetch_range(horizon, NOW) == (HOUR, HOUR + timedelta(hours=6))
+
+
+def test_plan_without_revision_fetches_extension_only(monkeypatch):
+    monkeypatch.setattr(settings, "WEATHER_REVISION_HOURS", 0)
+    assert plan_fetch_range(HOUR + timedelta(hours=40), NOW) == (HOUR + timedelta(hours=41), HOUR + timedelta(hours=48))
+    assert plan_fetch_range(HOUR + timedelta(hours=47), NOW) is None
+
+
+def test_plan_revision_window_shorter_than_minimum_is_skipped(monkeypatch):
+    monkeypatch.setattr(settings, "WEATHER_REVISION_HOURS", 2)
+    assert plan_fetch_range(HOUR + timedelta(hours=47), NOW) is None
+
+
+def _hour(offset: int, level: str) -> ForecastHour:
+    return ForecastHour(
+        timestamp=datetime(2024, 6, 1, tzinfo=timezone.utc) + timedelta(hours=offset),
+        wave_height=None, wave_direction=None, wave_period=None,
+        swell_height=None, swell_direction=None, swell_period=None,
+        wind_speed=None, wind_direction=None,
+        water_temperature=None, current_speed=None, current_direction=None, visibility=None,
+        additional_data=None, safety_score=50, suitability_level=level, warning_codes=1
+    )
+
+
+def test_new_warning_hours_are_notified():
+    hours = [_hour(0, "safe"), _hour(1, "warning"), _hour(2, "danger")]
+    assert hours_to_notify(hours, {}) == hours[1:]
+
+
+def test_unchanged_hours_are_not_notified_again():
+    hours = [_hour(0, "warning"), _hour(1, "danger")]
+    stored = {hour.timestamp: hour.suitability_level for hour in hours}
+    assert hours_to_notify(hours, stored) == []
+
+
+def test_hours_getting_worse_are_notified():
+    hours = [_hour(0, "warning"), _hour(1, "danger"), _hour(2, "warning")]
+    stored = {hours[0].timestamp: "safe", hours[1].timestamp: "warning", hours[2].timestamp: "danger"}
+    assert hours_to_notify(hours, stored) == hours[:2]
+
+
+def test_unscored_stored_hours_count_as_unknown():
+    hours = [_hour(0, "warning")]
+    assert hours_to_notify(hours, {hours[0].timestamp: None}) == hours
+
+
+def _fetched_forecast():
+    # Hours 12:00 to 12:00 the next day, as fetched from now
+    return [_hour(12 + offset, "safe") for offset in range(25)]
+
+
+def _offsets(hours):
+    return [int((hour.timestamp - _hour(12, "safe").timestamp).total_seconds() // 3600) for hour in hours]
+
+
+def test_beach_without_stored_forecast_stores_every_hour():
+    hours = _fetched_forecast()
+    assert hours_to_store(hours, None, NOW) == hours
+
+
+def test_only_revision_window_and_new_hours_are_stored():
+    # Stored up to 20 hours ahead: the 6 hour revision window and the 4 new hours
+    assert _offsets(hours_to_store(_fetched_forecast(), HOUR + timedelta(hours=20), NOW)) == [
+        0, 1, 2, 3, 4, 5, 6, 21, 22, 23, 24
+    ]
+
+
+def test_beach_with_outdated_horizon_stores_every_hour():
+    hours = _fetched_forecast()
+    assert hours_to_store(hours, HOUR - timedelta(hours=3), NOW) == hours
+
+
+def test_without_revision_only_new_hours_are_stored(monkeypatch):
+    monkeypatch.setattr(settings, "WEATHER_REVISION_HOURS", 0)
+    assert _offsets(hours_to_store(_fetched_forecast(), HOUR + timedelta(hours=22), NOW)) == [23, 24]